@@ -15,15 +15,9 @@ def calculate_bollinger_bands(historical_prices, window=20, std_dev=2):
 # Define Bollinger
 def generate_signals(historical_prices):
     """Generates trading signals based on Bollinger Bands."""
-    signals = []
-    for i in range(len(historical_prices)):
-        if historical_prices['Close'][i] > historical_prices['Upper Band'][i]:
-            signals.append('Sell')
-        elif historical_prices['Close'][i] < historical_prices['Lower Band'][i]:
-            signals.append('Buy')
-        else:
-            signals.append('Hold')
-    return signals
+    # Vectorized over all rows at once (the first matching condition wins, like the if/elif chain)
+    conditions = [historical_prices['Close'] > historical_prices['Upper Band'], historical_prices['Close'] < historical_prices['Lower Band']]
+    return np.select(conditions, ['Sell', 'Buy'], default='Hold').tolist()
 
 # Define dates
 start_date = '2023-01-01'
@@ -17,15 +17,9 @@ def calculate_bollinger_bands(data, window=20, std_dev=2):
 
 def generate_signals(data):
     """Generates trading signals based on Bollinger Bands."""
-    signals = []
-    for i in range(len(data)):
-        if data['Close'][i] > data['Upper Band'][i]:
-            signals.append('Sell')
-        elif data['Close'][i] < data['Lower Band'][i]:
-            signals.append('Buy')
-        else:
-            signals.append('Hold')
-    return signals
+    # Vectorized over all rows at once (the first matching condition wins, like the if/elif chain)
+    conditions = [data['Close'] > data['Upper Band'], data['Close'] < data['Lower Band']]
+    return np.select(conditions, ['Sell', 'Buy'], default='Hold').tolist()
 
 # Load your data (replace with your data source)
 data = pd.read_csv('your_data.csv')
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Make the `utilities` package importable when pytest is run from any directory
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utilities.backtesting import backtest, positions_from_predictions
+
+
+def make_universe(n_days=60, n_tickers=4, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2024-01-01", periods=n_days)
+    tickers = [f"T{i}" for i in range(n_tickers)]
+    prices = pd.DataFrame(100 * np.exp(rng.normal(scale=0.01, size=(n_days, n_tickers)).cumsum(axis=0)), index=dates, columns=tickers)
+    prices.iloc[20:23, 1] = np.nan  # A ticker that stopped trading for a few days
+    positions = pd.DataFrame(rng.choice([-1.0, 0.0, 1.0], size=prices.shape), index=dates, columns=tickers)
+    return prices, positions
+
+
+def loop_backtest(prices, positions, costs):
+    """Reference backtest of each ticker with a plain loop over the dates."""
+    results = {}
+    for ticker in prices.columns:
+        equity, total_costs, previous = 1.0, 0.0, 0.0
+        for day in range(len(prices) - 1):
+            position = positions[ticker].iloc[day]
+            change = abs(position - previous)
+            previous = position
+            forward_return = prices[ticker].iloc[day + 1] / prices[ticker].iloc[day] - 1
+            if np.isnan(forward_return):
+                continue
+            equity *= 1 + position * forward_return - costs * change
+            total_costs += costs * change
+        results[ticker] = (equity - 1, total_costs)
+    return results
+
+
+def test_backtest_matches_loop():
+    prices, positions = make_universe()
+
+    _, per_ticker, _ = backtest({"model": positions}, prices, costs=0.001)
+
+    for ticker, (total_return, total_costs) in loop_backtest(prices, positions, 0.001).items():
+        assert per_ticker.loc[("model", ticker), "Total Return"] == pytest.approx(total_return)
+        assert per_ticker.loc[("model", ticker), "Costs"] == pytest.approx(total_costs)
+
+
+def test_no_costs_on_days_without_a_return():
+    prices, positions = make_universe()
+    positions.iloc[:] = 1.0
+    positions.iloc[20:23, 1] = -1.0  # Flips while the ticker has no prices
+
+    _, per_ticker, _ = backtest(positions, prices, costs=0.001)
+
+    # Only the first flip back (day 23, whose return is known) is charged besides the opening trade
+    assert per_ticker.loc[("model", "T1"), "Costs"] == pytest.approx(0.001 * (1 + 2))
+    assert per_ticker.loc[("model", "T0"), "Costs"] == pytest.approx(0.001)
+
+
+def test_positions_from_predictions():
+    predictions = pd.DataFrame({
+        "Date": ["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-02"],
+        "Ticker": ["A", "B", "A", "B"],
+        "Adjusted Close": [10.0, 20.0, 11.0, 19.0],
+        "Pred": [1, 0, -1, np.nan],
+        "Next Day Close": [11.0, 19.0, 11.0, 20.0],
+    })
+
+    directions = positions_from_predictions(predictions, "Pred", kind="direction")
+    prices = positions_from_predictions(predictions, "Next Day Close", kind="price")
+
+    np.testing.assert_array_equal(directions.to_numpy(), [[1.0, -1.0], [-1.0, np.nan]])
+    np.testing.assert_array_equal(prices.to_numpy(), [[1.0, -1.0], [0.0, 1.0]])
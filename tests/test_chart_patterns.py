@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utilities.chart_patterns import find_head_and_shoulders, find_head_and_shoulders_loop
+
+# Peak, trough, head, trough, peak: one head-and-shoulders with a 11.25 neckline
+PATTERN = [10.0, 12.0, 11.0, 15.0, 11.5, 12.0, 10.0]
+
+
+def make_closes(seed, n_days=600, n_patterns=5, index=None):
+    """Random walk with planted head-and-shoulders patterns, plateaus (rounded prices) and a few NaNs."""
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size=n_days)))
+    for start in rng.choice(np.arange(10, n_days - 20, 20), size=n_patterns, replace=False):
+        closes[start:start + len(PATTERN)] = np.array(PATTERN) * closes[start - 1] / PATTERN[0]
+    closes = closes.round(1)
+    closes[rng.choice(n_days, size=6, replace=False)] = np.nan
+
+    if index is None:
+        index = pd.bdate_range("2020-01-01", periods=n_days)
+    return pd.DataFrame({"Close": closes}, index=index)
+
+
+def as_records(patterns):
+    return pd.DataFrame(patterns, columns=["left_shoulder", "head", "right_shoulder", "neckline"])
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_matches_the_loop_detector(seed):
+    df = make_closes(seed)
+
+    patterns = find_head_and_shoulders(df)
+    expected = as_records(find_head_and_shoulders_loop(df))
+
+    assert len(patterns) >= 5
+    pd.testing.assert_frame_equal(pd.DataFrame(patterns), expected)
+
+
+def test_matches_the_loop_detector_on_an_integer_index():
+    df = make_closes(4, index=pd.RangeIndex(1000, 1600)).rename(columns={"Close": "Adjusted Close"})
+
+    patterns = find_head_and_shoulders(df["Adjusted Close"])
+    expected = as_records(find_head_and_shoulders_loop(df, price_column="Adjusted Close"))
+
+    assert patterns["head"].dtype == np.int64
+    pd.testing.assert_frame_equal(pd.DataFrame(patterns), expected)
+
+
+def test_finds_a_planted_pattern():
+    closes = pd.Series([9.0, *PATTERN, 11.0], index=pd.bdate_range("2024-01-01", periods=len(PATTERN) + 2))
+
+    patterns = find_head_and_shoulders(closes)
+
+    assert len(patterns) == 1
+    assert patterns["head"][0] == closes.index[4]
+    assert (patterns["left_shoulder"][0], patterns["right_shoulder"][0]) == (closes.index[3], closes.index[5])
+    assert patterns["neckline"][0] == pytest.approx(11.25)
+
+
+def test_no_patterns_returns_an_empty_array():
+    closes = pd.Series(np.arange(50, dtype=np.float64), index=pd.bdate_range("2024-01-01", periods=50))
+
+    patterns = find_head_and_shoulders(closes)
+
+    assert len(patterns) == 0
+    assert patterns.dtype.names == ("left_shoulder", "head", "right_shoulder", "neckline")
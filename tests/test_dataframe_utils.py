@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utilities.dataframe_utils import write_csv_zip, load_data, save_data
+
+
+@pytest.fixture(scope="module")
+def featured_df():
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2023-01-02", periods=120)
+    tickers = ["AAPL", "MSFT", "NVDA", "XOM"]
+    return pd.DataFrame({
+        "Date": np.repeat(dates.strftime("%Y-%m-%d"), len(tickers)),
+        "Ticker": np.tile(tickers, len(dates)),
+        "Adjusted Close": rng.normal(100, 10, size=len(dates) * len(tickers)).round(6),
+        "Return": rng.normal(0, 0.01, size=len(dates) * len(tickers)).round(8),
+    })
+
+
+def test_parquet_round_trip_with_filters(featured_df, tmp_path):
+    save_data(featured_df, tmp_path / "featured", file_format="parquet")
+
+    loaded = load_data(tmp_path / "featured.parquet")
+    sliced = load_data(tmp_path / "featured.parquet", columns=["Date", "Ticker", "Return"],
+                       start_date="2023-02-01", end_date="2023-02-28", tickers=["MSFT", "XOM"])
+
+    expected = featured_df.assign(Date=pd.to_datetime(featured_df["Date"]))
+    pd.testing.assert_frame_equal(loaded, expected, check_dtype=False)
+    mask = expected["Date"].between("2023-02-01", "2023-02-28") & expected["Ticker"].isin(["MSFT", "XOM"])
+    pd.testing.assert_frame_equal(sliced, expected.loc[mask, ["Date", "Ticker", "Return"]].reset_index(drop=True), check_dtype=False)
+
+
+def test_parquet_date_filters_use_the_date_column(featured_df, tmp_path):
+    df = featured_df.rename(columns={"Date": "Trading Day"})
+    save_data(df, tmp_path / "featured", file_format="parquet", date_column="Trading Day")
+
+    loaded = load_data(tmp_path / "featured.parquet", start_date="2023-03-01", end_date="2023-03-31", date_column="Trading Day")
+
+    assert pd.api.types.is_datetime64_any_dtype(loaded["Trading Day"])
+    assert loaded["Trading Day"].min() >= pd.Timestamp("2023-03-01")
+    assert loaded["Trading Day"].max() <= pd.Timestamp("2023-03-31")
+    assert len(loaded) == df["Trading Day"].between("2023-03-01", "2023-03-31").sum()
+
+
+def test_csv_and_parquet_load_the_same_slice(featured_df, tmp_path):
+    save_data(featured_df, tmp_path / "featured")
+    save_data(featured_df, tmp_path / "featured", file_format="parquet")
+
+    filters = {"columns": ["Ticker", "Adjusted Close"], "start_date": "2023-03-01", "tickers": ["AAPL"]}
+    from_csv = load_data(tmp_path / "featured.zip", **filters)
+    from_parquet = load_data(tmp_path / "featured.parquet", **filters)
+
+    pd.testing.assert_frame_equal(from_csv, from_parquet, check_dtype=False)
+
+
+def write_legacy_zip(df, file_path):
+    """Write a file like the original `save_data`: one BZ2 stream of the whole CSV inside a deflated ZIP."""
+    import bz2
+    from zipfile import ZIP_DEFLATED, ZipFile
+
+    with ZipFile(file_path, "w", compression=ZIP_DEFLATED) as zipf:
+        zipf.writestr(file_path.stem + ".csv.bz2", bz2.compress(df.to_csv(index=False).encode("utf-8")))
+
+
+def test_streamed_chunks_match_full_load(featured_df, tmp_path):
+    write_legacy_zip(featured_df, tmp_path / "legacy.zip")
+
+    full = load_data(tmp_path / "legacy.zip")
+    chunks = list(load_data(tmp_path / "legacy.zip", chunksize=37))
+    filtered_chunks = list(load_data(tmp_path / "legacy.zip", chunksize=50, columns=["Return"], tickers=["NVDA"]))
+
+    pd.testing.assert_frame_equal(full, featured_df)
+    assert max(len(chunk) for chunk in chunks) == 37
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), featured_df)
+    pd.testing.assert_frame_equal(pd.concat(filtered_chunks, ignore_index=True),
+                                  featured_df.loc[featured_df["Ticker"] == "NVDA", ["Return"]].reset_index(drop=True))
+
+
+@pytest.mark.parametrize("compression", ["bz2", "lzma", "zlib", "stored"])
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_codec_round_trip_with_many_blocks(featured_df, tmp_path, compression, max_workers):
+    # Many small, independently compressed blocks
+    write_csv_zip(featured_df, tmp_path / "featured.zip", compression=compression, block_rows=23, max_workers=max_workers)
+
+    pd.testing.assert_frame_equal(load_data(tmp_path / "featured.zip"), featured_df)
+    pd.testing.assert_frame_equal(pd.concat(load_data(tmp_path / "featured.zip", chunksize=31), ignore_index=True), featured_df)
+
+
+def test_default_codec_round_trip(featured_df, tmp_path):
+    save_data(featured_df, tmp_path / "featured", compression="lzma")
+
+    pd.testing.assert_frame_equal(load_data(tmp_path / "featured.zip"), featured_df)
+
+
+@pytest.mark.parametrize("file_name, expected_file", [("featured.parquet", "featured.parquet"), ("featured", "featured.zip"), ("featured.csv", "featured.zip")])
+def test_save_data_infers_the_format_from_the_suffix(featured_df, tmp_path, file_name, expected_file):
+    save_data(featured_df, tmp_path / file_name)
+
+    assert [path.name for path in tmp_path.iterdir()] == [expected_file]
+    assert len(load_data(tmp_path / expected_file)) == len(featured_df)
@@ -0,0 +1,89 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utilities.dataset_store import save_partitioned, append_data, load_partitioned
+
+
+def make_prices(start, periods, tickers=("AAPL", "MSFT", "XOM"), seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=periods)
+    return pd.DataFrame({
+        "Date": np.repeat(dates.strftime("%Y-%m-%d"), len(tickers)),
+        "Ticker": np.tile(list(tickers), len(dates)),
+        "x": rng.normal(100, 10, size=len(dates) * len(tickers)).round(6),
+        "y": rng.normal(0, 0.01, size=len(dates) * len(tickers)).round(8),
+    })
+
+
+def normalize(df):
+    return df.assign(Date=pd.to_datetime(df["Date"]).dt.strftime("%Y-%m-%d")).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("file_format", ["csv", "parquet"])
+def test_save_append_load_round_trip(file_format, tmp_path):
+    history = make_prices("2023-01-02", 60)
+    today = make_prices("2023-03-27", 1, seed=1)
+
+    save_partitioned(history, tmp_path / "prices", file_format=file_format)
+    append_data(today, tmp_path / "prices")
+    loaded = load_partitioned(tmp_path / "prices")
+
+    expected = pd.concat([history, today], ignore_index=True)
+    pd.testing.assert_frame_equal(normalize(loaded), expected, check_dtype=False)
+    assert len(list((tmp_path / "prices").glob("2023-03/part-*"))) == 2
+
+
+def test_append_creates_missing_dataset(tmp_path):
+    df = make_prices("2023-01-02", 5)
+
+    append_data(df, tmp_path / "prices", file_format="parquet")
+
+    pd.testing.assert_frame_equal(normalize(load_partitioned(tmp_path / "prices")), df, check_dtype=False)
+
+
+@pytest.mark.parametrize("file_format", ["csv", "parquet"])
+def test_append_rejects_rows_not_newer_than_the_dataset(file_format, tmp_path):
+    history = make_prices("2023-01-02", 20)
+    save_partitioned(history, tmp_path / "prices", file_format=file_format)
+
+    with pytest.raises(ValueError, match="Cannot append rows dated"):
+        append_data(history.tail(3), tmp_path / "prices")
+
+    # Nothing was written
+    pd.testing.assert_frame_equal(normalize(load_partitioned(tmp_path / "prices")), history, check_dtype=False)
+
+
+def test_append_rejects_column_mismatch(tmp_path):
+    save_partitioned(make_prices("2023-01-02", 20), tmp_path / "prices")
+    new_rows = make_prices("2023-02-01", 1)
+
+    with pytest.raises(ValueError, match="do not match the dataset columns"):
+        append_data(new_rows.drop(columns="y"), tmp_path / "prices")
+    with pytest.raises(ValueError, match="do not match the dataset columns"):
+        append_data(new_rows[["Ticker", "Date", "x", "y"]], tmp_path / "prices")
+
+
+@pytest.mark.parametrize("file_format", ["csv", "parquet"])
+def test_load_prunes_partitions_and_filters_rows(file_format, tmp_path, capsys):
+    df = make_prices("2023-01-02", 130)
+    save_partitioned(df, tmp_path / "prices", file_format=file_format)
+    capsys.readouterr()
+
+    loaded = load_partitioned(tmp_path / "prices", columns=["x"],
+                              start_date="2023-02-15", end_date="2023-03-10", tickers=["MSFT", "XOM"])
+
+    mask = df["Date"].between("2023-02-15", "2023-03-10") & df["Ticker"].isin(["MSFT", "XOM"])
+    pd.testing.assert_frame_equal(loaded, df.loc[mask, ["x"]].reset_index(drop=True), check_dtype=False)
+    assert "(2 of 6 partitions)" in re.sub(r"\x1b\[[0-9;]*m", "", capsys.readouterr().out)
+
+
+def test_load_outside_the_stored_range_is_empty(tmp_path):
+    save_partitioned(make_prices("2023-01-02", 20), tmp_path / "prices", partition_by="year")
+
+    loaded = load_partitioned(tmp_path / "prices", start_date="2024-01-01")
+
+    assert loaded.empty
+    assert list(loaded.columns) == ["Date", "Ticker", "x", "y"]
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from utilities.benchmark_utils import make_sp500_prices
+from utilities.feature_engine import compute_features, iter_features, compute_features_pandas
+
+
+@pytest.fixture(scope="module")
+def prices():
+    prices = make_sp500_prices(n_days=400, n_tickers=12, seed=3)
+    values = prices.to_numpy().copy()
+
+    # Scattered missing days, a late listing, a delisting and a long gap
+    rng = np.random.default_rng(1)
+    values[rng.random(values.shape) < 0.02] = np.nan
+    values[:30, 0] = np.nan
+    values[-10:, 1] = np.nan
+    values[100:160, 2] = np.nan
+
+    prices.iloc[:, :] = values
+    return prices
+
+
+@pytest.fixture(scope="module")
+def expected(prices):
+    return compute_features_pandas(prices)
+
+
+def test_compute_features_matches_pandas(prices, expected):
+    features = compute_features(prices)
+
+    assert list(features) == list(expected)
+    for name, frame in expected.items():
+        assert features[name].index.equals(prices.index)
+        assert features[name].columns.equals(prices.columns)
+        np.testing.assert_allclose(features[name].to_numpy(), frame.to_numpy(dtype=np.float64),
+                                   rtol=1e-7, atol=1e-8, equal_nan=True, err_msg=name)
+
+
+def test_iter_features_matches_pandas(prices, expected):
+    seen = []
+    for name, values in iter_features(prices.to_numpy()):
+        seen.append(name)
+        assert values.dtype == np.float64
+        np.testing.assert_allclose(values, expected[name].to_numpy(dtype=np.float64),
+                                   rtol=1e-7, atol=1e-8, equal_nan=True, err_msg=name)
+
+    assert seen == list(expected)
+
+
+def test_spec_selects_the_features(prices):
+    features = compute_features(prices, spec={"sma_windows": [20], "rsi_window": None})
+
+    assert "RSI" not in features and "SMA_50" not in features
+    np.testing.assert_allclose(features["SMA_20"], prices.rolling(window=20).mean(), equal_nan=True)
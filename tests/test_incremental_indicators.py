@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utilities.incremental_indicators import IncrementalIndicators
+from utilities.stock_indicators import calculate_bollinger_bands, calculate_daily_volatility, calculate_rsi
+
+
+@pytest.fixture(scope="module")
+def prices():
+    rng = np.random.default_rng(0)
+    prices = pd.DataFrame(100 * np.exp(rng.normal(scale=0.02, size=(160, 5)).cumsum(axis=0)),
+                          index=pd.bdate_range("2024-01-01", periods=160), columns=list("ABCDE"))
+    prices.iloc[120:123, 1] = np.nan  # A ticker with missing prices during the updates
+    prices.iloc[60:62, 3] = np.nan    # ... and in the history
+    return prices
+
+
+def batch_indicators(prices):
+    """Indicators of the last day with the batch functions over the full history."""
+    upper_band, lower_band = calculate_bollinger_bands(prices)
+    return pd.DataFrame({
+        "RSI": calculate_rsi(prices).iloc[-1],
+        "Upper Band": upper_band.iloc[-1],
+        "Lower Band": lower_band.iloc[-1],
+        "Volatility": calculate_daily_volatility(prices).iloc[-1],
+    })
+
+
+@pytest.mark.parametrize("n_history", [5, 100])
+def test_incremental_updates_match_batch(prices, n_history, tmp_path):
+    state = IncrementalIndicators.from_history(prices.iloc[:n_history])
+    pd.testing.assert_frame_equal(state.current(), batch_indicators(prices.iloc[:n_history]), check_names=False)
+
+    for day in range(n_history, len(prices)):
+        if day == 130:
+            # The state survives a save / load round trip
+            state.save(tmp_path / "state")
+            state = IncrementalIndicators.load(tmp_path / "state")
+
+        indicators = state.update(prices.iloc[day])
+        pd.testing.assert_frame_equal(indicators, batch_indicators(prices.iloc[:day + 1]), check_names=False, rtol=1e-9)
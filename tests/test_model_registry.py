@@ -0,0 +1,51 @@
+import pickle
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from utilities import model_registry
+from utilities.model_registry import build_model_index, convert_to_joblib, get_model_info, load_model
+
+
+def fit_logistic_regression():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 3))
+    return LogisticRegression().fit(X, (X[:, 0] > 0).astype(int))
+
+
+def test_metadata_is_read_again_once_the_artifact_loads(tmp_path, monkeypatch):
+    with open(tmp_path / "clf_test_v1.pkl", "wb") as model_file:
+        pickle.dump(fit_logistic_regression(), model_file)
+
+    real_load = joblib.load
+    def failing_load(*args, **kwargs):
+        raise ModuleNotFoundError("No module named 'xgboost'")
+
+    monkeypatch.setattr(model_registry.joblib, "load", failing_load)
+    entry = build_model_index(tmp_path)["clf_test_v1.pkl"]
+    assert entry["type"] is None and entry["sha256"]
+
+    monkeypatch.setattr(model_registry.joblib, "load", real_load)
+    entry = build_model_index(tmp_path)["clf_test_v1.pkl"]
+    assert entry["type"] == "sklearn.linear_model._logistic.LogisticRegression"
+    assert entry["n_features"] == 3
+
+
+def test_convert_to_joblib_keeps_the_version(tmp_path, monkeypatch):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, 4))
+    forest = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, (X[:, 0] > 0).astype(int))
+    (tmp_path / "forests").mkdir()
+    with open(tmp_path / "forests" / "random_forest_v2.pkl", "wb") as model_file:
+        pickle.dump(forest, model_file)
+    monkeypatch.setattr(model_registry, "MMAP_MIN_BYTES", 0)
+
+    entry = convert_to_joblib("random_forest", models_dir=tmp_path)
+
+    assert entry["path"] == "forests/random_forest_v2.joblib" and entry["version"] == 2
+    assert get_model_info("random_forest", 2, models_dir=tmp_path)["path"] == entry["path"]
+    loaded = load_model("random_forest", models_dir=tmp_path)
+    np.testing.assert_array_equal(loaded.predict(X), forest.predict(X))
+    assert load_model("random_forest", models_dir=tmp_path) is loaded
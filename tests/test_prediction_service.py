@@ -0,0 +1,95 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from utilities.prediction_service import (PredictionServer, predict_all, predict_directions, request_metrics,
+                                         request_predictions)
+
+
+@pytest.fixture(scope="module")
+def loaded_models():
+    rng = np.random.default_rng(0)
+    features = [f"f{i}" for i in range(6)]
+    X = pd.DataFrame(rng.normal(loc=100, scale=5, size=(5000, 6)), columns=features)
+    y = np.where(X["f0"] - X["f1"] + rng.normal(scale=2, size=len(X)) > 0, 1, 0)
+
+    scaler = StandardScaler().fit(X)
+    log_scaler = StandardScaler().fit(X[features[:4]])
+    forest = RandomForestClassifier(n_estimators=20, random_state=0).fit(scaler.transform(X), y)
+    log_reg = LogisticRegression().fit(log_scaler.transform(X[features[:4]]), y)
+    return {
+        "RanFC": {"model": forest, "scaler": scaler, "features": features},
+        "Log_R": {"model": log_reg, "scaler": log_scaler, "features": features[:4]},
+    }
+
+
+def near_boundary_batch(loaded_models, n_rows=20_000, seed=1):
+    """Features whose logistic regression scores are all very close to the decision boundary."""
+    rng = np.random.default_rng(seed)
+    entry = loaded_models["Log_R"]
+    scaled = rng.normal(size=(n_rows, 4))
+    coef, intercept = entry["model"].coef_[0], entry["model"].intercept_[0]
+    scaled[:, 0] -= (scaled @ coef + intercept) / coef[0] + rng.normal(scale=1e-7, size=n_rows)
+    batch = pd.DataFrame(rng.normal(loc=100, scale=5, size=(n_rows, 6)), columns=loaded_models["RanFC"]["features"])
+    batch[entry["features"]] = entry["scaler"].inverse_transform(scaled)
+    return batch
+
+
+def test_predict_all_matches_model_by_model(loaded_models):
+    batch = near_boundary_batch(loaded_models)
+
+    fused = predict_all(batch, loaded_models)
+    expected = predict_directions(batch, loaded_models)
+
+    assert fused.dtype == np.int8
+    np.testing.assert_array_equal(fused, np.column_stack(list(expected.values())))
+    assert set(np.unique(fused)) <= {-1, 1}
+
+
+def test_predict_all_reuses_a_shared_executor(loaded_models):
+    batch = near_boundary_batch(loaded_models, n_rows=500)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = predict_all(batch, loaded_models, executor=executor)
+        second = predict_all(batch, loaded_models, executor=executor)
+
+    np.testing.assert_array_equal(first, second)
+    np.testing.assert_array_equal(first, predict_all(batch, loaded_models))
+
+
+class FailingModel:
+    """Stand-in model whose `predict` fails with an unexpected error."""
+
+    def predict(self, X):
+        raise RuntimeError("model crashed")
+
+
+def test_service_returns_500_and_counts_errors(loaded_models):
+    server = PredictionServer(("127.0.0.1", 0), {**loaded_models, "Broken": {**loaded_models["Log_R"], "model": FailingModel()}})
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    try:
+        batch = near_boundary_batch(loaded_models, n_rows=10)
+        with pytest.raises(HTTPError) as error:
+            request_predictions(batch, url)
+        assert error.value.code == 500
+        assert "model crashed" in json.loads(error.value.read())["error"]
+
+        with pytest.raises(HTTPError) as error:
+            request_predictions(batch.drop(columns="f0"), url)
+        assert error.value.code == 400
+
+        metrics = request_metrics(url)
+        assert metrics["errors"] == 2 and metrics["requests"] == 0
+    finally:
+        server.shutdown()
+        server.server_close()
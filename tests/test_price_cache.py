@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+from utilities.price_cache import find_missing_ranges, get_cached_prices, load_price_cache, save_price_cache
+
+
+def make_downloader(calls):
+    """Fake `download` that records its calls and returns business-day prices for every ticker."""
+    def download(tickers, start_date, end_date):
+        calls.append((tuple(tickers), start_date, end_date))
+        dates = pd.bdate_range(start_date, end_date, inclusive="left")
+        return pd.DataFrame({ticker: np.arange(1, len(dates) + 1, dtype=float) for ticker in tickers}, index=dates)
+    return download
+
+
+def test_find_missing_ranges_subtracts_every_interval():
+    coverage = {"A": [["2007-01-01", "2007-03-01"], ["2008-01-01", "2008-03-01"]]}
+
+    missing = find_missing_ranges(coverage, ["A", "B"], "2006-12-01", "2008-04-01")
+
+    assert missing == {
+        ("2006-12-01", "2007-01-01"): ["A"],
+        ("2007-03-01", "2008-01-01"): ["A"],
+        ("2008-03-01", "2008-04-01"): ["A"],
+        ("2006-12-01", "2008-04-01"): ["B"],
+    }
+    assert find_missing_ranges(coverage, ["A"], "2007-01-15", "2007-02-15") == {}
+
+
+def test_gap_between_separate_fetches_is_downloaded(tmp_path):
+    calls = []
+    download = make_downloader(calls)
+    tickers = ["A", "B", "C"]
+
+    get_cached_prices(tickers, "2007-01-01", "2007-03-01", download, cache_dir=tmp_path)
+    get_cached_prices(tickers, "2008-01-01", "2008-03-01", download, cache_dir=tmp_path)
+    prices = get_cached_prices(tickers, "2007-06-01", "2007-07-01", download, cache_dir=tmp_path)
+
+    assert calls[-1] == (tuple(tickers), "2007-06-01", "2007-07-01")
+    assert prices.shape == (len(pd.bdate_range("2007-06-01", "2007-06-30")), 3)
+
+    _, coverage = load_price_cache(tmp_path)
+    assert coverage["A"] == [["2007-01-01", "2007-03-01"], ["2007-06-01", "2007-06-30"], ["2008-01-01", "2008-03-01"]]
+
+
+def test_cached_range_is_served_without_download(tmp_path):
+    calls = []
+    download = make_downloader(calls)
+
+    expected = get_cached_prices(["A", "B"], "2007-01-01", "2007-03-01", download, cache_dir=tmp_path)
+    cached = get_cached_prices(["A", "B"], "2007-01-10", "2007-02-10", download, cache_dir=tmp_path)
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(cached, expected.loc["2007-01-10":"2007-02-09"])
+
+
+def test_adjacent_intervals_are_merged(tmp_path):
+    calls = []
+    download = make_downloader(calls)
+
+    get_cached_prices(["A"], "2007-01-01", "2007-02-01", download, cache_dir=tmp_path)
+    get_cached_prices(["A"], "2007-02-01", "2007-03-01", download, cache_dir=tmp_path)
+
+    _, coverage = load_price_cache(tmp_path)
+    assert coverage["A"] == [["2007-01-01", "2007-03-01"]]
+
+
+def test_single_interval_coverage_of_older_caches_is_read(tmp_path):
+    prices = pd.DataFrame({"A": [1.0]}, index=pd.to_datetime(["2007-01-02"]))
+    save_price_cache(prices, {"A": ["2007-01-01", "2007-03-01"]}, cache_dir=tmp_path)
+
+    _, coverage = load_price_cache(tmp_path)
+
+    assert coverage == {"A": [["2007-01-01", "2007-03-01"]]}
+
+
+def test_failed_ticker_is_fetched_again(tmp_path):
+    calls = []
+    download = make_downloader(calls)
+    failures = {"B"}
+
+    def flaky_download(tickers, start_date, end_date):
+        # Like `yf.download`: a failed ticker is an all-NaN column
+        prices = download(tickers, start_date, end_date)
+        prices[[ticker for ticker in tickers if ticker in failures]] = np.nan
+        return prices
+
+    first = get_cached_prices(["A", "B"], "2007-01-01", "2007-03-01", flaky_download, cache_dir=tmp_path)
+    failures.clear()
+    second = get_cached_prices(["A", "B"], "2007-01-01", "2007-03-01", flaky_download, cache_dir=tmp_path)
+
+    assert first["B"].isna().all()
+    assert calls[-1] == (("B",), "2007-01-01", "2007-03-01")
+    assert second["B"].notna().all()
+    _, coverage = load_price_cache(tmp_path)
+    assert coverage == {"A": [["2007-01-01", "2007-03-01"]], "B": [["2007-01-01", "2007-03-01"]]}
+
+
+def test_coverage_ends_after_the_last_returned_date(tmp_path):
+    calls = []
+    download = make_downloader(calls)
+
+    def download_until(tickers, start_date, end_date):
+        # Today's bar does not exist yet
+        return download(tickers, start_date, min(end_date, "2007-02-15"))
+
+    get_cached_prices(["A"], "2007-01-01", "2007-03-01", download_until, cache_dir=tmp_path)
+
+    _, coverage = load_price_cache(tmp_path)
+    assert coverage["A"] == [["2007-01-01", "2007-02-15"]]
+    assert find_missing_ranges(coverage, ["A"], "2007-01-01", "2007-03-01") == {("2007-02-15", "2007-03-01"): ["A"]}
@@ -0,0 +1,66 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utilities import chart_patterns
+from utilities.benchmark_utils import make_sp500_prices
+from utilities.chart_patterns import scan_patterns, find_head_and_shoulders
+
+
+@pytest.fixture(scope="module")
+def wide_prices():
+    # Not-yet-listed tickers as NaN, plus a delisted ticker
+    wide_close = make_sp500_prices(n_days=500, n_tickers=20, seed=7).replace(0.0, np.nan)
+    wide_close.iloc[-30:, 3] = np.nan
+    spread = np.random.default_rng(0).uniform(0.0, 0.02, size=wide_close.shape)
+    return wide_close * (1 + spread), wide_close * (1 - spread), wide_close
+
+
+def test_process_pool_matches_serial_scan(wide_prices):
+    serial = scan_patterns(*wide_prices, max_workers=1)
+    pooled = scan_patterns(*wide_prices, max_workers=2)
+
+    assert set(serial["Pattern"]) == set(chart_patterns.SCAN_PATTERN_NAMES)
+    pd.testing.assert_frame_equal(pooled, serial)
+
+
+def test_process_pool_matches_per_ticker_head_and_shoulders(wide_prices):
+    wide_close = wide_prices[2]
+
+    table = scan_patterns(*wide_prices, patterns=["head_and_shoulders"], max_workers=2)
+
+    for ticker in wide_close.columns:
+        rows = table.loc[table["Ticker"] == ticker]
+        expected = find_head_and_shoulders(wide_close[ticker])
+        assert (rows["Pattern"] == "head_and_shoulders").all()
+        np.testing.assert_array_equal(rows["Start Date"].to_numpy(), expected["left_shoulder"])
+        np.testing.assert_array_equal(rows["Pivot Date"].to_numpy(), expected["head"])
+        np.testing.assert_array_equal(rows["End Date"].to_numpy(), expected["right_shoulder"])
+        np.testing.assert_allclose(rows["Level"].to_numpy(), expected["neckline"])
+
+
+def test_process_pool_releases_shared_memory(wide_prices, monkeypatch):
+    created = []
+    SharedMemory = shared_memory.SharedMemory
+
+    def tracked_shared_memory(*args, **kwargs):
+        block = SharedMemory(*args, **kwargs)
+        if kwargs.get("create"):
+            created.append(block.name)
+        return block
+
+    monkeypatch.setattr(chart_patterns.shared_memory, "SharedMemory", tracked_shared_memory)
+
+    scan_patterns(*wide_prices, max_workers=2)
+
+    assert len(created) == 3
+    for name in created:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
+
+
+def test_unknown_pattern_is_rejected(wide_prices):
+    with pytest.raises(ValueError, match="Unknown patterns"):
+        scan_patterns(*wide_prices, patterns=["triangle"], max_workers=2)
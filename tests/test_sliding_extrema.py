@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utilities.benchmark_utils import make_sp500_prices
+from utilities.feature_engine import compute_features
+from utilities.sliding_extrema import sliding_extrema, sliding_min, sliding_max
+
+
+@pytest.fixture(scope="module")
+def prices():
+    prices = make_sp500_prices(n_days=260, n_tickers=8, seed=5)
+    values = prices.to_numpy().copy()
+
+    # Scattered missing days, a late listing and a gap longer than the windows
+    rng = np.random.default_rng(2)
+    values[rng.random(values.shape) < 0.03] = np.nan
+    values[:40, 0] = np.nan
+    values[90:150, 1] = np.nan
+
+    prices.iloc[:, :] = values
+    return prices
+
+
+@pytest.mark.parametrize("window", [1, 2, 3, 7, 20, 50, 259, 260])
+def test_sliding_min_max_match_pandas_rolling(prices, window):
+    pd.testing.assert_frame_equal(sliding_min(prices, window), prices.rolling(window).min())
+    pd.testing.assert_frame_equal(sliding_max(prices, window), prices.rolling(window).max())
+
+
+@pytest.mark.parametrize("window", [261, 1000])
+def test_window_longer_than_the_series_is_all_nan(prices, window):
+    assert sliding_min(prices, window).isna().all().all()
+    assert sliding_max(prices, window).isna().all().all()
+
+
+def test_window_of_one_returns_the_values(prices):
+    pd.testing.assert_frame_equal(sliding_min(prices, 1), prices.astype(np.float64))
+    pd.testing.assert_frame_equal(sliding_max(prices, 1), prices.astype(np.float64))
+
+
+def test_series_and_array_inputs(prices):
+    series = prices.iloc[:, 1]
+    extrema = sliding_extrema(series, windows=[5, 30])
+
+    pd.testing.assert_series_equal(extrema[("min", 5)], series.rolling(5).min())
+    pd.testing.assert_series_equal(extrema[("max", 30)], series.rolling(30).max())
+    np.testing.assert_array_equal(sliding_max(series.to_numpy(), 5), series.rolling(5).max().to_numpy())
+    np.testing.assert_array_equal(sliding_min(prices.to_numpy(), 5), prices.rolling(5).min().to_numpy())
+
+
+def test_extra_channel_windows_match_pandas_rolling(prices):
+    features = compute_features(prices, spec={"channel_window": 20, "extra_channel_windows": [20, 5, 120]})
+
+    pd.testing.assert_frame_equal(features["Support"], prices.rolling(20).min())
+    pd.testing.assert_frame_equal(features["Resistance"], prices.rolling(20).max())
+    for window in [20, 5, 120]:
+        pd.testing.assert_frame_equal(features[f"Support_{window}"], prices.rolling(window).min())
+        pd.testing.assert_frame_equal(features[f"Resistance_{window}"], prices.rolling(window).max())
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import (accuracy_score, confusion_matrix, f1_score, mean_absolute_error, mean_squared_error,
+                             precision_score, r2_score, recall_score)
+from sklearn.preprocessing import StandardScaler
+
+from utilities import statistical_analysis
+from utilities.statistical_analysis import (adj_r2_score, calc_vif, classification_metrics, evaluate_regression_model,
+                                            grouped_classification_metrics, regression_metrics)
+
+
+@pytest.mark.parametrize("labels", [[-1, 1], [0, 1], [-1, 0, 1], ["Buy", "Hold", "Sell"]])
+def test_classification_metrics_match_sklearn(labels):
+    rng = np.random.default_rng(0)
+    y_true = rng.choice(labels, 5000)
+    y_pred = rng.choice(labels[:-1] if len(labels) > 2 else labels, 5000)  # A label missing from the predictions
+
+    metrics = classification_metrics(y_true, y_pred)
+
+    np.testing.assert_array_equal(metrics["confusion_matrix"], confusion_matrix(y_true, y_pred))
+    assert metrics["accuracy"] == pytest.approx(accuracy_score(y_true, y_pred))
+    assert metrics["precision"] == pytest.approx(precision_score(y_true, y_pred, average="weighted", zero_division=0))
+    assert metrics["recall"] == pytest.approx(recall_score(y_true, y_pred, average="weighted", zero_division=0))
+    assert metrics["f1"] == pytest.approx(f1_score(y_true, y_pred, average="weighted", zero_division=0))
+    assert all(type(metrics[key]) is float for key in ["accuracy", "precision", "recall", "f1"])
+
+
+def test_regression_metrics_match_sklearn():
+    rng = np.random.default_rng(0)
+    y_true = 100 + rng.normal(size=10_000).cumsum()
+    y_pred = y_true + rng.normal(scale=0.5, size=len(y_true))
+
+    metrics = regression_metrics(y_true, y_pred, n_features=4, chunk_rows=999)
+
+    r2 = r2_score(y_true, y_pred)
+    assert metrics["mse"] == pytest.approx(mean_squared_error(y_true, y_pred))
+    assert metrics["rmse"] == pytest.approx(np.sqrt(mean_squared_error(y_true, y_pred)))
+    assert metrics["r2"] == pytest.approx(r2)
+    assert metrics["adj_r2"] == pytest.approx(1 - (1 - r2) * (len(y_true) - 1) / (len(y_true) - 4 - 1))
+    assert metrics["mae"] == pytest.approx(mean_absolute_error(y_true, y_pred))
+    assert metrics["mape"] == pytest.approx(np.mean(np.abs((y_true - y_pred) / y_true)) * 100)
+    assert all(type(value) is float for value in metrics.values())
+
+
+def test_evaluate_regression_model_does_not_rescore_the_model(monkeypatch):
+    printed = {}
+    monkeypatch.setattr(statistical_analysis, "print_regression_metrics",
+                        lambda model_name, train_metrics, test_metrics: printed.update(train=train_metrics, test=test_metrics))
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(500, 3)), columns=["a", "b", "c"])
+    y_unscaled = pd.Series(X @ [1.0, -2.0, 0.5] + rng.normal(size=500) + 50)
+    y_scaler = StandardScaler().fit(y_unscaled.to_frame())
+    y = pd.Series(y_scaler.transform(y_unscaled.to_frame()).ravel())
+    model = LinearRegression().fit(X[:400], y[:400])
+    pred_unscaled = y_scaler.inverse_transform(model.predict(X).reshape(-1, 1)).ravel()
+    arguments = (model, "Linear", X[:400], y[:400], X[400:], y[400:], y_unscaled[:400], y_unscaled[400:], pred_unscaled[:400], pred_unscaled[400:])
+
+    score_calls = []
+    original_score = LinearRegression.score
+    monkeypatch.setattr(LinearRegression, "score", lambda self, *args: score_calls.append(1) or original_score(self, *args))
+
+    assert evaluate_regression_model(*arguments) is None
+    fused = dict(printed)
+    assert score_calls == []
+
+    evaluate_regression_model(*arguments, use_model_score=True)
+    assert len(score_calls) == 2
+
+    # Affine target scaler: the fused adjusted R-squared equals the one from `model.score`
+    assert fused["train"]["adj_r2"] == pytest.approx(adj_r2_score(model, X[:400], y[:400]))
+    assert fused["test"]["adj_r2"] == pytest.approx(adj_r2_score(model, X[400:], y[400:]))
+    assert printed["test"]["adj_r2"] == adj_r2_score(model, X[400:], y[400:])
+    assert fused["test"]["r2"] == pytest.approx(r2_score(y_unscaled[400:], pred_unscaled[400:]))
+
+
+@pytest.mark.parametrize("y_true", [
+    pd.array([1, -1, None, 1], dtype="Int8"),
+    np.array([1.0, -1.0, np.nan, 1.0]),
+])
+def test_missing_labels_raise(y_true):
+    y_pred = np.array([1, 1, -1, 1])
+
+    with pytest.raises(ValueError, match="missing labels"):
+        classification_metrics(y_true, y_pred)
+    with pytest.raises(ValueError, match="missing labels"):
+        grouped_classification_metrics(np.array(["A", "A", "B", "B"]), y_true, y_pred)
+
+
+def test_support_is_an_integer():
+    metrics = classification_metrics(pd.array([1, -1, 1, 1, -1], dtype="Int8"), np.array([1, 1, -1, 1, -1]))
+
+    assert metrics["support"] == 5 and type(metrics["support"]) is int
+
+
+@pytest.mark.parametrize("with_constant", [False, True])
+def test_closed_form_vif_matches_statsmodels(with_constant):
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=(3000, 3))
+    df = pd.DataFrame({
+        "a": 100 + base[:, 0],
+        "b": 50 + base[:, 0] * 0.8 + base[:, 1] * 0.3,  # Correlated with a
+        "c": base[:, 2] * 10,
+        "d": base[:, 1] - base[:, 2] * 0.5 + rng.normal(scale=0.1, size=3000),
+    })
+    if with_constant:
+        df.insert(0, "const", 1.0)
+
+    closed_form = calc_vif(df)
+    reference = calc_vif(df, method="statsmodels")
+
+    pd.testing.assert_series_equal(closed_form["VIF"], reference.loc[closed_form.index, "VIF"], rtol=1e-7)
+    assert list(closed_form["VIF"]) == sorted(closed_form["VIF"])
+
+
+def test_grouped_classification_metrics_match_each_group():
+    rng = np.random.default_rng(0)
+    n_rows = 6000
+    tickers = pd.Series(pd.Categorical(rng.choice(["AAPL", "MSFT", "NVDA", "XOM"], n_rows),
+                                       categories=["AAPL", "MSFT", "NVDA", "XOM"]), name="Ticker")
+    y_true = rng.choice([-1, 1], n_rows)
+    predictions = {"XGB": np.where(rng.random(n_rows) < 0.7, y_true, -y_true), "Log_R": rng.choice([-1, 1], n_rows)}
+
+    report = grouped_classification_metrics(tickers, y_true, predictions)
+
+    assert report.index.names == ["Model", "Ticker"]
+    for model, y_pred in predictions.items():
+        for ticker in tickers.cat.categories:
+            mask = (tickers == ticker).to_numpy()
+            expected = classification_metrics(y_true[mask], y_pred[mask], labels=[-1, 1])
+            row = report.loc[(model, ticker)]
+            assert row["Support"] == mask.sum()
+            for metric in ["accuracy", "precision", "recall", "f1"]:
+                assert row[metric.capitalize() if metric != "f1" else "F1"] == pytest.approx(expected[metric])
+            assert row["True 1 / Pred -1"] == expected["confusion_matrix"][1, 0]
+            assert row["Accuracy"] == pytest.approx(accuracy_score(y_true[mask], y_pred[mask]))
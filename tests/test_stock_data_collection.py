@@ -0,0 +1,28 @@
+import pytest
+
+from utilities.market_data_providers import MarketDataProvider
+from utilities.stock_data_collection import sp500_data_for_today
+
+
+class DownProvider(MarketDataProvider):
+    """Provider whose every request fails."""
+
+    def download_adj_close(self, tickers, start_date, end_date):
+        raise ConnectionError("download unavailable")
+
+    def minute_bars(self, ticker_symbol, timeout=10):
+        raise ConnectionError(f"{ticker_symbol} unavailable")
+
+
+def test_all_tickers_failing_raises_a_clear_error():
+    with pytest.raises(ValueError, match="AAA, BBB"):
+        sp500_data_for_today(tickers=["AAA", "BBB"], retries=0, provider=DownProvider())
+
+
+def test_provider_must_implement_the_interface():
+    class PartialProvider(MarketDataProvider):
+        def minute_bars(self, ticker_symbol, timeout=10):
+            return None
+
+    with pytest.raises(TypeError, match="download_adj_close"):
+        PartialProvider()
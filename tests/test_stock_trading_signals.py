@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utilities.feature_frame import build_featured_frame
+from utilities.stock_indicators import calculate_rsi
+from utilities.stock_trading_signals import (ACTION_CATEGORIES, generate_action_codes, generate_rule_signals,
+                                             generate_trading_signals)
+
+
+@pytest.fixture(scope="module")
+def flat_prices():
+    """Prices rounded to whole dollars, so there are many neutral runs, with a few missing values."""
+    rng = np.random.default_rng(0)
+    prices = pd.DataFrame(np.round(50 + rng.normal(scale=0.6, size=(400, 8)).cumsum(axis=0)),
+                          index=pd.bdate_range("2020-01-01", periods=400), columns=[f"T{i}" for i in range(8)])
+    prices.iloc[100:105, 2] = np.nan
+    prices.iloc[:30, 5] = np.nan
+    return prices
+
+
+def baseline_actions(prices):
+    """Actions of `main.ipynb`: `generate_trading_signals` applied ticker by ticker."""
+    return prices.apply(generate_trading_signals)
+
+
+def decode(codes):
+    return pd.DataFrame(np.where(codes >= 0, np.array(ACTION_CATEGORIES, dtype=object)[codes], None),
+                        index=codes.index, columns=codes.columns)
+
+
+def test_action_codes_match_baseline(flat_prices):
+    expected = baseline_actions(flat_prices)
+
+    codes = generate_action_codes(flat_prices, fill_neutral_runs=False)
+
+    assert codes.to_numpy().dtype == np.int8
+    pd.testing.assert_frame_equal(decode(codes).isna(), expected.isna())
+    assert (decode(codes).fillna("NA") == expected.fillna("NA")).all().all()
+
+
+def test_filled_neutral_runs_only_differ_where_baseline_has_no_action(flat_prices):
+    expected = baseline_actions(flat_prices)
+
+    filled = decode(generate_action_codes(flat_prices))
+
+    differs = filled.fillna("NA") != expected.fillna("NA")
+    assert differs.to_numpy().any()
+    assert expected.where(differs).isna().all().all()
+
+
+def test_series_codes_match_dataframe_codes(flat_prices):
+    codes = generate_action_codes(flat_prices, fill_neutral_runs=False)
+
+    for ticker in flat_prices.columns:
+        np.testing.assert_array_equal(generate_action_codes(flat_prices[ticker], fill_neutral_runs=False).to_numpy(), codes[ticker].to_numpy())
+
+
+def test_featured_frame_action_defaults_to_baseline(flat_prices):
+    expected = baseline_actions(flat_prices).to_numpy().ravel()
+
+    actions = build_featured_frame(flat_prices, features={})["Action"]
+    filled_actions = build_featured_frame(flat_prices, features={}, fill_neutral_runs=True)["Action"]
+
+    assert list(actions.astype(object).where(actions.notna(), None)) == [None if pd.isna(action) else action for action in expected]
+    assert (filled_actions.astype(str) != actions.astype(str)).any()
+
+
+def loop_rule_signals(close, window=20, num_std=2, rsi_window=14, fast_window=50, slow_window=200):
+    """Row-by-row rules of one ticker, like the loops of `scripts/` (Bollinger breach, RSI thresholds, SMA crossover)."""
+    sma, std = close.rolling(window).mean(), close.rolling(window).std()
+    rsi = calculate_rsi(close, window=rsi_window)
+    spread = close.rolling(fast_window).mean() - close.rolling(slow_window).mean()
+
+    bollinger, rsi_signals, sma_cross = [], [], []
+    for i in range(len(close)):
+        bollinger.append(-1 if close.iloc[i] > sma.iloc[i] + num_std * std.iloc[i]
+                         else 1 if close.iloc[i] < sma.iloc[i] - num_std * std.iloc[i] else 0)
+        rsi_signals.append(1 if rsi.iloc[i] < 30 else -1 if rsi.iloc[i] > 70 else 0)
+        if i > 0 and spread.iloc[i] > 0 and spread.iloc[i - 1] <= 0:
+            sma_cross.append(1)
+        elif i > 0 and spread.iloc[i] < 0 and spread.iloc[i - 1] >= 0:
+            sma_cross.append(-1)
+        else:
+            sma_cross.append(0)
+    return {"bollinger": bollinger, "rsi": rsi_signals, "sma_cross": sma_cross}
+
+
+def test_rule_signals_match_loops():
+    rng = np.random.default_rng(1)
+    prices = pd.DataFrame(100 * np.exp(rng.normal(scale=0.02, size=(600, 4)).cumsum(axis=0)),
+                          index=pd.bdate_range("2020-01-01", periods=600), columns=list("ABCD"))
+
+    signals = generate_rule_signals(prices)
+
+    for ticker in prices.columns:
+        expected = loop_rule_signals(prices[ticker])
+        for rule, codes in signals.items():
+            assert codes[ticker].dtype == np.int8
+            np.testing.assert_array_equal(codes[ticker].to_numpy(), expected[rule], err_msg=f"{rule} / {ticker}")
+    assert all((codes != 0).to_numpy().any() for codes in signals.values())
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import TimeSeriesSplit
+
+from utilities.temporal_train_test_split import temporal_train_test_split, evaluate_walk_forward, walk_forward_splits
+
+
+def make_panel(n_dates=60, n_tickers=5, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Date": np.repeat(pd.bdate_range("2024-01-01", periods=n_dates), n_tickers),
+        "Ticker": pd.Categorical(np.tile([f"T{i}" for i in range(n_tickers)], n_dates)),
+        "Feature": rng.normal(size=n_dates * n_tickers),
+    })
+    df["Target"] = (df["Feature"] + rng.normal(scale=0.5, size=len(df)) > 0).astype(int)
+    return df.sample(frac=1, random_state=0).reset_index(drop=True)  # Rows out of date order
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_temporal_split_does_not_share_data_with_the_input(compact):
+    df = make_panel()
+    original = df.copy()
+
+    X_train, X_test, y_train, y_test = temporal_train_test_split(df, "Date", "Target", "2024-02-15", compact=compact)
+    X_train["Feature"] = 0.0
+    X_test.iloc[0, X_test.columns.get_loc("Feature")] = 100.0
+    y_train.iloc[:] = -1
+
+    pd.testing.assert_frame_equal(df, original)
+    assert len(X_train) + len(X_test) == len(df)
+    assert (y_test.index == X_test.index).all()
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"train_window": 10}, {"test_window": 5, "gap": 2}])
+def test_walk_forward_splits_match_time_series_split(kwargs):
+    df = make_panel()
+    dates = np.sort(df["Date"].unique())
+    tss = TimeSeriesSplit(n_splits=4, max_train_size=kwargs.get("train_window"),
+                          test_size=kwargs.get("test_window"), gap=kwargs.get("gap", 0))
+
+    for (train_index, test_index), (date_train, date_test) in zip(walk_forward_splits(df, "Date", n_splits=4, **kwargs), tss.split(dates)):
+        assert set(df["Date"].iloc[train_index]) == set(dates[date_train])
+        assert set(df["Date"].iloc[test_index]) == set(dates[date_test])
+        assert len(train_index) == df["Date"].isin(dates[date_train]).sum()
+
+
+def test_evaluate_walk_forward_encodes_categoricals_and_matches_a_loop():
+    df = make_panel()
+    model = LogisticRegression()
+
+    scores = evaluate_walk_forward(model, df, "Date", "Target", n_splits=3, scoring="accuracy", max_workers=2)
+
+    X = df[["Ticker", "Feature"]].assign(Ticker=df["Ticker"].cat.codes)
+    for (train_index, test_index), score in zip(walk_forward_splits(df, "Date", n_splits=3), scores["Score"]):
+        fitted = LogisticRegression().fit(X.iloc[train_index].to_numpy(), df["Target"].iloc[train_index])
+        assert score == pytest.approx(accuracy_score(df["Target"].iloc[test_index], fitted.predict(X.iloc[test_index].to_numpy())))
+
+
+def test_evaluate_walk_forward_rejects_unpicklable_scoring():
+    df = make_panel()
+
+    with pytest.raises(TypeError, match="picklable"):
+        evaluate_walk_forward(LogisticRegression(), df, "Date", "Target", n_splits=3,
+                              scoring=lambda y_true, y_pred: 0.0, max_workers=2)
+
+    scores = evaluate_walk_forward(LogisticRegression(), df, "Date", "Target", n_splits=3,
+                                   scoring=lambda y_true, y_pred: 0.0, max_workers=1)
+    assert (scores["Score"] == 0.0).all()
@@ -4,12 +4,22 @@ This package includes various modules for technical indicators,
 predictions, models, and preprocessing functions.
 """
 
-from .dataframe_utils import save_data, load_data, print_dataframe_report
+from .dataframe_utils import save_data, load_data, iter_data, compact_dtypes, print_dataframe_report, print_memory_report
+from .dataset_store import save_partitioned, append_data, load_partitioned, print_dataset_report
 from .print_utils import print_title, print_label, print_footer
 from .stock_data_collection import fetch_and_download_sp500_data, sp500_data_for_today
+from .sp500_constituents import get_sp500_tickers
 from .stock_indicators import calculate_bollinger_bands, calculate_rsi, calculate_daily_volatility
-from .stock_trading_signals import generate_trading_signals
-from .temporal_train_test_split import temporal_train_test_split
-from .statistical_analysis import calc_vif, calc_p_values, calc_correlation, highlight_vif, highlight_p_values, evaluate_regression_model, evaluate_cross_validation, evaluate_classifier_model
+from .incremental_indicators import IncrementalIndicators
+from .feature_engine import compute_features, iter_features
+from .feature_frame import build_featured_frame
+from .sliding_extrema import sliding_extrema, sliding_min, sliding_max
+from .chart_patterns import find_head_and_shoulders, scan_patterns
+from .stock_trading_signals import generate_trading_signals, generate_action_codes, generate_rule_signals
+from .backtesting import backtest, positions_from_predictions, load_prediction_sets, print_backtest_report
+from .model_registry import build_model_index, list_models, get_model_info, load_model, save_model, convert_to_joblib, print_model_index
+from .prediction_service import load_prediction_models, predict_all, predict_directions, create_prediction_server, request_predictions, request_metrics
+from .temporal_train_test_split import temporal_train_test_split, walk_forward_splits, evaluate_walk_forward
+from .statistical_analysis import calc_vif, calc_p_values, calc_correlation, highlight_vif, highlight_p_values, evaluate_regression_model, evaluate_cross_validation, evaluate_classifier_model, classification_metrics, regression_metrics, grouped_classification_metrics, print_classification_metrics, print_regression_metrics
 from .christian_utils import split_dataset_by_date, clean_historical_data, check_tickers_for_missing_values
 from .stock_features import generate_directions
\ No newline at end of file
@@ -0,0 +1,283 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+
+# Import in-house utilities
+if current_dir in sys.path:
+    # If current directory is in sys.path, use relative import
+    from print_utils import print_title, print_label
+    from dataframe_utils import load_data
+else:
+    # Otherwise, use absolute import
+    from utilities.print_utils import print_title, print_label
+    from utilities.dataframe_utils import load_data
+
+# Saved model predictions (`save_data` zip files)
+DEFAULT_PREDICTIONS_DIR = Path(parent_dir) / "models" / "christian's_models" / "prediction_outputs"
+
+# Trading days per year (used to annualize the Sharpe ratio)
+TRADING_DAYS_PER_YEAR = 252
+
+# Columns of the backtest metrics
+BACKTEST_METRICS = ["Total Return", "Hit Rate", "Sharpe", "Max Drawdown", "Turnover", "Costs", "Active Days"]
+
+# ================================================
+# Positions
+# ================================================
+def positions_from_predictions(predictions, prediction_column, kind="direction", date_column="Date",
+                               ticker_column="Ticker", price_column="Adjusted Close"):
+    """
+    Convert long-format model predictions into a wide matrix of positions (dates x tickers).
+
+    Parameters:
+    - predictions: Long DataFrame with one row per (date, ticker)
+    - prediction_column: Column of the predictions
+    - kind: `direction` for classifier outputs (1 is long, -1 or 0 is short, like the
+      `y == 0 -> -1` mapping of `main.ipynb`), or `price` for predicted next-day closes
+      (long if above `price_column`, short if below)
+    - date_column, ticker_column: Columns of the dates and tickers
+    - price_column: Column of today's price (only used for `price` predictions)
+
+    Returns:
+    - Wide DataFrame of positions (1 long, -1 short, 0 flat), NaN where there is no prediction
+    """
+    if kind == "direction":
+        signal = np.where(predictions[prediction_column] > 0, 1.0, -1.0)
+    elif kind == "price":
+        signal = np.sign(predictions[prediction_column] - predictions[price_column]).to_numpy(dtype=np.float64)
+    else:
+        raise ValueError(f"Unknown prediction kind '{kind}'. Use 'direction' or 'price'.")
+
+    signal = np.where(predictions[prediction_column].isna(), np.nan, signal)
+    positions = pd.DataFrame({
+        date_column: pd.to_datetime(predictions[date_column]),
+        ticker_column: predictions[ticker_column],
+        "Position": signal,
+    })
+    return positions.pivot_table(index=date_column, columns=ticker_column, values="Position", aggfunc="last")
+
+# ================================================
+# Metrics
+# ================================================
+def _metrics(pnl, hits, active, periods_per_year):
+    """
+    Backtest metrics along the date axis (axis -2) of daily P&L arrays.
+
+    Parameters:
+    - pnl: Array of daily P&L (..., dates, columns); NaN where there is no return
+    - hits: Boolean array, True where the position was on the side of the return (before costs)
+    - active: Boolean array, True where a position was held over a known return
+    - periods_per_year: Number of periods per year for the Sharpe ratio
+
+    Returns:
+    - Dict of metric name -> array of shape (..., columns)
+    """
+    traded = ~np.isnan(pnl)
+    returns = np.where(traded, pnl, 0.0)
+    n_days = traded.sum(axis=-2)
+
+    # Compounded equity curve and drawdowns
+    equity = np.cumprod(1 + returns, axis=-2)
+    drawdown = equity / np.maximum.accumulate(equity, axis=-2) - 1
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = returns.sum(axis=-2) / n_days
+        variance = ((returns - mean[..., None, :]) ** 2 * traded).sum(axis=-2) / (n_days - 1)
+        sharpe = mean / np.sqrt(variance) * np.sqrt(periods_per_year)
+        hit_rate = (hits & active).sum(axis=-2) / active.sum(axis=-2)
+
+    return {
+        "Total Return": equity[..., -1, :] - 1 if equity.shape[-2] else np.zeros(equity.shape[:-2] + equity.shape[-1:]),
+        "Hit Rate": hit_rate,
+        "Sharpe": np.where(np.isfinite(sharpe), sharpe, np.nan),
+        "Max Drawdown": drawdown.min(axis=-2, initial=0.0),
+        "Active Days": active.sum(axis=-2),
+    }
+
+# ================================================
+# Backtest
+# ================================================
+def backtest(predictions, prices, costs=0.0, periods_per_year=TRADING_DAYS_PER_YEAR):
+    """
+    Backtest the positions of several models over a universe of tickers at once.
+
+    A position taken on a date is held from that date's close to the next date's close.
+    Positions of -1 are short, so the -1/1 outputs of the classifiers can be used directly
+    (see `positions_from_predictions`). Every model is evaluated in the same vectorized pass
+    over a (models x dates x tickers) array.
+
+    Transaction costs are charged on every change of position (opening a position from flat
+    counts as a change of 1, flipping from long to short as a change of 2), and turnover is the
+    mean absolute change of position per day. The hit rate counts the days the position was on
+    the side of the move, before costs. The portfolio holds all the tickers with equal weights
+    on each date.
+
+    Parameters:
+    - predictions: Dict of model name -> wide DataFrame of positions (dates x tickers, -1/0/1,
+      NaN for no position), or a single wide DataFrame of positions
+    - prices: Wide DataFrame of prices (dates x tickers), including the date after the last position
+    - costs: Transaction cost as a fraction of the traded notional (e.g. 0.0005 for 5 bps)
+    - periods_per_year: Number of periods per year for the Sharpe ratio
+
+    Returns:
+    - Tuple of:
+      - DataFrame of portfolio metrics indexed by model (see `BACKTEST_METRICS`)
+      - DataFrame of per-ticker metrics indexed by (model, ticker)
+      - DataFrame of daily portfolio P&L (dates x models)
+    """
+    if isinstance(predictions, pd.DataFrame):
+        predictions = {"model": predictions}
+
+    prices = prices.sort_index()
+    dates, tickers, models = prices.index, prices.columns, list(predictions)
+
+    # Forward returns: from each date's close to the next date's close
+    price_values = prices.to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        forward_returns = np.full(price_values.shape, np.nan)
+        forward_returns[:-1] = price_values[1:] / price_values[:-1] - 1
+    forward_returns[~np.isfinite(forward_returns)] = np.nan
+
+    # Positions of every model on the price grid: (models, dates, tickers)
+    positions = np.stack([
+        predictions[model].reindex(index=dates, columns=tickers).to_numpy(dtype=np.float64) for model in models
+    ]) if models else np.empty((0,) + price_values.shape)
+    held = np.nan_to_num(positions)
+
+    # Changes of position (starting flat) and their costs
+    position_changes = np.abs(np.diff(held, axis=1, prepend=0.0))
+    gross_pnl = held * forward_returns
+    pnl = gross_pnl - costs * position_changes
+    pnl[:, np.isnan(forward_returns)] = np.nan
+
+    # Costs are only charged on the days whose P&L is known, like the P&L they are charged against
+    charged_changes = np.where(np.isnan(forward_returns), 0.0, position_changes)
+
+    active = (held != 0) & ~np.isnan(forward_returns)
+
+    # Per-ticker metrics
+    ticker_metrics = _metrics(pnl, gross_pnl > 0, active, periods_per_year)
+    ticker_metrics["Turnover"] = position_changes.mean(axis=1) if len(dates) else np.zeros(position_changes.shape[::2])
+    ticker_metrics["Costs"] = costs * charged_changes.sum(axis=1)
+    per_ticker = pd.DataFrame(
+        {name: ticker_metrics[name].reshape(-1) for name in BACKTEST_METRICS},
+        index=pd.MultiIndex.from_product([models, tickers], names=["Model", "Ticker"]),
+    )
+
+    # Equal-weight portfolio of the tickers with a known return on each date
+    with np.errstate(invalid="ignore"):
+        n_priced = (~np.isnan(forward_returns)).sum(axis=1)
+        portfolio_pnl = np.where(n_priced > 0, np.nansum(pnl, axis=2) / np.maximum(n_priced, 1), np.nan)
+        portfolio_hits = np.nansum(gross_pnl, axis=2) > 0
+        portfolio_active = active.any(axis=2)
+
+    portfolio_metrics = _metrics(portfolio_pnl[..., None], portfolio_hits[..., None], portfolio_active[..., None], periods_per_year)
+    portfolio_metrics["Turnover"] = position_changes.mean(axis=(1, 2))[:, None] if len(dates) else np.zeros((len(models), 1))
+    portfolio_metrics["Costs"] = ticker_metrics["Costs"].mean(axis=1)[:, None]
+    summary = pd.DataFrame({name: portfolio_metrics[name][:, 0] for name in BACKTEST_METRICS}, index=pd.Index(models, name="Model"))
+
+    daily_pnl = pd.DataFrame(portfolio_pnl.T, index=dates, columns=models)
+    return summary, per_ticker, daily_pnl
+
+# ================================================
+# Saved Predictions
+# ================================================
+def load_prediction_sets(predictions_dir=DEFAULT_PREDICTIONS_DIR):
+    """
+    Load the saved classifier and regression predictions as positions, with the prices they contain.
+
+    - `clf_*` files: `Pred Today to Tomorrow` directions
+    - `reg_*` files: `Next Day Close` predicted prices
+    - Other files (e.g. `todays_data_predict`): every `<model> Today to Tomorrow` direction column,
+      as `<file>_<model>` (e.g. `todays_data_predict_XGB`). These are predictions for the day after the
+      last saved date, so they only have active days once that day's prices are added to `prices`.
+
+    Parameters:
+    - predictions_dir: Directory of the saved prediction zip files
+
+    Returns:
+    - Tuple of (dict of model name -> wide positions, wide DataFrame of the `Adjusted Close`
+      prices found in all the files of the directory)
+    """
+    predictions_dir = Path(predictions_dir)
+    positions, price_frames = {}, []
+
+    for file_path in sorted(predictions_dir.glob("*.zip")):
+        df = load_data(file_path)
+        if df is None:
+            continue
+
+        price_frames.append(df[["Date", "Ticker", "Adjusted Close"]])
+        model = file_path.stem
+        if model.startswith("clf_") and "Pred Today to Tomorrow" in df.columns:
+            positions[model] = positions_from_predictions(df, "Pred Today to Tomorrow", kind="direction")
+        elif model.startswith("reg_") and "Next Day Close" in df.columns:
+            positions[model] = positions_from_predictions(df, "Next Day Close", kind="price")
+        else:
+            # `Today to Tomorrow` is the actual direction; prefixed columns are model predictions
+            for column in df.columns:
+                if column.endswith(" Today to Tomorrow") and column != "Pred Today to Tomorrow":
+                    prefix = column[:-len(" Today to Tomorrow")]
+                    positions[f"{model}_{prefix}"] = positions_from_predictions(df, column, kind="direction")
+
+    if not price_frames:
+        return positions, pd.DataFrame()
+
+    prices = pd.concat(price_frames, ignore_index=True)
+    prices["Date"] = pd.to_datetime(prices["Date"])
+    prices = prices.pivot_table(index="Date", columns="Ticker", values="Adjusted Close", aggfunc="last")
+    return positions, prices
+
+def print_backtest_report(summary, title="Backtest Report"):
+    """
+    Print the portfolio metrics of every model.
+
+    Parameters:
+    - summary: Portfolio metrics returned by `backtest`
+    - title: Title of the report
+    """
+    BORDER_COLOR = "blue"
+    TEXT_COLOR = "bright_blue"
+
+    print_title(title, TEXT_COLOR, BORDER_COLOR, closed_corners=False)
+    print_label("Model:", "Return | Hit | Sharpe | MaxDD", TEXT_COLOR, BORDER_COLOR)
+    for model, metrics in summary.iterrows():
+        print_label(f"{model}:", f"{metrics['Total Return']:+.2%} | {metrics['Hit Rate']:.0%} | "
+                    f"{metrics['Sharpe']:.1f} | {metrics['Max Drawdown']:.1%}", TEXT_COLOR, BORDER_COLOR)
+    print_label("", "", closed_corners=True)
+
+if __name__ == "__main__":
+    # Backtest the saved prediction sets, then time the engine on a synthetic universe
+    # Usage: python -m utilities.backtesting [n_days] [n_tickers]
+    import time
+
+    if current_dir in sys.path:
+        from benchmark_utils import make_sp500_prices
+    else:
+        from utilities.benchmark_utils import make_sp500_prices
+
+    positions, prices = load_prediction_sets()
+    summary, per_ticker, daily_pnl = backtest(positions, prices, costs=0.0005)
+    print_backtest_report(summary, "Saved Predictions (5 bps costs)")
+
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else 4500
+    n_tickers = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    synthetic_prices = make_sp500_prices(n_days, n_tickers)
+    rng = np.random.default_rng(0)
+    synthetic_positions = {
+        f"model_{i}": pd.DataFrame(rng.choice([-1.0, 1.0], size=synthetic_prices.shape), index=synthetic_prices.index, columns=synthetic_prices.columns)
+        for i in range(6)
+    }
+
+    start_time = time.perf_counter()
+    backtest(synthetic_positions, synthetic_prices, costs=0.0005)
+    elapsed = time.perf_counter() - start_time
+
+    print_title(f"Backtest: 6 models x {n_days} days x {n_tickers} tickers", "bright_blue", "blue", closed_corners=False)
+    print_label("Elapsed:", f"{elapsed:.2f}s", "bright_blue", "blue", closed_corners=True)
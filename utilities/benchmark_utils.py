@@ -0,0 +1,95 @@
+import time
+import numpy as np
+import pandas as pd
+
+# ================================================
+# Synthetic S&P 500 Data
+# ================================================
+def make_sp500_prices(n_days=4500, n_tickers=500, seed=42, start_date="2007-01-03"):
+    """
+    Generate a synthetic wide matrix of adjusted close prices shaped like the S&P 500 download.
+
+    Prices follow geometric random walks. About 10% of the tickers are listed part way
+    through the history and have a price of 0 before their listing date, like the
+    `fillna(0)` output of `fetch_and_download_sp500_data`.
+
+    Parameters:
+    - n_days: Number of trading days (rows)
+    - n_tickers: Number of tickers (columns)
+    - seed: Random seed for reproducibility
+    - start_date: First trading day
+
+    Returns:
+    - DataFrame with the dates as the index and the tickers as the columns
+    """
+    rng = np.random.default_rng(seed)
+
+    returns = rng.normal(0.0003, 0.02, size=(n_days, n_tickers))
+    start_prices = rng.uniform(10, 500, size=n_tickers)
+    prices = start_prices * np.exp(np.cumsum(returns, axis=0))
+
+    # Tickers listed part way through the history
+    late_listed = rng.choice(n_tickers, size=n_tickers // 10, replace=False)
+    listing_days = rng.integers(1, n_days // 2, size=late_listed.size)
+    for ticker, listing_day in zip(late_listed, listing_days):
+        prices[:listing_day, ticker] = 0.0
+
+    dates = pd.bdate_range(start=start_date, periods=n_days, name="Date")
+    tickers = pd.Index([f"T{i:03d}" for i in range(n_tickers)], name="Ticker")
+
+    return pd.DataFrame(prices.round(4), index=dates, columns=tickers)
+
+def make_featured_frame(n_days=1000, n_tickers=500, n_features=14, seed=42):
+    """
+    Generate a synthetic long-format feature frame shaped like `featured_df` in `main.ipynb`.
+
+    Parameters:
+    - n_days: Number of trading days
+    - n_tickers: Number of tickers
+    - n_features: Number of float feature columns
+    - seed: Random seed for reproducibility
+
+    Returns:
+    - DataFrame with `Date`, `Ticker`, float feature columns and an `Action` column
+    """
+    rng = np.random.default_rng(seed)
+    prices = make_sp500_prices(n_days, n_tickers, seed=seed)
+    n_rows = prices.size
+
+    data = {
+        "Date": np.repeat(prices.index.values, n_tickers),
+        "Ticker": np.tile(prices.columns.values, n_days),
+        "Adjusted Close": prices.to_numpy().ravel(),
+        "Today to Tomorrow": rng.choice([-1.0, 0.0, 1.0], size=n_rows),
+    }
+    for i in range(n_features - 2):
+        data[f"Feature_{i}"] = (data["Adjusted Close"] * rng.normal(1, 0.05, size=n_rows)).round(6)
+    data["Action"] = rng.choice(["buy", "hold", "sell", "short"], size=n_rows)
+
+    return pd.DataFrame(data)
+
+# ================================================
+# Timing
+# ================================================
+def time_function(func, *args, repeat=3, **kwargs):
+    """
+    Time a function call and return the best wall-clock time and the last result.
+
+    Parameters:
+    - func: Function to time
+    - *args, **kwargs: Arguments for the function
+    - repeat: Number of times to run the function
+
+    Returns:
+    - Tuple of (best time in seconds, result of the last call)
+    """
+    best_time = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best_time = min(best_time, time.perf_counter() - start)
+    return best_time, result
+
+if __name__ == "__main__":
+    print("This script should not be run directly! Import these functions for use in another file.")
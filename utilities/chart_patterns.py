@@ -0,0 +1,341 @@
+import numpy as np
+import pandas as pd
+from scipy.signal import find_peaks
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+
+# Import in-house utilities
+if current_dir in sys.path:
+    # If current directory is in sys.path, use relative import
+    from print_utils import print_title, print_label
+else:
+    # Otherwise, use absolute import
+    from utilities.print_utils import print_title, print_label
+
+# Maximum neckline slope: |left shoulder - right shoulder| must be below this fraction of the head
+NECKLINE_TOLERANCE = 0.1
+
+# Patterns supported by `scan_patterns`
+# - peaks:              `find_peaks` on the highs (high_peak) and on the negated lows (low_trough)
+# - support_resistance: Latest rolling minimum of the lows (support) and maximum of the highs (resistance)
+# - head_and_shoulders: Head-and-shoulders patterns on the closes
+SCAN_PATTERNS = ["peaks", "support_resistance", "head_and_shoulders"]
+
+# Values of the `Pattern` column of the `scan_patterns` table
+SCAN_PATTERN_NAMES = ["high_peak", "low_trough", "support", "resistance", "head_and_shoulders"]
+
+# Columns of the `scan_patterns` table
+SCAN_COLUMNS = ["Ticker", "Pattern", "Start Date", "Pivot Date", "End Date", "Level"]
+
+# ================================================
+# Local Extrema
+# ================================================
+def local_extrema(prices):
+    """
+    Positions of the strict local maxima and minima of a price series.
+
+    A local maximum is higher than both neighbors and a local minimum is lower than both
+    neighbors (the first and last values and comparisons with NaN never qualify).
+
+    Parameters:
+    - prices: 1D array of prices
+
+    Returns:
+    - Tuple of (positions of the local maxima, positions of the local minima), both sorted
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    middle, previous, following = prices[1:-1], prices[:-2], prices[2:]
+
+    maxima = np.flatnonzero((previous < middle) & (following < middle)) + 1
+    minima = np.flatnonzero((previous > middle) & (following > middle)) + 1
+    return maxima, minima
+
+# ================================================
+# Head and Shoulders
+# ================================================
+def head_and_shoulders_positions(prices, tolerance=NECKLINE_TOLERANCE):
+    """
+    Find head-and-shoulders patterns in a price array, returning positions.
+
+    Every local maximum except the first and the last is a candidate head. Its shoulders are
+    the nearest local minima before and after it, found with `searchsorted` over the sorted
+    minima positions. The pattern criteria are then applied to all candidates at once.
+
+    Parameters:
+    - prices: 1D array of prices
+    - tolerance: Maximum |left shoulder - right shoulder| as a fraction of the head price
+
+    Returns:
+    - Tuple of (left shoulder, head, right shoulder) position arrays and the neckline price array
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    maxima, minima = local_extrema(prices)
+
+    # Candidate heads (skipping the first and last maxima)
+    heads = maxima[1:-1]
+
+    # Nearest minimum before and after each head
+    left_index = np.searchsorted(minima, heads, side="left") - 1
+    right_index = np.searchsorted(minima, heads, side="right")
+    has_shoulders = (left_index >= 0) & (right_index < len(minima))
+
+    heads = heads[has_shoulders]
+    left_shoulders = minima[left_index[has_shoulders]]
+    right_shoulders = minima[right_index[has_shoulders]]
+
+    # Pattern criteria: the head is above both shoulders and the neckline is relatively flat
+    head_price = prices[heads]
+    left_price = prices[left_shoulders]
+    right_price = prices[right_shoulders]
+    is_pattern = (
+        (head_price > left_price)
+        & (head_price > right_price)
+        & (np.abs(left_price - right_price) < tolerance * head_price)
+    )
+
+    neckline = (left_price[is_pattern] + right_price[is_pattern]) / 2
+    return left_shoulders[is_pattern], heads[is_pattern], right_shoulders[is_pattern], neckline
+
+def find_head_and_shoulders(df, price_column='Close', tolerance=NECKLINE_TOLERANCE):
+    """
+    Find head-and-shoulders patterns in a price series (vectorized `find_head_and_shoulders`
+    of `scripts/triangle_patterns.py`, with the same patterns).
+
+    Parameters:
+    - df: DataFrame with a `price_column` column, or a Series of prices (sorted by date)
+    - price_column: Column of the prices (ignored for a Series)
+    - tolerance: Maximum |left shoulder - right shoulder| as a fraction of the head price
+
+    Returns:
+    - Structured array with one record per pattern: `left_shoulder`, `head`, `right_shoulder`
+      (index labels of the pivots) and `neckline` (mean price of the two shoulders)
+    """
+    prices = df if isinstance(df, pd.Series) else df[price_column]
+    left_shoulders, heads, right_shoulders, neckline = head_and_shoulders_positions(prices.to_numpy(), tolerance)
+
+    labels = prices.index.to_numpy()
+    patterns = np.empty(len(heads), dtype=[
+        ("left_shoulder", labels.dtype), ("head", labels.dtype), ("right_shoulder", labels.dtype), ("neckline", np.float64),
+    ])
+    patterns["left_shoulder"] = labels[left_shoulders]
+    patterns["head"] = labels[heads]
+    patterns["right_shoulder"] = labels[right_shoulders]
+    patterns["neckline"] = neckline
+    return patterns
+
+# ================================================
+# Universe Scan
+# ================================================
+def _scan_ticker(high, low, close, patterns, window):
+    """
+    Scan the prices of one ticker.
+
+    Returns:
+    - List of (pattern code, start, pivot, end positions, level arrays) tuples (codes index `SCAN_PATTERN_NAMES`)
+    """
+    results = []
+
+    # Only scan the listed span of the ticker (leading and trailing NaN are skipped)
+    valid = np.flatnonzero(~np.isnan(close))
+    if len(valid) == 0:
+        return results
+    first, last = valid[0], valid[-1] + 1
+    high, low, close = high[first:last], low[first:last], close[first:last]
+
+    if "peaks" in patterns:
+        peaks, _ = find_peaks(high)
+        troughs, _ = find_peaks(-low)
+        results.append((0, peaks, peaks, peaks, high[peaks]))
+        results.append((1, troughs, troughs, troughs, low[troughs]))
+
+    # Levels over the last `window` days (like `rolling(window).min()/max()` on the last day)
+    if "support_resistance" in patterns and len(close) >= window:
+        start = len(close) - window
+        end = np.array([len(close) - 1])
+        if not np.isnan(low[start:]).all():
+            support = np.nanargmin(low[start:]) + start
+            results.append((2, np.array([start]), np.array([support]), end, low[[support]]))
+        if not np.isnan(high[start:]).all():
+            resistance = np.nanargmax(high[start:]) + start
+            results.append((3, np.array([start]), np.array([resistance]), end, high[[resistance]]))
+
+    if "head_and_shoulders" in patterns:
+        left_shoulders, heads, right_shoulders, neckline = head_and_shoulders_positions(close)
+        results.append((4, left_shoulders, heads, right_shoulders, neckline))
+
+    # Positions relative to the full date axis
+    return [(code, start + first, pivot + first, end + first, level) for code, start, pivot, end, level in results]
+
+def _scan_columns(high, low, close, columns, patterns, window):
+    """
+    Scan a range of tickers of (tickers x dates) price matrices.
+
+    Returns:
+    - Dict of column arrays: ticker position, pattern code, start/pivot/end date positions, level
+    """
+    records = {"ticker": [], "pattern": [], "start": [], "pivot": [], "end": [], "level": []}
+    for column in columns:
+        for code, start, pivot, end, level in _scan_ticker(high[column], low[column], close[column], patterns, window):
+            records["ticker"].append(np.full(len(pivot), column, dtype=np.int32))
+            records["pattern"].append(np.full(len(pivot), code, dtype=np.int8))
+            records["start"].append(start)
+            records["pivot"].append(pivot)
+            records["end"].append(end)
+            records["level"].append(level)
+
+    return {key: np.concatenate(values) if values else np.empty(0, dtype=np.int64) for key, values in records.items()}
+
+def _scan_shared_columns(shared_names, shape, columns, patterns, window):
+    """Process pool worker: attach to the shared price matrices and scan a range of tickers."""
+    blocks = [shared_memory.SharedMemory(name=name) for name in shared_names]
+    matrices = [np.ndarray(shape, dtype=np.float64, buffer=block.buf) for block in blocks]
+    records = _scan_columns(*matrices, columns, patterns, window)
+
+    # Release the views before detaching from the shared memory
+    del matrices
+    for block in blocks:
+        block.close()
+    return records
+
+def scan_patterns(wide_high, wide_low, wide_close, patterns=SCAN_PATTERNS, window=20, max_workers=None):
+    """
+    Scan every ticker of the universe for chart patterns, sharding the tickers across a process pool.
+
+    The price matrices are copied once into shared memory (one contiguous row per ticker),
+    and every worker process reads its shard of tickers from there without pickling prices.
+
+    Parameters:
+    - wide_high: Wide DataFrame of high prices (dates x tickers)
+    - wide_low: Wide DataFrame of low prices with the same index and columns
+    - wide_close: Wide DataFrame of close prices with the same index and columns
+    - patterns: Patterns to scan for (see `SCAN_PATTERNS`)
+    - window: Window of the support and resistance levels
+    - max_workers: Number of worker processes. Defaults to the number of CPUs; 1 scans in this process.
+
+    Returns:
+    - DataFrame with one row per pattern (see `SCAN_COLUMNS`). For single-day patterns the
+      three dates are equal; for head-and-shoulders they are the left shoulder, head and right
+      shoulder and the level is the neckline.
+    """
+    unknown_patterns = set(patterns) - set(SCAN_PATTERNS)
+    if unknown_patterns:
+        raise ValueError(f"Unknown patterns {sorted(unknown_patterns)}. Supported patterns: {SCAN_PATTERNS}")
+
+    dates, tickers = wide_close.index, wide_close.columns
+    shape = (len(tickers), len(dates))
+    max_workers = max_workers or os.cpu_count() or 1
+
+    if max_workers == 1:
+        matrices = [np.ascontiguousarray(np.asarray(frame, dtype=np.float64).T) for frame in (wide_high, wide_low, wide_close)]
+        shards = [_scan_columns(*matrices, range(len(tickers)), patterns, window)]
+    else:
+        blocks = [shared_memory.SharedMemory(create=True, size=max(np.prod(shape) * 8, 1)) for _ in range(3)]
+        try:
+            for block, frame in zip(blocks, (wide_high, wide_low, wide_close)):
+                np.ndarray(shape, dtype=np.float64, buffer=block.buf)[:] = np.asarray(frame, dtype=np.float64).T
+
+            # Several shards per worker, so that uneven shards still balance
+            shard_size = max(-(-len(tickers) // (max_workers * 4)), 1)
+            shard_ranges = [range(start, min(start + shard_size, len(tickers))) for start in range(0, len(tickers), shard_size)]
+            shared_names = [block.name for block in blocks]
+
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_scan_shared_columns, shared_names, shape, shard, list(patterns), window)
+                           for shard in shard_ranges]
+                shards = [future.result() for future in futures]
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    if not shards:
+        return pd.DataFrame(columns=SCAN_COLUMNS)
+
+    # Consolidate the shards into one table
+    records = {key: np.concatenate([shard[key] for shard in shards]) for key in shards[0]}
+    return pd.DataFrame({
+        "Ticker": pd.Categorical.from_codes(records["ticker"].astype(np.int32), categories=pd.Index(tickers)),
+        "Pattern": pd.Categorical.from_codes(records["pattern"].astype(np.int8), categories=SCAN_PATTERN_NAMES),
+        "Start Date": dates[records["start"].astype(np.int64)],
+        "Pivot Date": dates[records["pivot"].astype(np.int64)],
+        "End Date": dates[records["end"].astype(np.int64)],
+        "Level": records["level"].astype(np.float64),
+    })
+
+# ================================================
+# Benchmark
+# ================================================
+def find_head_and_shoulders_loop(df, price_column='Close'):
+    """Loop-based `find_head_and_shoulders` of `scripts/triangle_patterns.py` (benchmark reference)."""
+    maxima = df.loc[df[price_column].shift(1) < df[price_column]]
+    maxima = maxima.loc[df[price_column].shift(-1) < df[price_column]]
+
+    minima = df.loc[df[price_column].shift(1) > df[price_column]]
+    minima = minima.loc[df[price_column].shift(-1) > df[price_column]]
+
+    patterns = []
+    for i in range(1, len(maxima) - 1):
+        left_shoulder = minima.loc[minima.index < maxima.index[i]]
+        right_shoulder = minima.loc[minima.index > maxima.index[i]]
+
+        if left_shoulder.empty or right_shoulder.empty:
+            continue
+
+        left_shoulder = left_shoulder.iloc[-1]
+        right_shoulder = right_shoulder.iloc[0]
+        head = maxima.iloc[i]
+
+        if (
+            head[price_column] > left_shoulder[price_column]
+            and head[price_column] > right_shoulder[price_column]
+            and abs(left_shoulder[price_column] - right_shoulder[price_column]) < 0.1 * head[price_column]
+        ):
+            patterns.append({
+                'left_shoulder': left_shoulder.name,
+                'head': head.name,
+                'right_shoulder': right_shoulder.name,
+                'neckline': (left_shoulder[price_column] + right_shoulder[price_column]) / 2
+            })
+
+    return patterns
+
+if __name__ == "__main__":
+    # Benchmark `find_head_and_shoulders` against the loop of `scripts/triangle_patterns.py`, then `scan_patterns`
+    # Usage: python -m utilities.chart_patterns [n_days] [n_tickers]
+    if current_dir in sys.path:
+        from benchmark_utils import make_sp500_prices, time_function
+    else:
+        from utilities.benchmark_utils import make_sp500_prices, time_function
+
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else 4300  # ~17 years of trading days
+    df = make_sp500_prices(n_days, 1).rename(columns={"T000": "Close"})
+
+    loop_time, expected = time_function(find_head_and_shoulders_loop, df, repeat=1)
+    vectorized_time, patterns = time_function(find_head_and_shoulders, df, repeat=10)
+
+    print_title(f"Head and Shoulders: {n_days} days, {len(patterns)} patterns", "bright_blue", "blue", closed_corners=False)
+    print_label("Loop (triangle_patterns.py):", f"{loop_time * 1000:,.1f} ms", "bright_blue", "blue")
+    print_label("Vectorized:", f"{vectorized_time * 1000:,.2f} ms", "bright_blue", "blue")
+    print_label("Speedup:", f"{loop_time / vectorized_time:,.0f}x", "bright_blue", "blue")
+
+    matches = pd.DataFrame(expected, columns=list(patterns.dtype.names)).equals(pd.DataFrame(patterns))
+    print_label("Same patterns:", "yes" if matches else "NO", "bright_green" if matches else "bright_red", "blue")
+    print_label("", "", closed_corners=True)
+
+    # Universe scan: synthetic highs and lows around the closes, not-yet-listed tickers as NaN
+    n_tickers = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    wide_close = make_sp500_prices(n_days, n_tickers).replace(0.0, np.nan)
+    spread = np.random.default_rng(0).uniform(0.0, 0.02, size=wide_close.shape)
+    wide_high, wide_low = wide_close * (1 + spread), wide_close * (1 - spread)
+
+    print_title(f"Universe Scan: {n_days} days x {n_tickers} tickers, {os.cpu_count()} CPUs", "bright_blue", "blue", closed_corners=False)
+    for max_workers in sorted({1, 2, os.cpu_count() or 1}):
+        scan_time, table = time_function(scan_patterns, wide_high, wide_low, wide_close, max_workers=max_workers, repeat=1)
+        print_label(f"{max_workers} worker(s):", f"{scan_time:.2f}s | {len(table):,} rows", "bright_blue", "blue")
+    print_label("", "", closed_corners=True)
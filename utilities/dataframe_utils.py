@@ -1,9 +1,20 @@
 import pandas as pd
 from pathlib import Path
 
-from zipfile import ZipFile, ZIP_DEFLATED # ZIP file operations / Used for saving DataFrames to ZIP files
+from zipfile import ZipFile, ZIP_STORED # ZIP file operations / Used for saving DataFrames to ZIP files
 import io # String IO buffer / Used for in-memory file operations
 import bz2 # BZIP2 compression / Used for compressing the CSV data
+import lzma # LZMA compression / Alternative codec for the CSV data
+import gzip # GZIP (zlib) compression / Alternative codec for the CSV data
+from concurrent.futures import ThreadPoolExecutor # Thread pool / Used for compressing blocks in parallel
+
+# Optional: Parquet support for the columnar storage format
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = ds = pq = None
 
 import os
 import sys
@@ -19,84 +30,473 @@ else:
     # Otherwise, use absolute import
     from utilities.print_utils import print_title, print_label
 
+# Supported storage formats for `save_data` / `load_data`
+# - csv:     Compressed CSV text inside a ZIP file (`.zip`)
+# - parquet: Columnar Parquet file (`.parquet`) / Supports column projection and filter pushdown
+FILE_FORMATS = {"csv": ".zip", "parquet": ".parquet"}
+
+# Compression codecs for the CSV data inside the ZIP file: codec -> (member suffix, compress, decompressing reader)
+# Every codec supports concatenated streams, so independently compressed blocks form one valid file.
+# The ZIP container itself is always stored uncompressed to avoid compressing the data twice.
+CSV_COMPRESSION_CODECS = {
+    "bz2":    (".csv.bz2", lambda block: bz2.compress(block, compresslevel=9), bz2.BZ2File),
+    "lzma":   (".csv.xz",  lambda block: lzma.compress(block, preset=3),       lzma.LZMAFile),
+    "zlib":   (".csv.gz",  lambda block: gzip.compress(block, compresslevel=6), lambda fileobj: gzip.GzipFile(fileobj=fileobj)),
+    "stored": (".csv",     None,                                               None),
+}
+
+# Number of DataFrame rows written to CSV and compressed per block
+CSV_BLOCK_ROWS = 100_000
+
+# Number of rows per Parquet row group / Smaller groups let date and ticker filters skip more data
+PARQUET_ROW_GROUP_SIZE = 250_000
+
+# Columns that only hold -1/0/1 (stored as nullable `Int8` in compact mode)
+DIRECTION_COLUMNS = ["Today to Tomorrow", "Yesterday to Today"]
+
+def _require_pyarrow():
+    """Raise an informative error if the optional `pyarrow` dependency is missing."""
+    if pq is None:
+        raise ImportError("The `parquet` file format requires `pyarrow`. Install it with `pip install pyarrow`.")
+
+def _resolve_file_path(file_path, file_format=None):
+    """
+    Resolve the file path and storage format for `save_data` / `load_data`.
+
+    Parameters:
+    - file_path: Path to the data file
+    - file_format: `csv`, `parquet` or None to infer it from the file suffix
+
+    Returns:
+    - Tuple of (file path with the correct suffix, file format)
+    """
+    file_path = Path(file_path)
+
+    # Infer the format from the suffix (anything that is not `.parquet` is the default ZIP/CSV format)
+    if file_format is None:
+        file_format = "parquet" if file_path.suffix == ".parquet" else "csv"
+
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"Unsupported file format '{file_format}'. Use one of {list(FILE_FORMATS)}.")
+
+    return file_path.with_suffix(FILE_FORMATS[file_format]), file_format
+
+def build_parquet_filters(date_column, ticker_column, start_date, end_date, tickers):
+    """
+    Build the `pyarrow` filters for a date range and ticker selection (see `read_parquet`).
+
+    Parameters:
+    - date_column, ticker_column: Columns of the dates and tickers
+    - start_date, end_date: Date range (inclusive); None for no bound
+    - tickers: Tickers to keep; None for all tickers
+
+    Returns:
+    - List of filters, or None if there is nothing to filter
+    """
+    filters = []
+    if start_date is not None:
+        filters.append((date_column, ">=", pd.Timestamp(start_date)))
+    if end_date is not None:
+        filters.append((date_column, "<=", pd.Timestamp(end_date)))
+    if tickers is not None:
+        filters.append((ticker_column, "in", list(tickers)))
+    return filters or None
+
+def filter_rows(df, date_column, ticker_column, start_date, end_date, tickers):
+    """
+    Filter the rows of a DataFrame by date range (inclusive) and ticker selection.
+
+    Parameters:
+    - df: DataFrame to filter
+    - date_column, ticker_column: Columns of the dates and tickers
+    - start_date, end_date: Date range (inclusive); None for no bound
+    - tickers: Tickers to keep; None for all tickers
+
+    Returns:
+    - Filtered DataFrame (the input DataFrame itself if every row is kept)
+    """
+    mask = pd.Series(True, index=df.index)
+    if start_date is not None or end_date is not None:
+        dates = pd.to_datetime(df[date_column])
+        if start_date is not None:
+            mask &= dates >= pd.Timestamp(start_date)
+        if end_date is not None:
+            mask &= dates <= pd.Timestamp(end_date)
+    if tickers is not None:
+        mask &= df[ticker_column].isin(list(tickers))
+    return df if mask.all() else df.loc[mask].reset_index(drop=True)
+
+def _iter_csv_blocks(df, block_rows):
+    """Yield the DataFrame as UTF-8 encoded CSV blocks of `block_rows` rows (header in the first block only)."""
+    for start in range(0, max(len(df), 1), block_rows):
+        yield df.iloc[start:start + block_rows].to_csv(index=False, header=start == 0).encode('utf-8')
+
+def write_csv_zip(df, file_path, compression="bz2", block_rows=CSV_BLOCK_ROWS, max_workers=None):
+    """
+    Write a DataFrame as a compressed CSV file inside a ZIP file.
+
+    The CSV data is split into blocks that are compressed independently in a thread pool
+    (the compression libraries release the GIL) and written in order as concatenated streams.
+
+    Parameters:
+    - df: DataFrame to save
+    - file_path: Path of the zip file
+    - compression: Codec for the CSV data (`bz2`, `lzma`, `zlib` or `stored`)
+    - block_rows: Number of rows per compressed block
+    - max_workers: Number of compression threads. Defaults to the number of CPUs.
+    """
+    if compression not in CSV_COMPRESSION_CODECS:
+        raise ValueError(f"Unsupported compression '{compression}'. Use one of {list(CSV_COMPRESSION_CODECS)}.")
+
+    suffix, compress, _ = CSV_COMPRESSION_CODECS[compression]
+    max_workers = max_workers or os.cpu_count() or 1
+
+    with ZipFile(file_path, 'w', compression=ZIP_STORED) as zipf, \
+         zipf.open(file_path.stem + suffix, 'w', force_zip64=True) as member:
+
+        blocks = _iter_csv_blocks(df, block_rows)
+
+        # Uncompressed CSV is written straight into the stored ZIP member
+        if compress is None:
+            for block in blocks:
+                member.write(block)
+            return
+
+        # Keep a bounded number of blocks in flight so memory stays proportional to the block size
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = []
+            for block in blocks:
+                pending.append(executor.submit(compress, block))
+                if len(pending) >= 2 * max_workers:
+                    member.write(pending.pop(0).result())
+            for future in pending:
+                member.write(future.result())
+
+def write_parquet(df, file_path, date_column="Date"):
+    """
+    Write a DataFrame as a Parquet file with row-group statistics for filter pushdown (requires `pyarrow`).
+
+    Parameters:
+    - df: DataFrame to write
+    - file_path: Path of the Parquet file
+    - date_column: Name of the column containing the dates (stored as timestamps)
+    """
+    _require_pyarrow()
+
+    # Store dates as timestamps so that date range filters can be pushed down into the reader
+    if date_column in df.columns and not pd.api.types.is_datetime64_any_dtype(df[date_column]):
+        df = df.assign(**{date_column: pd.to_datetime(df[date_column])})
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, file_path, row_group_size=PARQUET_ROW_GROUP_SIZE, compression="zstd")
+
+def _iter_csv_zip(file_path, columns=None, chunksize=None):
+    """
+    Stream a compressed CSV file inside a ZIP file into pandas.
+
+    The compressed member is decompressed incrementally while `pd.read_csv` parses it,
+    so the full decompressed CSV text is never held in memory.
+
+    Parameters:
+    - file_path: Path to the zip file
+    - columns: List of columns to parse. If None, all columns are parsed.
+    - chunksize: Number of rows per chunk. If None, a single DataFrame is yielded.
+
+    Yields:
+    - Tuple of (DataFrame chunk, name of the CSV file inside the zip)
+    """
+    with ZipFile(file_path, 'r') as zipf:
+        # Get the name of the compressed CSV file inside the zip
+        csv_file_name = zipf.namelist()[0]
+
+        # Pick the decompressing reader from the file suffix (files without a known suffix are BZ2)
+        codec = next((codec for codec, (suffix, _, _) in CSV_COMPRESSION_CODECS.items() if csv_file_name.endswith(suffix)), "bz2")
+        open_decompressed = CSV_COMPRESSION_CODECS[codec][2] or (lambda fileobj: fileobj)
+        
+        # Open the compressed file within the ZIP and decompress it as a stream
+        with zipf.open(csv_file_name) as compressed_file, \
+             open_decompressed(compressed_file) as decompressed_file, \
+             io.TextIOWrapper(decompressed_file, encoding='utf-8') as csv_file:
+
+            if chunksize is None:
+                yield pd.read_csv(csv_file, usecols=columns), csv_file_name
+                return
+
+            # Parse the CSV data chunk by chunk (only parsing the requested columns)
+            with pd.read_csv(csv_file, usecols=columns, chunksize=chunksize) as reader:
+                for chunk in reader:
+                    yield chunk, csv_file_name
+
+def read_csv_zip(file_path, columns=None):
+    """
+    Read a compressed CSV file inside a ZIP file (any of `CSV_COMPRESSION_CODECS`).
+
+    Parameters:
+    - file_path: Path to the zip file
+    - columns: List of columns to parse. If None, all columns are parsed.
+
+    Returns:
+    - Tuple of (DataFrame, name of the CSV file inside the zip)
+    """
+    return next(_iter_csv_zip(file_path, columns=columns))
+
+def read_parquet(file_path, columns=None, filters=None):
+    """
+    Read a Parquet file, pushing the column projection and row filters down into the reader.
+
+    Parameters:
+    - file_path: Path of the Parquet file
+    - columns: List of columns to read. If None, all columns are read.
+    - filters: Row filters (see `build_parquet_filters`)
+
+    Returns:
+    - DataFrame with the requested rows and columns
+    """
+    _require_pyarrow()
+    table = pq.read_table(file_path, columns=columns, filters=filters)
+    return table.to_pandas()
+
+def _iter_parquet(file_path, columns=None, filters=None, chunksize=100_000):
+    """Stream a Parquet file in record batches, pushing the column projection and row filters down into the reader."""
+    _require_pyarrow()
+    filter_expression = pq.filters_to_expression(filters) if filters else None
+    dataset = ds.dataset(file_path, format="parquet")
+    for batch in dataset.to_batches(columns=columns, filter=filter_expression, batch_size=chunksize):
+        if batch.num_rows:
+            yield batch.to_pandas()
+
 # Function to save the DataFrames to ZIP files
-def save_data(df, file_path):
+def save_data(df, file_path, file_format=None, compression="bz2", max_workers=None, date_column="Date"):
     """ 
-    Save a DataFrame to a ZIP file with a CSV file inside using BZIP2 compression.
+    Save a DataFrame to a ZIP file with a compressed CSV file inside (BZIP2 by default),
+    or to a columnar Parquet file.
 
     Parameters:
     - df: DataFrame to save
-    - file_path: Path to save the zip file
+    - file_path: Path to save the file (the suffix is set from the file format)
+    - file_format: `csv` (compressed CSV inside a ZIP file), `parquet` (requires `pyarrow`) or None to
+      infer it from the file suffix (`.parquet` files are Parquet, anything else is ZIP/CSV)
+    - compression: Codec for the CSV format: `bz2`, `lzma`, `zlib` or `stored` (uncompressed)
+    - max_workers: Number of threads used to compress the CSV blocks. Defaults to the number of CPUs.
+    - date_column: Name of the column containing the dates (stored as timestamps in Parquet files)
     """
 
-    # Ensure the file path is a Path object and set the suffix to .zip
-    file_path = Path(file_path).with_suffix('.zip')
+    # Ensure the file path is a Path object and set the suffix for the file format
+    file_path, file_format = _resolve_file_path(file_path, file_format)
     
     # Check if the parent directory exists
     if not file_path.parent.exists():
         print_title(f"Error: The directory `{file_path.parent}` does not exist.", "bright_red", "red")
         return
     
-    # Check if the zip file already exists and remove it if it does
+    # Check if the file already exists and remove it if it does
     if file_path.exists():
         print_title(f"File `{file_path.name}` already exists. Overwriting file.", "bright_magenta", "magenta")
         file_path.unlink()
     
-    # Save the DataFrame to a CSV file inside the zip file using BZIP2 compression
-    with ZipFile(file_path, 'w', compression=ZIP_DEFLATED) as zipf:
-        # Create a buffer to hold the CSV data
-        csv_buffer = io.StringIO()
-        
-        # Write the DataFrame to the buffer as CSV
-        df.to_csv(csv_buffer, index=False)
+    # Save the DataFrame in the requested format
+    if file_format == "parquet":
+        write_parquet(df, file_path, date_column=date_column)
+        print_title(f"File saved as `{file_path.name}`", "bright_green", "green")
+    else:
+        write_csv_zip(df, file_path, compression=compression, max_workers=max_workers)
+        print_title(f"File saved and zipped as `{file_path.name}`", "bright_green", "green")
 
-        # Compress the CSV data using BZ2
-        compressed_data = bz2.compress(csv_buffer.getvalue().encode('utf-8'))
-        
-        # Write the compressed CSV data to the zip file
-        zipf.writestr(file_path.stem + '.csv.bz2', compressed_data)
-    
-    # Print a success message
-    print_title(f"File saved and zipped as `{file_path.name}`", "bright_green", "green")
+def _csv_usecols(columns, date_column, ticker_column, filter_dates, filter_tickers):
+    """Columns to parse from a CSV file: the requested columns plus any column needed for filtering."""
+    if columns is None:
+        return None
+    filter_columns = [date_column] * filter_dates + [ticker_column] * filter_tickers
+    return list(dict.fromkeys([*columns, *filter_columns]))
+
+# Function to stream the DataFrames from ZIP files in chunks
+def iter_data(file_path, chunksize=100_000, columns=None, start_date=None, end_date=None, tickers=None,
+              file_format=None, date_column="Date", ticker_column="Ticker"):
+    """
+    Stream a DataFrame saved with `save_data` in chunks.
+
+    The file is decompressed and parsed incrementally, so peak memory is bounded by the
+    chunk size and not by the size of the file.
+
+    Parameters:
+    - file_path: Path to the zip file containing the compressed CSV, or to a `.parquet` file
+    - chunksize: Number of rows per chunk (chunks can be smaller after filtering)
+    - columns: List of columns to load. If None, all columns are loaded.
+    - start_date: Only load rows on or after this date (inclusive)
+    - end_date: Only load rows on or before this date (inclusive)
+    - tickers: Only load rows for these tickers
+    - file_format: `csv`, `parquet` or None to infer it from the file suffix
+    - date_column: Name of the column containing the dates
+    - ticker_column: Name of the column containing the tickers
+
+    Yields:
+    - DataFrame chunks loaded from the file
+    """
+
+    # Ensure the file path is a Path object and set the suffix for the file format
+    file_path, file_format = _resolve_file_path(file_path, file_format)
+
+    # Check if the file exists
+    if not file_path.exists():
+        print_title(f"Error: The file `{file_path}` does not exist.", "bright_red", "red")
+        return
+
+    if file_format == "parquet":
+        filters = build_parquet_filters(date_column, ticker_column, start_date, end_date, tickers)
+        yield from _iter_parquet(file_path, columns=columns, filters=filters, chunksize=chunksize)
+        return
+
+    filter_dates = start_date is not None or end_date is not None
+    filter_tickers = tickers is not None
+    usecols = _csv_usecols(columns, date_column, ticker_column, filter_dates, filter_tickers)
+
+    for chunk, _ in _iter_csv_zip(file_path, columns=usecols, chunksize=chunksize):
+        if filter_dates or filter_tickers:
+            chunk = filter_rows(chunk, date_column, ticker_column, start_date, end_date, tickers)
+        if columns is not None:
+            chunk = chunk[list(columns)]
+        if len(chunk):
+            yield chunk
 
 # Function to load the DataFrames from ZIP files
-def load_data(zip_file_path):
+def load_data(file_path, columns=None, start_date=None, end_date=None, tickers=None,
+              file_format=None, date_column="Date", ticker_column="Ticker", chunksize=None, compact=False):
     """
-    Load a DataFrame from a CSV file inside a zip file that has been compressed with BZ2.
+    Load a DataFrame from a compressed CSV file inside a zip file (BZ2, LZMA, zlib or stored),
+    or from a Parquet file.
+
+    For Parquet files the column projection and the date/ticker filters are pushed down
+    into the reader, so only the requested slice is read from disk. CSV files are
+    decompressed as a stream while they are parsed.
 
     Parameters:
-    - zip_file_path: Path to the zip file containing the CSV compressed with BZ2
+    - file_path: Path to the zip file containing the compressed CSV, or to a `.parquet` file
+    - columns: List of columns to load. If None, all columns are loaded.
+    - start_date: Only load rows on or after this date (inclusive)
+    - end_date: Only load rows on or before this date (inclusive)
+    - tickers: Only load rows for these tickers
+    - file_format: `csv`, `parquet` or None to infer it from the file suffix
+    - date_column: Name of the column containing the dates
+    - ticker_column: Name of the column containing the tickers
+    - chunksize: If provided, return an iterator of DataFrame chunks (see `iter_data`)
+    - compact: If True, convert the DataFrame (or every chunk) to compact dtypes (see `compact_dtypes`)
 
     Returns:
-    - DataFrame loaded from the CSV file
+    - DataFrame loaded from the file (or an iterator of DataFrame chunks if `chunksize` is provided)
     """
     
-    # Ensure the file path is a Path object and set the suffix to .zip
-    zip_file_path = Path(zip_file_path).with_suffix('.zip')
+    # Stream the file in chunks if requested
+    if chunksize is not None:
+        chunks = iter_data(file_path, chunksize=chunksize, columns=columns, start_date=start_date, end_date=end_date,
+                           tickers=tickers, file_format=file_format, date_column=date_column, ticker_column=ticker_column)
+        return (compact_dtypes(chunk, date_column) for chunk in chunks) if compact else chunks
+
+    # Ensure the file path is a Path object and set the suffix for the file format
+    file_path, file_format = _resolve_file_path(file_path, file_format)
     
-    # Check if the zip file exists
-    if not zip_file_path.exists():
-        print_title(f"Error: The file `{zip_file_path}` does not exist.", "bright_red", "red")
+    # Check if the file exists
+    if not file_path.exists():
+        print_title(f"Error: The file `{file_path}` does not exist.", "bright_red", "red")
         return None
-    
-    # Open the zip file and read the BZ2-compressed CSV file inside it
-    with ZipFile(zip_file_path, 'r') as zipf:
-        # Get the name of the compressed CSV file inside the zip
-        csv_file_name = zipf.namelist()[0]
-        
-        # Open the BZ2-compressed file within the ZIP
-        with zipf.open(csv_file_name) as compressed_file:
-            # Decompress the BZ2 file
-            decompressed_data = bz2.decompress(compressed_file.read()).decode('utf-8')
-            
-            # Load the decompressed CSV data into a DataFrame
-            df = pd.read_csv(io.StringIO(decompressed_data))
+
+    if file_format == "parquet":
+        filters = build_parquet_filters(date_column, ticker_column, start_date, end_date, tickers)
+        df = read_parquet(file_path, columns=columns, filters=filters)
+        if compact:
+            df = compact_dtypes(df, date_column)
+
+        # Print a success message
+        print_title(f"File `{file_path.name}` loaded", "bright_cyan", "cyan")
+        return df
+
+    filter_dates = start_date is not None or end_date is not None
+    filter_tickers = tickers is not None
+    usecols = _csv_usecols(columns, date_column, ticker_column, filter_dates, filter_tickers)
+
+    df, csv_file_name = read_csv_zip(file_path, columns=usecols)
+
+    # The CSV format cannot skip rows, so filter after reading
+    if filter_dates or filter_tickers:
+        df = filter_rows(df, date_column, ticker_column, start_date, end_date, tickers)
+    if columns is not None:
+        df = df[list(columns)]
+    if compact:
+        df = compact_dtypes(df, date_column)
     
     # Print a success message
-    print_title(f"File `{csv_file_name}` loaded from `{zip_file_path.name}`", "bright_cyan", "cyan")
+    print_title(f"File `{csv_file_name}` loaded from `{file_path.name}`", "bright_cyan", "cyan")
     
     return df
 
+# Function to convert the DataFrames to memory-efficient dtypes
+def compact_dtypes(df, date_column="Date", direction_columns=DIRECTION_COLUMNS):
+    """
+    Convert a DataFrame to compact dtypes.
+
+    - Dates: `datetime64`
+    - Direction columns (-1/0/1): nullable `Int8`
+    - Other float columns (prices and indicators): `float32`
+    - String columns (e.g. tickers and actions): `category`
+
+    Parameters:
+    - df: DataFrame to convert (not modified)
+    - date_column: Name of the column containing the dates (if present)
+    - direction_columns: Columns that only hold -1/0/1 (if present)
+
+    Returns:
+    - DataFrame with compact dtypes
+    """
+    dtypes = {}
+    for column, dtype in df.dtypes.items():
+        if column == date_column:
+            continue
+        if column in direction_columns:
+            dtypes[column] = "Int8"
+        elif pd.api.types.is_float_dtype(dtype) and dtype != "float32":
+            dtypes[column] = "float32"
+        elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            dtypes[column] = "category"
+
+    df = df.astype(dtypes)
+    if date_column in df.columns and not pd.api.types.is_datetime64_any_dtype(df[date_column]):
+        df[date_column] = pd.to_datetime(df[date_column])
+    return df
+
+# Function to compare the memory usage of the DataFrames
+def print_memory_report(df, df_name, compact_df=None):
+    """
+    Print the memory usage of a DataFrame per dtype conversion, before and after `compact_dtypes`.
+
+    Parameters:
+    - df: DataFrame to measure
+    - df_name: Name of the DataFrame
+    - compact_df: Compact version of `df`. If None, it is computed with `compact_dtypes`.
+    """
+    BORDER_COLOR = "blue"
+    TEXT_COLOR = "bright_blue"
+    RESULT_COLOR = "bright_green"
+
+    if compact_df is None:
+        compact_df = compact_dtypes(df)
+
+    usage = df.memory_usage(deep=True, index=False)
+    compact_usage = compact_df.memory_usage(deep=True, index=False)
+
+    # Group the columns by dtype conversion (e.g. `float64 -> float32`)
+    conversions = pd.Series([
+        str(df[column].dtype) if df[column].dtype == compact_df[column].dtype else f"{df[column].dtype} -> {compact_df[column].dtype}"
+        for column in df.columns
+    ], index=df.columns)
+
+    print_title(f"`{df_name.capitalize()}` Memory Report", TEXT_COLOR, BORDER_COLOR, closed_corners=False)
+    for conversion, columns in conversions.groupby(conversions, sort=False):
+        before, after = usage[columns.index].sum(), compact_usage[columns.index].sum()
+        print_label(f"{conversion} ({len(columns)}):", f"{before / 1e6:,.1f} -> {after / 1e6:,.1f} MB", TEXT_COLOR, BORDER_COLOR)
+
+    total, compact_total = usage.sum(), compact_usage.sum()
+    print_label("Total:", f"{total / 1e6:,.1f} -> {compact_total / 1e6:,.1f} MB", RESULT_COLOR, BORDER_COLOR)
+    print_label("Reduction:", f"{1 - compact_total / total:.0%}" if total else "n/a", RESULT_COLOR, BORDER_COLOR, closed_corners=True)
+
 def print_dataframe_report(df, df_name):
     """ 
     Print a summary report for the DataFrame.
@@ -136,3 +536,52 @@ def print_dataframe_report(df, df_name):
     unique_values_count = df.nunique().sum()
     print_label("Total Unique Values:", f"{unique_values_count}", TEXT_COLOR, BORDER_COLOR, closed_corners=True)
 
+
+if __name__ == "__main__":
+    # Benchmark the CSV compression codecs on a synthetic S&P 500 feature frame
+    # Usage: python -m utilities.dataframe_utils [n_days] [n_tickers]
+    import tempfile
+    import time
+
+    if current_dir in sys.path:
+        from benchmark_utils import make_featured_frame
+    else:
+        from utilities.benchmark_utils import make_featured_frame
+
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_tickers = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    featured_df = make_featured_frame(n_days, n_tickers)
+
+    print_title(f"Codec Benchmark: {len(featured_df):,} rows, {os.cpu_count()} CPUs", "bright_blue", "blue", closed_corners=False)
+    print_label("Codec (threads):", "save | load | size", "bright_blue", "blue")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for codec in CSV_COMPRESSION_CODECS:
+            for max_workers in sorted({1, os.cpu_count() or 1}):
+                file_path = Path(temp_dir) / f"benchmark_{codec}_{max_workers}.zip"
+
+                start = time.perf_counter()
+                write_csv_zip(featured_df, file_path, compression=codec, max_workers=max_workers)
+                save_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                read_csv_zip(file_path)
+                load_time = time.perf_counter() - start
+
+                size_mb = file_path.stat().st_size / 1024 ** 2
+                print_label(f"{codec} ({max_workers} threads):", f"{save_time:.2f}s | {load_time:.2f}s | {size_mb:.1f} MB", "bright_blue", "blue")
+
+        if pq is not None:
+            file_path = Path(temp_dir) / "benchmark.parquet"
+
+            start = time.perf_counter()
+            write_parquet(featured_df, file_path)
+            save_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            read_parquet(file_path)
+            load_time = time.perf_counter() - start
+
+            size_mb = file_path.stat().st_size / 1024 ** 2
+            print_label("parquet (zstd):", f"{save_time:.2f}s | {load_time:.2f}s | {size_mb:.1f} MB", "bright_blue", "blue")
+
+    print_label("", "", closed_corners=True)
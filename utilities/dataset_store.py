@@ -0,0 +1,291 @@
+import json
+import pandas as pd
+from pathlib import Path
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+
+# Import in-house utilities
+if current_dir in sys.path:
+    # If current directory is in sys.path, use relative import
+    from print_utils import print_title, print_label
+    from dataframe_utils import FILE_FORMATS, write_csv_zip, write_parquet, read_csv_zip, read_parquet, filter_rows, build_parquet_filters
+else:
+    # Otherwise, use absolute import
+    from utilities.print_utils import print_title, print_label
+    from utilities.dataframe_utils import FILE_FORMATS, write_csv_zip, write_parquet, read_csv_zip, read_parquet, filter_rows, build_parquet_filters
+
+# Name of the manifest file at the root of a partitioned dataset
+MANIFEST_FILE_NAME = "manifest.json"
+
+# Partition key format for each partitioning scheme
+PARTITION_FORMATS = {"month": "%Y-%m", "year": "%Y"}
+
+# ================================================
+# Manifest
+# ================================================
+def _read_manifest(root):
+    """Read the manifest of a partitioned dataset. Returns None if the dataset does not exist."""
+    manifest_path = Path(root) / MANIFEST_FILE_NAME
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path, "r") as manifest_file:
+        return json.load(manifest_file)
+
+def _write_manifest(root, manifest):
+    """Write the manifest atomically so that a failed write never leaves a corrupt dataset."""
+    manifest_path = Path(root) / MANIFEST_FILE_NAME
+    temp_path = manifest_path.with_suffix(".json.tmp")
+    with open(temp_path, "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    os.replace(temp_path, manifest_path)
+
+def _new_manifest(df, partition_by, file_format, compression, date_column, ticker_column):
+    """Create the manifest for a new partitioned dataset."""
+    if partition_by not in PARTITION_FORMATS:
+        raise ValueError(f"Unsupported partitioning '{partition_by}'. Use one of {list(PARTITION_FORMATS)}.")
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"Unsupported file format '{file_format}'. Use one of {list(FILE_FORMATS)}.")
+
+    return {
+        "partition_by": partition_by,
+        "file_format": file_format,
+        "compression": compression,
+        "date_column": date_column,
+        "ticker_column": ticker_column,
+        "columns": list(df.columns),
+        "partitions": {},
+    }
+
+# ================================================
+# Writing
+# ================================================
+def _write_partitions(df, root, manifest):
+    """
+    Write the rows of a DataFrame as new part files in their partitions and update the manifest.
+
+    Only the partitions that receive rows are touched, and existing part files are never rewritten.
+    """
+    date_column = manifest["date_column"]
+    suffix = FILE_FORMATS[manifest["file_format"]]
+
+    dates = pd.to_datetime(df[date_column])
+    partition_keys = dates.dt.strftime(PARTITION_FORMATS[manifest["partition_by"]])
+
+    for partition_key, partition_df in df.groupby(partition_keys.values, sort=True):
+        partition = manifest["partitions"].setdefault(
+            partition_key, {"min_date": None, "max_date": None, "rows": 0, "files": []})
+
+        partition_dir = Path(root) / partition_key
+        partition_dir.mkdir(parents=True, exist_ok=True)
+
+        # Write the rows as a new part file
+        file_name = f"{partition_key}/part-{len(partition['files']):05d}{suffix}"
+        file_path = Path(root) / file_name
+        if manifest["file_format"] == "parquet":
+            write_parquet(partition_df, file_path, date_column=date_column)
+        else:
+            write_csv_zip(partition_df, file_path, compression=manifest["compression"])
+
+        # Update the partition statistics
+        partition_dates = pd.to_datetime(partition_df[date_column])
+        min_date = partition_dates.min().strftime("%Y-%m-%d")
+        max_date = partition_dates.max().strftime("%Y-%m-%d")
+        partition["min_date"] = min(filter(None, [partition["min_date"], min_date]))
+        partition["max_date"] = max(filter(None, [partition["max_date"], max_date]))
+        partition["rows"] += len(partition_df)
+        partition["files"].append(file_name)
+
+    _write_manifest(root, manifest)
+
+def _dataset_max_date(manifest):
+    """Latest date stored in a partitioned dataset (None if it is empty)."""
+    max_dates = [partition["max_date"] for partition in manifest["partitions"].values()]
+    return max(max_dates) if max_dates else None
+
+def save_partitioned(df, root, partition_by="month", file_format="csv", compression="bz2",
+                     date_column="Date", ticker_column="Ticker"):
+    """
+    Save a long-format DataFrame as a date-partitioned dataset with a manifest.
+
+    Each partition (one per month or year) is a directory of part files written with the
+    same storage formats as `save_data`. Any existing dataset at `root` is replaced.
+
+    Parameters:
+    - df: DataFrame to save (must contain the date column)
+    - root: Directory of the partitioned dataset
+    - partition_by: `month` or `year`
+    - file_format: `csv` (compressed CSV inside a ZIP file) or `parquet` (requires `pyarrow`)
+    - compression: Codec for the CSV format: `bz2`, `lzma`, `zlib` or `stored`
+    - date_column: Name of the column containing the dates
+    - ticker_column: Name of the column containing the tickers
+    """
+    root = Path(root)
+
+    # Check if the parent directory exists
+    if not root.parent.exists():
+        print_title(f"Error: The directory `{root.parent}` does not exist.", "bright_red", "red")
+        return
+
+    # Remove the files of an existing dataset before writing the new one
+    manifest = _read_manifest(root)
+    if manifest is not None:
+        print_title(f"Dataset `{root.name}` already exists. Overwriting dataset.", "bright_magenta", "magenta")
+        for partition in manifest["partitions"].values():
+            for file_name in partition["files"]:
+                (root / file_name).unlink(missing_ok=True)
+
+    root.mkdir(exist_ok=True)
+    manifest = _new_manifest(df, partition_by, file_format, compression, date_column, ticker_column)
+    _write_partitions(df, root, manifest)
+
+    # Print a success message
+    print_title(f"Dataset saved as `{root.name}` ({len(manifest['partitions'])} partitions)", "bright_green", "green")
+
+def append_data(df, root, partition_by="month", file_format="csv", compression="bz2",
+                date_column="Date", ticker_column="Ticker"):
+    """
+    Append new rows (e.g. today's trading day) to a date-partitioned dataset.
+
+    Only the new rows are written, as new part files in the partitions they belong to, so
+    persisting one trading day costs one day of I/O. The dataset is append-only: every new
+    row must be dated after the latest date already stored. If the dataset does not exist,
+    it is created with the given partitioning and format.
+
+    Parameters:
+    - df: DataFrame with the new rows (must have the same columns as the dataset)
+    - root: Directory of the partitioned dataset
+    - partition_by: `month` or `year` (only used when creating the dataset)
+    - file_format: `csv` or `parquet` (only used when creating the dataset)
+    - compression: Codec for the CSV format (only used when creating the dataset)
+    - date_column: Name of the column containing the dates (only used when creating the dataset)
+    - ticker_column: Name of the column containing the tickers (only used when creating the dataset)
+
+    Raises:
+    - ValueError: If the columns do not match the dataset or rows are not newer than the stored data
+    """
+    root = Path(root)
+    manifest = _read_manifest(root)
+
+    if manifest is None:
+        save_partitioned(df, root, partition_by, file_format, compression, date_column, ticker_column)
+        return
+
+    if list(df.columns) != manifest["columns"]:
+        raise ValueError(f"Columns {list(df.columns)} do not match the dataset columns {manifest['columns']}")
+
+    if df.empty:
+        return
+
+    # Enforce append-only semantics so partitions never need to be rewritten
+    latest_date = _dataset_max_date(manifest)
+    first_new_date = pd.to_datetime(df[manifest["date_column"]]).min().strftime("%Y-%m-%d")
+    if latest_date is not None and first_new_date <= latest_date:
+        raise ValueError(f"Cannot append rows dated {first_new_date}: the dataset already contains data up to {latest_date}")
+
+    _write_partitions(df, root, manifest)
+
+    # Print a success message
+    print_title(f"Appended {len(df)} rows to `{root.name}`", "bright_green", "green")
+
+# ================================================
+# Reading
+# ================================================
+def load_partitioned(root, columns=None, start_date=None, end_date=None, tickers=None):
+    """
+    Load a date-partitioned dataset, reading only the partitions that intersect the date range.
+
+    Parameters:
+    - root: Directory of the partitioned dataset
+    - columns: List of columns to load. If None, all columns are loaded.
+    - start_date: Only load rows on or after this date (inclusive)
+    - end_date: Only load rows on or before this date (inclusive)
+    - tickers: Only load rows for these tickers
+
+    Returns:
+    - DataFrame with the requested rows and columns
+    """
+    root = Path(root)
+    manifest = _read_manifest(root)
+
+    # Check if the dataset exists
+    if manifest is None:
+        print_title(f"Error: The dataset `{root}` does not exist.", "bright_red", "red")
+        return None
+
+    date_column = manifest["date_column"]
+    ticker_column = manifest["ticker_column"]
+    start = pd.Timestamp(start_date).strftime("%Y-%m-%d") if start_date is not None else None
+    end = pd.Timestamp(end_date).strftime("%Y-%m-%d") if end_date is not None else None
+
+    # Prune partitions using the date range stored in the manifest
+    selected_partitions = [
+        partition for _, partition in sorted(manifest["partitions"].items())
+        if (start is None or partition["max_date"] >= start) and (end is None or partition["min_date"] <= end)
+    ]
+
+    # Also parse the filter columns for the CSV format (they are dropped again after filtering)
+    read_columns = columns
+    if columns is not None and manifest["file_format"] == "csv":
+        read_columns = list(dict.fromkeys([*columns, date_column, ticker_column]))
+
+    frames = []
+    for partition in selected_partitions:
+        # Only filter the rows of partitions that are not entirely inside the date range
+        partition_start = start if start is not None and partition["min_date"] < start else None
+        partition_end = end if end is not None and partition["max_date"] > end else None
+
+        for file_name in partition["files"]:
+            file_path = root / file_name
+            if manifest["file_format"] == "parquet":
+                filters = build_parquet_filters(date_column, ticker_column, partition_start, partition_end, tickers)
+                frame = read_parquet(file_path, columns=read_columns, filters=filters)
+            else:
+                frame, _ = read_csv_zip(file_path, columns=read_columns)
+                if partition_start is not None or partition_end is not None or tickers is not None:
+                    frame = filter_rows(frame, date_column, ticker_column, partition_start, partition_end, tickers)
+            frames.append(frame)
+
+    if frames:
+        df = pd.concat(frames, ignore_index=True)
+    else:
+        df = pd.DataFrame(columns=manifest["columns"])
+
+    if columns is not None:
+        df = df[list(columns)]
+
+    # Print a success message
+    print_title(f"Dataset `{root.name}` loaded ({len(selected_partitions)} of {len(manifest['partitions'])} partitions)", "bright_cyan", "cyan")
+
+    return df
+
+def print_dataset_report(root):
+    """
+    Print a summary report for a partitioned dataset.
+
+    Parameters:
+    - root: Directory of the partitioned dataset
+    """
+    BORDER_COLOR = "blue"
+    TEXT_COLOR = "bright_blue"
+
+    manifest = _read_manifest(root)
+    if manifest is None:
+        print_title(f"Error: The dataset `{root}` does not exist.", "bright_red", "red")
+        return
+
+    partitions = manifest["partitions"]
+    min_dates = [partition["min_date"] for partition in partitions.values()]
+
+    print_title(f"`{Path(root).name}` Dataset Report", TEXT_COLOR, BORDER_COLOR, closed_corners=False)
+    print_label("Partitioning:", f"{manifest['partition_by']} / {manifest['file_format']}", TEXT_COLOR, BORDER_COLOR)
+    print_label("Partitions:", f"{len(partitions)}", TEXT_COLOR, BORDER_COLOR)
+    print_label("Part Files:", f"{sum(len(partition['files']) for partition in partitions.values())}", TEXT_COLOR, BORDER_COLOR)
+    print_label("Date Range:", f"{min(min_dates) if min_dates else None} to {_dataset_max_date(manifest)}", TEXT_COLOR, BORDER_COLOR)
+    print_label("Total Rows:", f"{sum(partition['rows'] for partition in partitions.values())}", TEXT_COLOR, BORDER_COLOR, closed_corners=True)
+
+if __name__ == "__main__":
+    print("This script should not be run directly! Import these functions for use in another file.")
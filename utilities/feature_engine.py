@@ -0,0 +1,340 @@
+import numpy as np
+import pandas as pd
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+
+# Import in-house utilities
+if current_dir in sys.path:
+    # If current directory is in sys.path, use relative import
+    from print_utils import print_title, print_label
+    from sliding_extrema import sliding_extrema
+else:
+    # Otherwise, use absolute import
+    from utilities.print_utils import print_title, print_label
+    from utilities.sliding_extrema import sliding_extrema
+
+# Default feature specification (the features built in `main.ipynb`)
+# Set a window to None (or an empty list) to skip that feature
+DEFAULT_FEATURE_SPEC = {
+    "sma_windows": [50, 100, 200],  # SMA_<window>
+    "bollinger_window": 20,         # Upper Band / Lower Band
+    "bollinger_num_std": 2,
+    "channel_window": 50,           # Support / Resistance
+    "extra_channel_windows": [],    # Support_<window> / Resistance_<window> (e.g. [20, 200])
+    "rsi_window": 14,               # RSI
+    "volatility_window": 21,        # Volatility
+}
+
+# Number of tickers processed together by the multi-pass kernels, so that their temporaries stay in the CPU cache
+COLUMN_BLOCK_SIZE = 16
+
+# ================================================
+# Sliding Window Kernels
+# ================================================
+def _rolling_mean(cumulative_sum, cumulative_invalid_count, window):
+    """
+    Rolling mean from shared cumulative sums (NaN until the window is full or if it contains a NaN or infinite value).
+
+    Parameters:
+    - cumulative_sum: Cumulative sum of the values (see `_cumulative_sums`)
+    - cumulative_invalid_count: Cumulative count of non-finite values (see `_cumulative_sums`)
+    - window: Window length
+
+    Returns:
+    - 2D array of rolling means
+    """
+    n_rows = cumulative_sum.shape[0] - 1
+    result = np.full((n_rows, cumulative_sum.shape[1]), np.nan)
+    if window > n_rows:
+        return result
+
+    window_sum = cumulative_sum[window:] - cumulative_sum[:-window]
+    window_invalid_count = cumulative_invalid_count[window:] - cumulative_invalid_count[:-window]
+    result[window - 1:] = np.where(window_invalid_count == 0, window_sum / window, np.nan)
+    return result
+
+def _by_column_blocks(kernel, values, *column_arrays):
+    """
+    Apply a kernel to blocks of `COLUMN_BLOCK_SIZE` columns and stitch the results together.
+
+    Parameters:
+    - kernel: Function `kernel(values, *column_arrays)` returning a 2D array
+    - values: 2D array of values
+    - column_arrays: Other 2D arrays with the columns of `values`, split the same way
+
+    Returns:
+    - The kernel result over all the columns
+    """
+    results = []
+    for start in range(0, values.shape[1], COLUMN_BLOCK_SIZE):
+        columns = slice(start, start + COLUMN_BLOCK_SIZE)
+        block = np.ascontiguousarray(values[:, columns])
+        results.append(kernel(block, *(np.ascontiguousarray(array[:, columns]) for array in column_arrays)))
+
+    return np.hstack(results) if results else np.empty(values.shape)
+
+def _rolling_std(values, window, cumulative_invalid_count):
+    """Rolling sample standard deviation (ddof=1), computed by blocks of columns (see `_rolling_std_block`)."""
+    return _by_column_blocks(lambda block, counts: _rolling_std_block(block, window, counts), values, cumulative_invalid_count)
+
+def _rolling_std_block(values, window, cumulative_invalid_count):
+    """
+    Rolling sample standard deviation (ddof=1) from block prefix and suffix sums.
+
+    The rows are split into blocks of `window` rows. Every window is the suffix of one block
+    plus the prefix of the next, so its sum and sum of squares come from per-block cumulative
+    sums in a fixed number of passes, whatever the window length. The values of each block are
+    centered on the block's first value, which keeps the sums local (constant windows give an
+    exact 0, like pandas). Windows containing NaN or infinite values are NaN.
+
+    Parameters:
+    - values: 2D array of values
+    - window: Window length
+    - cumulative_invalid_count: Cumulative count of non-finite values (see `_cumulative_sums`)
+
+    Returns:
+    - 2D array of rolling standard deviations
+    """
+    n_rows, n_columns = values.shape
+    result = np.full(values.shape, np.nan)
+    if window > n_rows or window < 2:
+        return result
+
+    # Split the rows into blocks of `window` rows, centered on the first value of each block
+    n_blocks = -(-n_rows // window)
+    blocks = np.zeros((n_blocks * window, n_columns))
+    blocks[:n_rows] = np.where(np.isfinite(values), values, 0.0)
+    blocks = blocks.reshape(n_blocks, window, n_columns)
+    anchors = blocks[:, :1, :].copy()
+    blocks -= anchors
+
+    # Prefix and suffix sums within each block
+    prefix_sum = np.cumsum(blocks, axis=1).reshape(-1, n_columns)
+    suffix_sum = np.cumsum(blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1, n_columns)
+    np.multiply(blocks, blocks, out=blocks)
+    prefix_squares = np.cumsum(blocks, axis=1).reshape(-1, n_columns)
+    suffix_squares = np.cumsum(blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1, n_columns)
+    del blocks
+
+    # Window [start, end]: suffix of the start block + prefix of the next block (empty if aligned)
+    n_windows = n_rows - window + 1
+    start = np.arange(n_windows)
+    end = start + window - 1
+    next_block_rows = np.where(start % window == 0, 0, end % window + 1)[:, None]
+    has_next_block = next_block_rows > 0
+
+    anchor_rows = np.repeat(anchors[:, 0, :], window, axis=0)
+    anchor_shift = anchor_rows[end] - anchor_rows[start]
+    del anchor_rows
+
+    # Re-center the prefix part of the next block on the anchor of the start block
+    next_sum = np.where(has_next_block, prefix_sum[window - 1:n_rows], 0.0)
+    next_squares = np.where(has_next_block, prefix_squares[window - 1:n_rows], 0.0)
+    window_sum = suffix_sum[:n_windows] + next_sum + next_block_rows * anchor_shift
+    window_squares = (suffix_squares[:n_windows] + next_squares
+                      + 2 * anchor_shift * next_sum + next_block_rows * anchor_shift ** 2)
+
+    variance = (window_squares - window_sum ** 2 / window) / (window - 1)
+    std = np.sqrt(np.maximum(variance, 0.0))
+
+    window_invalid_count = cumulative_invalid_count[window:] - cumulative_invalid_count[:-window]
+    result[window - 1:] = np.where(window_invalid_count == 0, std, np.nan)
+    return result
+
+def _cumulative_sums(values):
+    """
+    Cumulative sums shared by the rolling means of `values`.
+
+    Returns:
+    - Tuple of (cumulative sum with non-finite values counted as 0, cumulative count of
+      non-finite values), both with a leading row of zeros
+    """
+    invalid = ~np.isfinite(values)
+    cumulative_sum = np.zeros((values.shape[0] + 1, values.shape[1]))
+    np.cumsum(np.where(invalid, 0.0, values), axis=0, out=cumulative_sum[1:])
+    cumulative_invalid_count = np.zeros((values.shape[0] + 1, values.shape[1]), dtype=np.int32)
+    np.cumsum(invalid, axis=0, out=cumulative_invalid_count[1:])
+    return cumulative_sum, cumulative_invalid_count
+
+def _shift(values, periods):
+    """Shift the rows of a 2D array like `DataFrame.shift` (filling with NaN)."""
+    result = np.full(values.shape, np.nan)
+    if periods > 0:
+        result[periods:] = values[:-periods]
+    else:
+        result[:periods] = values[-periods:]
+    return result
+
+# ================================================
+# Feature Computation
+# ================================================
+def iter_features(wide_prices, spec=None):
+    """
+    Compute the features of `main.ipynb` over the wide price matrix, one feature at a time.
+
+    All tickers are processed together with vectorized NumPy operations. The moving averages
+    share one cumulative sum of the prices, and each feature is yielded as soon as it is
+    computed, so at most one feature temporary needs to be alive at a time.
+
+    Parameters:
+    - wide_prices: Wide DataFrame (or 2D array) of adjusted close prices (dates x tickers)
+    - spec: Feature specification (see `DEFAULT_FEATURE_SPEC`). Missing keys use the defaults.
+
+    Yields:
+    - Tuples of (feature name, 2D float64 array with the shape of `wide_prices`)
+    """
+    spec = {**DEFAULT_FEATURE_SPEC, **(spec or {})}
+    prices = np.asarray(wide_prices, dtype=np.float64)
+
+    yield "Adjusted Close", prices
+
+    next_day = _shift(prices, -1)
+    previous_day = _shift(prices, 1)
+
+    # Directions
+    yield "Today to Tomorrow", np.sign(next_day - prices)
+    yield "Yesterday to Today", np.sign(prices - previous_day)
+    yield "Next Day Close", next_day
+    del next_day
+
+    yield "Previous Day Close", previous_day
+
+    # Daily returns (shared by `Return` and `Volatility`)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = prices / previous_day - 1
+    del previous_day
+
+    yield "Return", returns
+
+    if spec["volatility_window"]:
+        window = spec["volatility_window"]
+        yield "Volatility", _rolling_std(returns, window, _cumulative_sums(returns)[1])
+    del returns
+
+    # RSI (mean gains and losses over up to `rsi_window` days, from cumulative sums)
+    if spec["rsi_window"]:
+        window = spec["rsi_window"]
+        delta = np.diff(prices, axis=0, prepend=np.nan)
+        with np.errstate(invalid="ignore"):
+            gain_sum = np.cumsum(np.where(delta > 0, delta, 0.0), axis=0)
+            loss_sum = np.cumsum(np.where(delta < 0, -delta, 0.0), axis=0)
+        del delta
+
+        gain_sum[window:] -= gain_sum[:-window].copy()
+        loss_sum[window:] -= loss_sum[:-window].copy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative_strength = gain_sum / loss_sum
+        del gain_sum, loss_sum
+
+        yield "RSI", 100 - (100 / (1 + relative_strength))
+        del relative_strength
+
+    # Shared cumulative sums for the moving averages
+    cumulative_sum, cumulative_invalid_count = _cumulative_sums(prices)
+
+    for window in spec["sma_windows"] or []:
+        yield f"SMA_{window}", _rolling_mean(cumulative_sum, cumulative_invalid_count, window)
+
+    # Bollinger Bands
+    if spec["bollinger_window"]:
+        window = spec["bollinger_window"]
+        sma = _rolling_mean(cumulative_sum, cumulative_invalid_count, window)
+        band_width = spec["bollinger_num_std"] * _rolling_std(prices, window, cumulative_invalid_count)
+        yield "Upper Band", sma + band_width
+        yield "Lower Band", sma - band_width
+        del sma, band_width
+
+    del cumulative_sum, cumulative_invalid_count
+
+    # Support and Resistance channels (sliding extrema, computed once per window length)
+    channel_names = {}
+    if spec["channel_window"]:
+        channel_names.setdefault(spec["channel_window"], []).append(("Support", "Resistance"))
+    for window in spec["extra_channel_windows"] or []:
+        channel_names.setdefault(window, []).append((f"Support_{window}", f"Resistance_{window}"))
+
+    for window, names in channel_names.items():
+        channels = sliding_extrema(prices, window)
+        for support_name, resistance_name in names:
+            yield support_name, channels[("min", window)]
+            yield resistance_name, channels[("max", window)]
+        del channels
+
+def compute_features(wide_prices, spec=None):
+    """
+    Compute all the features of `main.ipynb` over the wide price matrix in one vectorized pass.
+
+    Parameters:
+    - wide_prices: Wide DataFrame of adjusted close prices (dates x tickers)
+    - spec: Feature specification (see `DEFAULT_FEATURE_SPEC`). Missing keys use the defaults.
+
+    Returns:
+    - Dict of feature name -> wide DataFrame with the index and columns of `wide_prices`
+    """
+    return {
+        name: pd.DataFrame(values, index=wide_prices.index, columns=wide_prices.columns, copy=False)
+        for name, values in iter_features(wide_prices, spec)
+    }
+
+# ================================================
+# Benchmark
+# ================================================
+def compute_features_pandas(df):
+    """Compute the features with the separate pandas passes used in `main.ipynb` (benchmark reference)."""
+    if current_dir in sys.path:
+        from stock_indicators import calculate_bollinger_bands, calculate_rsi, calculate_daily_volatility
+        from stock_features import generate_directions
+    else:
+        from utilities.stock_indicators import calculate_bollinger_bands, calculate_rsi, calculate_daily_volatility
+        from utilities.stock_features import generate_directions
+
+    upper_band, lower_band = calculate_bollinger_bands(df)
+    today_to_tomorrow, yesterday_to_today = generate_directions(df)
+
+    return {
+        "Adjusted Close":     df,
+        "Today to Tomorrow":  today_to_tomorrow,
+        "Yesterday to Today": yesterday_to_today,
+        "Next Day Close":     df.shift(-1),
+        "Previous Day Close": df.shift(1),
+        "Return":             df.pct_change(fill_method=None),
+        "Volatility":         df.apply(calculate_daily_volatility),
+        "RSI":                df.apply(calculate_rsi),
+        "SMA_50":             df.rolling(window=50).mean(),
+        "SMA_100":            df.rolling(window=100).mean(),
+        "SMA_200":            df.rolling(window=200).mean(),
+        "Upper Band":         upper_band,
+        "Lower Band":         lower_band,
+        "Support":            df.rolling(window=50).min(),
+        "Resistance":         df.rolling(window=50).max(),
+    }
+
+if __name__ == "__main__":
+    # Benchmark `compute_features` against the pandas feature block of `main.ipynb`
+    # Usage: python -m utilities.feature_engine [n_days] [n_tickers]
+    if current_dir in sys.path:
+        from benchmark_utils import make_sp500_prices, time_function
+    else:
+        from utilities.benchmark_utils import make_sp500_prices, time_function
+
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else 4500
+    n_tickers = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    prices = make_sp500_prices(n_days, n_tickers)
+
+    pandas_time, pandas_features = time_function(compute_features_pandas, prices, repeat=1)
+    numpy_time, numpy_features = time_function(compute_features, prices, repeat=3)
+
+    print_title(f"Feature Benchmark: {n_days} days x {n_tickers} tickers", "bright_blue", "blue", closed_corners=False)
+    print_label("pandas (main.ipynb):", f"{pandas_time:.3f}s", "bright_blue", "blue")
+    print_label("compute_features:", f"{numpy_time:.3f}s", "bright_blue", "blue")
+    print_label("Speedup:", f"{pandas_time / numpy_time:.1f}x", "bright_blue", "blue")
+
+    for name, expected in pandas_features.items():
+        matches = np.allclose(numpy_features[name].to_numpy(), expected.to_numpy(dtype=np.float64), rtol=1e-7, atol=1e-8, equal_nan=True)
+        print_label(f"{name}:", "matches" if matches else "MISMATCH", "bright_green" if matches else "bright_red", "blue")
+
+    print_label("", "", closed_corners=True)
@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+
+# Import in-house utilities
+if current_dir in sys.path:
+    # If current directory is in sys.path, use relative import
+    from print_utils import print_title, print_label
+    from feature_engine import iter_features
+    from stock_trading_signals import generate_trading_signals, generate_action_codes, ACTION_CATEGORIES
+    from dataframe_utils import DIRECTION_COLUMNS, print_memory_report
+else:
+    # Otherwise, use absolute import
+    from utilities.print_utils import print_title, print_label
+    from utilities.feature_engine import iter_features
+    from utilities.stock_trading_signals import generate_trading_signals, generate_action_codes, ACTION_CATEGORIES
+    from utilities.dataframe_utils import DIRECTION_COLUMNS, print_memory_report
+
+# ================================================
+# Long-Format Columns
+# ================================================
+def _normalize_dates(index):
+    """Convert a date index to timezone-naive midnight dates (like `main.ipynb`)."""
+    dates = pd.DatetimeIndex(index)
+    if dates.tz is not None:
+        dates = dates.tz_convert("UTC").tz_localize(None)
+    return dates.normalize()
+
+def _long_column(wide_values, n_rows, dtype=np.float64):
+    """Copy a wide 2D array into a new long-format (row-major, date by date) column buffer."""
+    buffer = np.empty(n_rows, dtype=dtype)
+    buffer.reshape(wide_values.shape)[:] = wide_values
+    return buffer
+
+def _long_direction_column(wide_values, n_rows):
+    """Copy a wide 2D array of -1/0/1 (NaN at the edges) into a nullable `Int8` long-format column."""
+    mask = _long_column(np.isnan(wide_values), n_rows, dtype=bool)
+    data = _long_column(np.nan_to_num(wide_values), n_rows, dtype=np.int8)
+    return pd.arrays.IntegerArray(data, mask)
+
+# ================================================
+# Featured Frame
+# ================================================
+def build_featured_frame(wide_prices, features=None, include_action=True, compact=False, fill_neutral_runs=False):
+    """
+    Build the long-format `featured_df` of `main.ipynb` from the wide price matrix.
+
+    Each feature is copied straight into its own preallocated long-format column as it is
+    produced, so only one wide feature temporary is alive at a time and no flattened copies
+    are made. The columns, their order, the `Return` cleanup (infinite values as NaN) and the
+    timezone-naive `Date` column match `main.ipynb`. `Ticker` and `Action` are categorical.
+
+    `Action` comes from the integer-coded `generate_action_codes` over the whole matrix. By
+    default it matches `main.ipynb`, where neutral runs longer than one day are left as NA;
+    with `fill_neutral_runs=True` they get the action of the last non-neutral day instead
+    (this changes the labels the models are trained on).
+
+    With `compact=True` the features are written as float32 and the direction columns as
+    nullable `Int8` (the dtypes of `dataframe_utils.compact_dtypes`), without float64 copies.
+
+    Parameters:
+    - wide_prices: Wide DataFrame of adjusted close prices (dates x tickers)
+    - features: Iterable of (feature name, wide 2D array or DataFrame) pairs, or a dict of
+      feature name -> wide DataFrame. Defaults to `feature_engine.iter_features(wide_prices)`.
+    - include_action: If True, add the `Action` column from `generate_trading_signals`
+    - compact: If True, use compact dtypes (float32 features, `Int8` directions)
+    - fill_neutral_runs: If True, fill the `Action` of neutral runs longer than one day
+      (see `generate_action_codes`)
+
+    Returns:
+    - Long-format DataFrame with one row per (date, ticker)
+    """
+    n_days, n_tickers = wide_prices.shape
+    n_rows = n_days * n_tickers
+
+    if features is None:
+        features = iter_features(wide_prices)
+    elif isinstance(features, dict):
+        features = features.items()
+
+    columns = {
+        "Date": np.repeat(_normalize_dates(wide_prices.index).to_numpy(), n_tickers),
+        "Ticker": pd.Categorical.from_codes(
+            np.tile(np.arange(n_tickers, dtype=np.int32), n_days), categories=pd.Index(wide_prices.columns)
+        ),
+    }
+
+    # Stream the features into their long-format columns
+    for name, values in features:
+        values = np.asarray(values, dtype=np.float64)
+        if compact and name in DIRECTION_COLUMNS:
+            columns[name] = _long_direction_column(values, n_rows)
+        else:
+            columns[name] = _long_column(values, n_rows, dtype=np.float32 if compact else np.float64)
+        del values
+
+    # Replace inf values with NaN
+    if "Return" in columns:
+        columns["Return"][np.isinf(columns["Return"])] = np.nan
+
+    if include_action:
+        action_codes = generate_action_codes(wide_prices, fill_neutral_runs=fill_neutral_runs).to_numpy()
+        columns["Action"] = pd.Categorical.from_codes(action_codes.reshape(n_rows), categories=ACTION_CATEGORIES)
+        del action_codes
+
+    return pd.DataFrame(columns, copy=False)
+
+# ================================================
+# Benchmark
+# ================================================
+def build_featured_frame_pandas(df):
+    """Build `featured_df` with the flatten-based code of `main.ipynb` (benchmark reference)."""
+    if current_dir in sys.path:
+        from feature_engine import compute_features_pandas
+    else:
+        from utilities.feature_engine import compute_features_pandas
+
+    features = compute_features_pandas(df)
+    featured_df = pd.DataFrame({
+        "Date":   np.repeat(df.index, len(df.columns)),
+        "Ticker": np.tile(df.columns, len(df)),
+        **{name: feature.values.flatten() for name, feature in features.items()},
+        "Action": df.apply(generate_trading_signals).values.flatten(),
+    })
+
+    featured_df['Return'] = featured_df['Return'].replace([np.inf, -np.inf], np.nan)
+    featured_df['Date'] = pd.to_datetime(featured_df['Date'], utc=True).dt.date
+    featured_df['Date'] = pd.to_datetime(featured_df['Date'])
+    featured_df[['Ticker', 'Action']] = featured_df[['Ticker', 'Action']].astype('category')
+    return featured_df
+
+def _measure(func, *args):
+    """Run a function and return (elapsed seconds, peak traced memory in bytes, result)."""
+    import time
+    import tracemalloc
+
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start_time
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+if __name__ == "__main__":
+    # Benchmark `build_featured_frame` against the flatten-based `featured_df` of `main.ipynb`
+    # Usage: python -m utilities.feature_frame [n_days] [n_tickers]
+    if current_dir in sys.path:
+        from benchmark_utils import make_sp500_prices
+    else:
+        from utilities.benchmark_utils import make_sp500_prices
+
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else 4500
+    n_tickers = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    prices = make_sp500_prices(n_days, n_tickers)
+
+    pandas_time, pandas_peak, pandas_df = _measure(build_featured_frame_pandas, prices)
+    builder_time, builder_peak, featured_df = _measure(build_featured_frame, prices)
+    compact_time, compact_peak, compact_df = _measure(lambda prices: build_featured_frame(prices, compact=True), prices)
+    output_size = featured_df.memory_usage(deep=True).sum()
+
+    print_title(f"Featured Frame Benchmark: {n_days} days x {n_tickers} tickers", "bright_blue", "blue", closed_corners=False)
+    print_label("Output size:", f"{output_size / 1e6:,.0f} MB", "bright_blue", "blue")
+    print_label("main.ipynb (time | peak):", f"{pandas_time:.2f}s | {pandas_peak / 1e6:,.0f} MB", "bright_blue", "blue")
+    print_label("builder (time | peak):", f"{builder_time:.2f}s | {builder_peak / 1e6:,.0f} MB", "bright_blue", "blue")
+    print_label("Peak / output size:", f"{pandas_peak / output_size:.1f}x -> {builder_peak / output_size:.1f}x", "bright_blue", "blue")
+    print_label("compact (time | peak):", f"{compact_time:.2f}s | {compact_peak / 1e6:,.0f} MB", "bright_blue", "blue")
+    print_label("Compact output size:", f"{compact_df.memory_usage(deep=True).sum() / 1e6:,.0f} MB", "bright_blue", "blue")
+
+    matches = list(pandas_df.columns) == list(featured_df.columns) and all(
+        pandas_df[name].astype(str).equals(featured_df[name].astype(str)) if name in ("Date", "Ticker", "Action")
+        else np.allclose(pandas_df[name].to_numpy(dtype=np.float64), featured_df[name].to_numpy(), rtol=1e-7, atol=1e-8, equal_nan=True)
+        for name in pandas_df.columns
+    )
+    print_label("Same columns and values:", "yes" if matches else "NO", "bright_green" if matches else "bright_red", "blue")
+
+    # With `fill_neutral_runs=True`, `Action` only differs where main.ipynb leaves a neutral run without an action
+    filled_actions = build_featured_frame(prices, features={}, fill_neutral_runs=True)["Action"]
+    action_differs = pandas_df["Action"].astype(str) != filled_actions.astype(str)
+    action_matches = pandas_df["Action"][action_differs].isna().all()
+    print_label("Action (neutral runs filled):", f"{action_differs.sum():,} rows" if action_matches else "MISMATCH",
+                "bright_green" if action_matches else "bright_red", "blue")
+    print_label("", "", closed_corners=True)
+
+    print_memory_report(featured_df, "featured_df", compact_df)
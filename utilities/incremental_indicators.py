@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+class IncrementalIndicators:
+    """
+    Stateful, incremental versions of `calculate_rsi`, `calculate_bollinger_bands` and
+    `calculate_daily_volatility` for a fixed universe of tickers.
+
+    The state is initialized once from the price history and then updated with one new
+    price per ticker, which only touches the last window of each indicator instead of
+    recomputing the rolling windows over the full history. The values are identical (up
+    to floating point rounding) to the batch functions applied to the full history.
+
+    Parameters:
+    - tickers: List of tickers (the order of the state arrays)
+    - rsi_window: Window of `calculate_rsi`
+    - bollinger_window: Window of `calculate_bollinger_bands`
+    - volatility_window: Window of `calculate_daily_volatility`
+    """
+
+    def __init__(self, tickers, rsi_window=14, bollinger_window=20, volatility_window=21):
+        self.tickers = pd.Index(tickers)
+        self.rsi_window = rsi_window
+        self.bollinger_window = bollinger_window
+        self.volatility_window = volatility_window
+
+        n_tickers = len(self.tickers)
+        self.n_observations = 0                                        # Number of prices seen per ticker
+        self.last_price = np.full(n_tickers, np.nan)                   # Previous price of each ticker
+        self.gains = np.zeros((rsi_window, n_tickers))                 # Ring buffer of the last gains
+        self.losses = np.zeros((rsi_window, n_tickers))                # Ring buffer of the last losses
+        self.prices = np.full((bollinger_window, n_tickers), np.nan)   # Ring buffer of the last prices
+        self.returns = np.full((volatility_window, n_tickers), np.nan) # Ring buffer of the last returns
+
+    # ================================================
+    # Initialization
+    # ================================================
+    @staticmethod
+    def _ring_buffer(values, window, fill_value):
+        """
+        Ring buffer with the last `window` rows of a 2D array (padded with `fill_value` if there
+        are fewer rows), laid out so that observation `i` is stored at row `i % window`.
+        """
+        tail = values[-window:]
+        if len(tail) < window:
+            padding = np.full((window - len(tail), values.shape[1]), fill_value)
+            tail = np.vstack([padding, tail])
+        return np.roll(tail, len(values) % window, axis=0)
+
+    @classmethod
+    def from_history(cls, historical_prices, rsi_window=14, bollinger_window=20, volatility_window=21):
+        """
+        Initialize the state from a wide DataFrame of historical prices (dates x tickers).
+
+        Parameters:
+        - historical_prices: Wide DataFrame of prices with the tickers as the columns
+        - rsi_window, bollinger_window, volatility_window: Indicator windows
+
+        Returns:
+        - IncrementalIndicators initialized with the last row of the history
+        """
+        state = cls(historical_prices.columns, rsi_window, bollinger_window, volatility_window)
+        values = historical_prices.to_numpy(dtype=np.float64)
+        if len(values) == 0:
+            return state
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta = np.diff(values, axis=0, prepend=np.nan)
+            returns = values[1:] / values[:-1] - 1
+        returns = np.vstack([np.full((1, values.shape[1]), np.nan), returns])
+
+        # Gains and losses as in `calculate_rsi` (NaN deltas count as 0)
+        gains = np.where(delta > 0, delta, 0.0)
+        losses = np.where(delta < 0, -delta, 0.0)
+
+        state.n_observations = len(values)
+        state.last_price = values[-1].copy()
+        state.gains = cls._ring_buffer(gains, rsi_window, 0.0)
+        state.losses = cls._ring_buffer(losses, rsi_window, 0.0)
+        state.prices = cls._ring_buffer(values, bollinger_window, np.nan)
+        state.returns = cls._ring_buffer(returns, volatility_window, np.nan)
+        return state
+
+    # ================================================
+    # Update
+    # ================================================
+    def update(self, new_prices):
+        """
+        Add one new price per ticker and return the indicators for that day.
+
+        Parameters:
+        - new_prices: Series of prices indexed by ticker (missing tickers are treated as NaN)
+
+        Returns:
+        - DataFrame indexed by ticker with the `RSI`, `Upper Band`, `Lower Band` and `Volatility` columns
+        """
+        price = pd.Series(new_prices).reindex(self.tickers).to_numpy(dtype=np.float64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta = price - self.last_price
+            daily_return = price / self.last_price - 1
+
+        # Overwrite the oldest entry of each ring buffer
+        self.gains[self.n_observations % self.rsi_window] = np.where(delta > 0, delta, 0.0)
+        self.losses[self.n_observations % self.rsi_window] = np.where(delta < 0, -delta, 0.0)
+        self.prices[self.n_observations % self.bollinger_window] = price
+        self.returns[self.n_observations % self.volatility_window] = daily_return
+
+        self.n_observations += 1
+        self.last_price = price
+
+        return self.current()
+
+    def current(self):
+        """
+        Return the indicators for the latest day in the state.
+
+        Returns:
+        - DataFrame indexed by ticker with the `RSI`, `Upper Band`, `Lower Band` and `Volatility` columns
+        """
+        n_rsi = min(self.n_observations, self.rsi_window)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # RSI: mean gain and loss over the last (up to) `rsi_window` days
+            avg_gain = self.gains.sum(axis=0) / n_rsi
+            avg_loss = self.losses.sum(axis=0) / n_rsi
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+            # Bollinger Bands: NaN until the window is full or if it contains a NaN price
+            sma = self.prices.mean(axis=0)
+            std = self.prices.std(axis=0, ddof=1)
+
+            # Volatility: standard deviation of the last `volatility_window` returns
+            volatility = self.returns.std(axis=0, ddof=1)
+
+        # Rolling statistics over windows containing infinite values are NaN in pandas
+        volatility[~np.isfinite(self.returns).all(axis=0)] = np.nan
+
+        return pd.DataFrame({
+            "RSI": rsi,
+            "Upper Band": sma + 2 * std,
+            "Lower Band": sma - 2 * std,
+            "Volatility": volatility,
+        }, index=self.tickers)
+
+    # ================================================
+    # Persistence
+    # ================================================
+    def save(self, file_path):
+        """
+        Save the state to a `.npz` file.
+
+        Parameters:
+        - file_path: Path of the state file
+        """
+        np.savez(
+            Path(file_path).with_suffix(".npz"),
+            tickers=self.tickers.to_numpy(dtype=str),
+            windows=np.array([self.rsi_window, self.bollinger_window, self.volatility_window]),
+            n_observations=np.array(self.n_observations),
+            last_price=self.last_price,
+            gains=self.gains,
+            losses=self.losses,
+            prices=self.prices,
+            returns=self.returns,
+        )
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Load a state saved with `save`.
+
+        Parameters:
+        - file_path: Path of the state file
+
+        Returns:
+        - IncrementalIndicators with the saved state
+        """
+        with np.load(Path(file_path).with_suffix(".npz"), allow_pickle=False) as data:
+            state = cls(data["tickers"].tolist(), *data["windows"].tolist())
+            state.n_observations = int(data["n_observations"])
+            state.last_price = data["last_price"]
+            state.gains = data["gains"]
+            state.losses = data["losses"]
+            state.prices = data["prices"]
+            state.returns = data["returns"]
+        return state
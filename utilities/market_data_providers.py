@@ -0,0 +1,187 @@
+import time
+import random
+import threading
+from abc import ABC, abstractmethod
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# File layout of a replay data directory
+REPLAY_DAILY_FILE_NAME = "daily_adj_close.csv"  # Wide adjusted close prices: `Date` column + one column per ticker
+REPLAY_MINUTE_DIR_NAME = "minute"               # One `<TICKER>.csv` file of 1-minute bars per ticker
+
+# Columns of the 1-minute bars returned by `Ticker.history` in yfinance
+MINUTE_BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+
+# Timezone of the exchange (used for the 1-minute bar timestamps)
+MARKET_TIMEZONE = "America/New_York"
+
+# ================================================
+# Provider Interface
+# ================================================
+class MarketDataProvider(ABC):
+    """
+    Interface for the market data sources used by `stock_data_collection`.
+
+    A provider returns daily adjusted close prices for many tickers and the 1-minute
+    bars of the current trading day for one ticker.
+    """
+
+    @abstractmethod
+    def download_adj_close(self, tickers, start_date, end_date):
+        """
+        Download daily adjusted close prices.
+
+        Parameters:
+        - tickers: List of tickers
+        - start_date: Start date (inclusive)
+        - end_date: End date (exclusive)
+
+        Returns:
+        - DataFrame with the dates as the index and the tickers as the columns
+        """
+
+    @abstractmethod
+    def minute_bars(self, ticker_symbol, timeout=10):
+        """
+        Fetch the 1-minute bars of the current trading day for one ticker.
+
+        Parameters:
+        - ticker_symbol: The stock ticker symbol
+        - timeout: Timeout in seconds for the request
+
+        Returns:
+        - DataFrame of 1-minute bars indexed by `Datetime` (timezone-aware)
+        """
+
+# ================================================
+# Yahoo Finance
+# ================================================
+class YFinanceProvider(MarketDataProvider):
+    """Market data from Yahoo Finance through the `yfinance` library."""
+
+    def __init__(self):
+        import yfinance as yf
+        self.yf = yf
+
+    def download_adj_close(self, tickers, start_date, end_date):
+        return self.yf.download(tickers, start=start_date, end=end_date)['Adj Close']
+
+    def minute_bars(self, ticker_symbol, timeout=10):
+        ticker = self.yf.Ticker(ticker_symbol)
+        return ticker.history(period="1d", interval="1m", timeout=timeout, raise_errors=True)
+
+# ================================================
+# Local Replay
+# ================================================
+class ReplayProvider(MarketDataProvider):
+    """
+    Market data replayed from local files, with configurable artificial latency and failures.
+
+    Used to benchmark and load-test the collection code without the network.
+
+    Parameters:
+    - data_dir: Replay data directory (see `record_replay_data` / `write_synthetic_replay_data`)
+    - latency: Mean artificial latency in seconds added to every request
+    - latency_jitter: Maximum random deviation in seconds from the mean latency
+    - failure_rate: Probability (0 to 1) that a request raises a `ConnectionError`
+    - seed: Random seed for reproducible latency and failures
+    """
+
+    def __init__(self, data_dir, latency=0.0, latency_jitter=0.0, failure_rate=0.0, seed=None):
+        self.data_dir = Path(data_dir)
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._daily = None
+
+    def _simulate_request(self, description):
+        """Sleep for the artificial latency and randomly fail the request."""
+        with self._lock:
+            delay = self.latency + self._random.uniform(-self.latency_jitter, self.latency_jitter)
+            failed = self._random.random() < self.failure_rate
+
+        time.sleep(max(delay, 0.0))
+        if failed:
+            raise ConnectionError(f"Simulated failure for {description}")
+
+    def download_adj_close(self, tickers, start_date, end_date):
+        self._simulate_request(f"daily prices of {len(tickers)} tickers")
+
+        if self._daily is None:
+            self._daily = pd.read_csv(self.data_dir / REPLAY_DAILY_FILE_NAME, index_col="Date", parse_dates=["Date"])
+
+        date_mask = (self._daily.index >= pd.Timestamp(start_date)) & (self._daily.index < pd.Timestamp(end_date))
+        return self._daily.loc[date_mask].reindex(columns=list(tickers))
+
+    def minute_bars(self, ticker_symbol, timeout=10):
+        self._simulate_request(ticker_symbol)
+
+        file_path = self.data_dir / REPLAY_MINUTE_DIR_NAME / f"{ticker_symbol}.csv"
+        if not file_path.exists():
+            raise LookupError(f"No replay minute bars for {ticker_symbol}")
+
+        data = pd.read_csv(file_path, index_col="Datetime")
+        data.index = pd.to_datetime(data.index, utc=True).tz_convert(MARKET_TIMEZONE).rename("Datetime")
+        return data
+
+# ================================================
+# Replay Data
+# ================================================
+def record_replay_data(data_dir, provider, tickers, start_date, end_date):
+    """
+    Record daily prices and today's 1-minute bars from a provider into a replay data directory.
+
+    Parameters:
+    - data_dir: Replay data directory to write
+    - provider: Source provider (e.g. `YFinanceProvider()`)
+    - tickers: List of tickers
+    - start_date: Start date of the daily prices (inclusive)
+    - end_date: End date of the daily prices (exclusive)
+    """
+    data_dir = Path(data_dir)
+    (data_dir / REPLAY_MINUTE_DIR_NAME).mkdir(parents=True, exist_ok=True)
+
+    daily = provider.download_adj_close(list(tickers), start_date, end_date)
+    daily.rename_axis("Date").to_csv(data_dir / REPLAY_DAILY_FILE_NAME)
+
+    for ticker in tickers:
+        try:
+            provider.minute_bars(ticker).to_csv(data_dir / REPLAY_MINUTE_DIR_NAME / f"{ticker}.csv")
+        except Exception as e:
+            print(f"Error recording {ticker}: {e}")
+
+def write_synthetic_replay_data(data_dir, prices, trading_date=None):
+    """
+    Write a synthetic replay data directory from a wide price matrix.
+
+    The daily prices are written as they are. The 1-minute bars (09:30 to 15:59) of the
+    trading day are generated around the last price of each ticker.
+
+    Parameters:
+    - data_dir: Replay data directory to write
+    - prices: Wide DataFrame of adjusted close prices (e.g. from `benchmark_utils.make_sp500_prices`)
+    - trading_date: Date of the 1-minute bars. Defaults to the day after the last date of `prices`.
+    """
+    data_dir = Path(data_dir)
+    (data_dir / REPLAY_MINUTE_DIR_NAME).mkdir(parents=True, exist_ok=True)
+
+    prices.rename_axis("Date").to_csv(data_dir / REPLAY_DAILY_FILE_NAME)
+
+    trading_date = pd.Timestamp(trading_date) if trading_date is not None else prices.index.max() + pd.offsets.BDay(1)
+    minutes = pd.date_range(trading_date + pd.Timedelta(hours=9, minutes=30), periods=390, freq="min",
+                            tz=MARKET_TIMEZONE, name="Datetime")
+
+    rng = np.random.default_rng(0)
+    for ticker, last_price in prices.iloc[-1].items():
+        close = last_price * np.exp(np.cumsum(rng.normal(0, 0.0005, size=len(minutes))))
+        bars = pd.DataFrame({
+            "Open": close, "High": close * 1.0005, "Low": close * 0.9995, "Close": close,
+            "Volume": rng.integers(100, 10_000, size=len(minutes)), "Dividends": 0.0, "Stock Splits": 0.0,
+        }, index=minutes)
+        bars.to_csv(data_dir / REPLAY_MINUTE_DIR_NAME / f"{ticker}.csv")
+
+if __name__ == "__main__":
+    print("This script should not be run directly! Import these functions for use in another file.")
@@ -0,0 +1,368 @@
+import json
+import re
+import hashlib
+import joblib
+import pandas as pd
+from pathlib import Path
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+
+# Import in-house utilities
+if current_dir in sys.path:
+    # If current directory is in sys.path, use relative import
+    from print_utils import print_title, print_label
+else:
+    # Otherwise, use absolute import
+    from utilities.print_utils import print_title, print_label
+
+# Root of the saved models
+DEFAULT_MODELS_DIR = Path(parent_dir) / "models"
+
+# Index of the model artifacts, at the root of the models directory
+INDEX_FILE_NAME = "model_index.json"
+
+# File types of the model artifacts (`.joblib` files are written by `save_model` and can be memory-mapped)
+MODEL_SUFFIXES = (".pkl", ".joblib")
+
+# `.joblib` artifacts at least this large are memory-mapped by default (large tree ensembles)
+MMAP_MIN_BYTES = 10 * 1024 * 1024
+
+# Models loaded by this process: {(artifact path, mmap mode): model}
+_LOADED_MODELS = {}
+
+# ================================================
+# Index
+# ================================================
+def _file_sha256(file_path, chunk_size=1 << 20):
+    """Calculate the SHA-256 checksum of a file, reading it in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as artifact_file:
+        for chunk in iter(lambda: artifact_file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _parse_model_name(file_path):
+    """Split an artifact file name like `clf_XGB_v2.pkl` into its model name and version (None if unversioned)."""
+    match = re.fullmatch(r"(.+)_v(\d+)", Path(file_path).stem)
+    return (match.group(1), int(match.group(2))) if match else (Path(file_path).stem, None)
+
+def _feature_names(model):
+    """Return the feature names a model was fitted on (scikit-learn or XGBoost), or None if unknown."""
+    names = getattr(model, "feature_names_in_", None)
+    if names is None and hasattr(model, "get_booster"):
+        names = model.get_booster().feature_names
+    return [str(name) for name in names] if names is not None else None
+
+def _read_metadata(entry, file_path):
+    """
+    Load an artifact once to fill in the type and features of its index entry.
+
+    If it cannot be loaded (e.g. an XGBoost model without xgboost installed), the metadata stays
+    None and is read again the next time the index is built.
+    """
+    try:
+        model = joblib.load(file_path)
+    except Exception as e:
+        print(f"Could not load '{entry['path']}' to read its metadata: {e}")
+        return entry
+
+    entry["type"] = f"{type(model).__module__}.{type(model).__name__}"
+    entry["features"] = _feature_names(model)
+    entry["n_features"] = getattr(model, "n_features_in_", None)
+    if entry["n_features"] is not None:
+        entry["n_features"] = int(entry["n_features"])
+    return entry
+
+def _index_entry(file_path, models_dir):
+    """Create the index entry of an artifact (checksum and metadata)."""
+    name, version = _parse_model_name(file_path)
+    stat = file_path.stat()
+    entry = {
+        "name": name,
+        "version": version,
+        "path": file_path.relative_to(models_dir).as_posix(),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": _file_sha256(file_path),
+        "type": None,
+        "features": None,
+        "n_features": None,
+    }
+    return _read_metadata(entry, file_path)
+
+def _read_index(models_dir):
+    """Read the model index. Returns None if the models directory has not been indexed."""
+    index_path = Path(models_dir) / INDEX_FILE_NAME
+    if not index_path.exists():
+        return None
+    with open(index_path, "r") as index_file:
+        return json.load(index_file)
+
+def _write_index(models_dir, index):
+    """Write the model index atomically."""
+    index_path = Path(models_dir) / INDEX_FILE_NAME
+    temp_path = index_path.with_suffix(".json.tmp")
+    with open(temp_path, "w") as index_file:
+        json.dump(index, index_file, indent=2)
+    os.replace(temp_path, index_path)
+
+def build_model_index(models_dir=DEFAULT_MODELS_DIR, refresh=False):
+    """
+    Index the model artifacts under the models directory (name, version, type, features, checksum).
+
+    Entries of artifacts whose size and modification time have not changed are reused, so only
+    new or modified artifacts are hashed and loaded. Entries without metadata (artifacts that could
+    not be loaded before, e.g. before xgboost was installed) are loaded again to read it. The index
+    is saved as `model_index.json`.
+
+    Parameters:
+    - models_dir: Root of the saved models (searched recursively)
+    - refresh: If True, re-index every artifact
+
+    Returns:
+    - Dict of artifact path (relative to `models_dir`) -> index entry
+    """
+    models_dir = Path(models_dir)
+    index = (None if refresh else _read_index(models_dir)) or {}
+    artifacts = sorted(path for path in models_dir.rglob("*") if path.suffix in MODEL_SUFFIXES and path.is_file())
+
+    new_index = {}
+    for file_path in artifacts:
+        relative_path = file_path.relative_to(models_dir).as_posix()
+        entry = index.get(relative_path)
+        stat = file_path.stat()
+        if entry is None or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+            entry = _index_entry(file_path, models_dir)
+        elif entry["type"] is None:
+            entry = _read_metadata(dict(entry), file_path)
+        new_index[relative_path] = entry
+
+    if new_index != index or not (models_dir / INDEX_FILE_NAME).exists():
+        _write_index(models_dir, new_index)
+    return new_index
+
+def list_models(models_dir=DEFAULT_MODELS_DIR):
+    """
+    List the indexed model artifacts (the index is built or updated first).
+
+    Parameters:
+    - models_dir: Root of the saved models
+
+    Returns:
+    - DataFrame with one row per artifact, sorted by name and version
+    """
+    index = build_model_index(models_dir)
+    models = pd.DataFrame(list(index.values()), columns=["name", "version", "path", "type", "n_features", "size", "sha256", "features"])
+    models[["version", "n_features"]] = models[["version", "n_features"]].astype("Int64")
+    return models.sort_values(["name", "version"], na_position="first", ignore_index=True)
+
+def get_model_info(name, version=None, models_dir=DEFAULT_MODELS_DIR):
+    """
+    Find the index entry of a model.
+
+    Parameters:
+    - name: Model name (the artifact file name without the `_v<version>` suffix, e.g. `clf_XGB`)
+    - version: Model version. Defaults to the latest version.
+    - models_dir: Root of the saved models
+
+    Returns:
+    - Index entry of the model
+    """
+    def matching_entries(index):
+        return [entry for entry in (index or {}).values()
+                if entry["name"] == name and (version is None or entry["version"] == version)]
+
+    entries = matching_entries(_read_index(models_dir))
+    if not entries:
+        # New artifacts may have been added since the index was built
+        entries = matching_entries(build_model_index(models_dir))
+    if not entries:
+        raise ValueError(f"Model '{name}'{f' version {version}' if version is not None else ''} not found in '{models_dir}'")
+
+    return max(entries, key=lambda entry: (entry["version"] or 0, entry["path"].endswith(".joblib")))
+
+# ================================================
+# Loading and Saving
+# ================================================
+def load_model(name, version=None, models_dir=DEFAULT_MODELS_DIR, mmap_mode="auto", verify=False):
+    """
+    Load a model from the registry, once per process.
+
+    Later calls for the same artifact return the already loaded model. Large `.joblib` artifacts
+    (see `save_model`) are memory-mapped read-only, so their arrays are read from the page cache
+    instead of being deserialized into private copies. Pickled `.pkl` artifacts (like the models
+    saved by the notebooks) cannot be memory-mapped; convert them once with `convert_to_joblib`. Objects that copy their arrays when they are
+    unpickled (like scikit-learn trees) still keep one copy per process; to share those, load the
+    model in the parent process before starting forked workers, which then reuse the parent's pages.
+
+    Parameters:
+    - name: Model name (e.g. `clf_XGB`, `logistic_regression`, `X_scaler`)
+    - version: Model version. Defaults to the latest version.
+    - models_dir: Root of the saved models
+    - mmap_mode: joblib `mmap_mode` (`r`, `c`, ...), None to load into memory, or `auto` to memory-map
+      `.joblib` artifacts of at least `MMAP_MIN_BYTES`
+    - verify: If True, check the SHA-256 checksum of the artifact against the index
+
+    Returns:
+    - The loaded model
+    """
+    entry = get_model_info(name, version, models_dir)
+    file_path = Path(models_dir) / entry["path"]
+
+    if mmap_mode == "auto":
+        mmap_mode = "r" if file_path.suffix == ".joblib" and entry["size"] >= MMAP_MIN_BYTES else None
+
+    cache_key = (str(file_path.resolve()), mmap_mode)
+    if cache_key in _LOADED_MODELS:
+        return _LOADED_MODELS[cache_key]
+
+    stat = file_path.stat()
+    if verify or stat.st_size != entry["size"] or stat.st_mtime_ns != entry["mtime_ns"]:
+        if _file_sha256(file_path) != entry["sha256"]:
+            raise ValueError(f"Checksum of '{entry['path']}' does not match the model index. Rebuild it with `build_model_index`.")
+
+    model = joblib.load(file_path, mmap_mode=mmap_mode)
+    _LOADED_MODELS[cache_key] = model
+    return model
+
+def save_model(model, name, version=None, models_dir=DEFAULT_MODELS_DIR, subdirectory=None):
+    """
+    Save a model as a new `.joblib` artifact and add it to the index.
+
+    The artifact is written uncompressed, so its NumPy arrays (e.g. the nodes of the trees of a
+    random forest) can be memory-mapped by `load_model`.
+
+    Parameters:
+    - model: Fitted model
+    - name: Model name
+    - version: Model version. Defaults to the latest version of the model + 1.
+    - models_dir: Root of the saved models
+    - subdirectory: Directory of the artifact inside `models_dir`
+
+    Returns:
+    - Index entry of the saved model
+    """
+    models_dir = Path(models_dir)
+    if version is None:
+        versions = [entry["version"] or 0 for entry in build_model_index(models_dir).values() if entry["name"] == name]
+        version = max(versions, default=0) + 1
+
+    artifact_dir = models_dir / subdirectory if subdirectory else models_dir
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    file_path = artifact_dir / f"{name}_v{version}.joblib"
+
+    temp_path = file_path.with_suffix(".joblib.tmp")
+    joblib.dump(model, temp_path)
+    os.replace(temp_path, file_path)
+
+    index = build_model_index(models_dir)
+    return index[file_path.relative_to(models_dir).as_posix()]
+
+def convert_to_joblib(name, version=None, models_dir=DEFAULT_MODELS_DIR):
+    """
+    Re-save a pickled `.pkl` artifact as a `.joblib` artifact of the same name and version, next to it.
+
+    `load_model` prefers the `.joblib` artifact of a version, so the converted model can be
+    memory-mapped. The `.pkl` artifact is kept.
+
+    Parameters:
+    - name: Model name
+    - version: Model version. Defaults to the latest version.
+    - models_dir: Root of the saved models
+
+    Returns:
+    - Index entry of the `.joblib` artifact
+    """
+    entry = get_model_info(name, version, models_dir)
+    if entry["path"].endswith(".joblib"):
+        return entry
+
+    # Written uncompressed, like `save_model`, so the arrays can be memory-mapped
+    file_path = (Path(models_dir) / entry["path"]).with_suffix(".joblib")
+    temp_path = file_path.with_suffix(".joblib.tmp")
+    joblib.dump(joblib.load(Path(models_dir) / entry["path"]), temp_path)
+    os.replace(temp_path, file_path)
+
+    return build_model_index(models_dir)[file_path.relative_to(models_dir).as_posix()]
+
+def print_model_index(models_dir=DEFAULT_MODELS_DIR):
+    """
+    Print the indexed models.
+
+    Parameters:
+    - models_dir: Root of the saved models
+    """
+    BORDER_COLOR = "blue"
+    TEXT_COLOR = "bright_blue"
+
+    models = list_models(models_dir)
+    print_title("Model Registry", TEXT_COLOR, BORDER_COLOR, closed_corners=False)
+    for _, model in models.iterrows():
+        version = f"v{model['version']}" if pd.notna(model["version"]) else "-"
+        features = f"{model['n_features']} features" if pd.notna(model["n_features"]) else "? features"
+        print_label(f"{model['name']} ({version}):", f"{features} | {model['sha256'][:12]}", TEXT_COLOR, BORDER_COLOR)
+    print_label("", "", closed_corners=True)
+
+if __name__ == "__main__":
+    # Index the saved models, then compare per-process memory of a large forest loaded with and without mmap
+    # Usage: python -m utilities.model_registry [n_trees]
+    import time
+    import tempfile
+    import multiprocessing
+    import numpy as np
+    from concurrent.futures import ProcessPoolExecutor
+
+    print_model_index()
+
+    start_time = time.perf_counter()
+    load_model("logistic_regression")
+    cold_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    load_model("logistic_regression")
+    warm_time = time.perf_counter() - start_time
+
+    def private_memory():
+        """Private (unshared) memory of this process in bytes (Linux), or None."""
+        try:
+            with open("/proc/self/smaps_rollup") as smaps:
+                return sum(int(line.split()[1]) * 1024 for line in smaps if line.startswith(("Private_Clean", "Private_Dirty")))
+        except OSError:
+            return None
+
+    def load_in_worker(models_dir, mmap_mode):
+        before = private_memory()
+        model = load_model("random_forest", models_dir=models_dir, mmap_mode=mmap_mode)  # Cached if preloaded before the fork
+        model.predict(np.zeros((1, model.n_features_in_)))
+        after = private_memory()
+        return None if before is None else after - before
+
+    from sklearn.ensemble import RandomForestClassifier
+
+    n_trees = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((50_000, 10))
+    y = (X[:, 0] + rng.standard_normal(len(X)) > 0).astype(int)
+    forest = RandomForestClassifier(n_estimators=n_trees, n_jobs=-1, random_state=0).fit(X, y)
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        entry = save_model(forest, "random_forest", models_dir=models_dir)
+        del forest
+
+        print_title("Model Loading", "bright_blue", "blue", closed_corners=False)
+        print_label("Registry load (cold):", f"{cold_time * 1000:.1f} ms", "bright_blue", "blue")
+        print_label("Registry load (cached):", f"{warm_time * 1000:.3f} ms", "bright_blue", "blue")
+        print_label("Forest artifact:", f"{n_trees} trees | {entry['size'] / 1e6:,.0f} MB", "bright_blue", "blue")
+        for label, mmap_mode, preload in (("mmap_mode=None", None, False), ("mmap_mode='r'", "r", False), ("preloaded, forked", "r", True)):
+            if preload:
+                load_model("random_forest", models_dir=models_dir, mmap_mode=mmap_mode)
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("fork")) as executor:
+                start_time = time.perf_counter()
+                worker_memory = executor.submit(load_in_worker, models_dir, mmap_mode).result()
+                load_time = time.perf_counter() - start_time
+            memory = f"{worker_memory / 1e6:,.0f} MB private" if worker_memory is not None else "n/a"
+            print_label(f"Worker, {label}:", f"{load_time:.2f}s | {memory}", "bright_blue", "blue")
+        print_label("", "", closed_corners=True)
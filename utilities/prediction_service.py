@@ -0,0 +1,464 @@
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.request import Request, urlopen
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+
+# Import in-house utilities
+if current_dir in sys.path:
+    # If current directory is in sys.path, use relative import
+    from print_utils import print_title, print_label
+    from model_registry import DEFAULT_MODELS_DIR, load_model
+else:
+    # Otherwise, use absolute import
+    from utilities.print_utils import print_title, print_label
+    from utilities.model_registry import DEFAULT_MODELS_DIR, load_model
+
+# Classifiers of `main.ipynb`: prediction column prefix -> (model name, version, scaler name) in the model registry
+PREDICTION_MODELS = {
+    "XGB": ("clf_XGB", 2, "X_scaler"),
+    "RanFC": ("random_forest_classifier", 2, "X_scaler"),
+    "Log_R": ("logistic_regression", 1, "X_scaler_log"),
+}
+
+# Default address of the prediction service (local only)
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Number of recent requests kept for the latency percentiles
+LATENCY_WINDOW = 10_000
+
+# ================================================
+# Models
+# ================================================
+def load_prediction_models(models=PREDICTION_MODELS, models_dir=DEFAULT_MODELS_DIR):
+    """
+    Load the classifiers and their scalers from the model registry.
+
+    Models that cannot be loaded (e.g. a missing artifact or xgboost not installed) are skipped
+    with a message, so the other models can still be served.
+
+    Parameters:
+    - models: Dict of prediction column prefix -> (model name, version, scaler name)
+    - models_dir: Root of the saved models
+
+    Returns:
+    - Dict of prediction column prefix -> dict with the `model`, its `scaler` and the scaler's `features`
+    """
+    loaded_models = {}
+    for prefix, (model_name, version, scaler_name) in models.items():
+        try:
+            model = load_model(model_name, version, models_dir=models_dir)
+            scaler = load_model(scaler_name, models_dir=models_dir)
+        except Exception as e:
+            print(f"Skipping {prefix}: could not load '{model_name}' with '{scaler_name}': {e}")
+            continue
+        loaded_models[prefix] = {"model": model, "scaler": scaler, "features": list(scaler.feature_names_in_)}
+
+    if not loaded_models:
+        raise ValueError(f"None of the prediction models could be loaded from '{models_dir}'")
+    return loaded_models
+
+def _input_dtype(model):
+    """
+    The dtype a model predicts on: float32 for scikit-learn trees and forests and for XGBoost, which
+    cast their input to float32, and float64 for everything else (e.g. `LogisticRegression`).
+    """
+    estimators = getattr(model, "estimators_", None)
+    if hasattr(model, "tree_") or hasattr(model, "get_booster"):
+        return np.float32
+    if isinstance(estimators, list) and estimators and all(hasattr(estimator, "tree_") for estimator in estimators):
+        return np.float32
+    return np.float64
+
+def _scale_into(scaler, matrix, columns, dtype=np.float32):
+    """
+    Scale the given columns of the feature matrix into a new buffer of the given dtype.
+
+    For a `StandardScaler` the arithmetic is done in float64 and rounded once to the dtype, which
+    gives the same values the models get from `scaler.transform`.
+    """
+    if not (hasattr(scaler, "mean_") and hasattr(scaler, "scale_")):
+        return np.asarray(scaler.transform(matrix[:, columns]), dtype=dtype)
+
+    # `mean_` / `scale_` are None without centering / scaling
+    scaled = np.empty((len(matrix), len(columns)), dtype=dtype)
+    for position, column in enumerate(columns):
+        values = matrix[:, column]
+        if scaler.mean_ is not None:
+            values = values - scaler.mean_[position]
+        if scaler.scale_ is not None:
+            values = values / scaler.scale_[position]
+        scaled[:, position] = values
+    return scaled
+
+def predict_all(features, loaded_models, max_workers=None, executor=None):
+    """
+    Predict tomorrow's direction with every classifier in one fused stage.
+
+    The features of all the scalers are copied once into one matrix. Each distinct scaler then
+    scales its own columns (found by feature name) once into a contiguous matrix of the dtype its
+    models predict on: float32 for the tree models (XGB and RanFC share one scaled matrix) and
+    float64 for the logistic regression, so every model sees the same values as with
+    `scaler.transform`. The model predictions are independent and run concurrently in threads (the
+    native tree and linear model code releases the GIL), and are written into one int8 array with
+    0 mapped to -1.
+
+    Parameters:
+    - features: DataFrame with the features of every scaler (extra columns are ignored)
+    - loaded_models: Models returned by `load_prediction_models`
+    - max_workers: Number of prediction threads. Defaults to one per model.
+    - executor: `ThreadPoolExecutor` to run the predictions on (e.g. the one of the prediction
+      service). If None, a pool is created for this call.
+
+    Returns:
+    - int8 array of directions (1 up, -1 down) with one column per model, in the order of `loaded_models`
+    """
+    # One column-major matrix with the union of the features (in order of first use)
+    columns = list(dict.fromkeys(feature for entry in loaded_models.values() for feature in entry["features"]))
+    column_positions = {column: position for position, column in enumerate(columns)}
+    matrix = np.empty((len(features), len(columns)), dtype=np.float64, order="F")
+    for position, column in enumerate(columns):
+        matrix[:, position] = features[column].to_numpy()
+
+    # Scale once per distinct scaler and input dtype
+    scaled_keys = [(id(entry["scaler"]), _input_dtype(entry["model"])) for entry in loaded_models.values()]
+    scaled_matrices = {}
+    for key, entry in zip(scaled_keys, loaded_models.values()):
+        if key not in scaled_matrices:
+            positions = [column_positions[feature] for feature in entry["features"]]
+            scaled_matrices[key] = _scale_into(entry["scaler"], matrix, positions, dtype=key[1])
+    del matrix
+
+    directions = np.empty((len(features), len(loaded_models)), dtype=np.int8)
+
+    def predict_into(model_index, entry):
+        directions[:, model_index] = entry["model"].predict(scaled_matrices[scaled_keys[model_index]])
+
+    def run(pool):
+        futures = [pool.submit(predict_into, model_index, entry) for model_index, entry in enumerate(loaded_models.values())]
+        for future in futures:
+            future.result()
+
+    if executor is not None:
+        run(executor)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers or len(loaded_models)) as pool:
+            run(pool)
+
+    directions[directions == 0] = -1
+    return directions
+
+def predict_directions(features, loaded_models):
+    """
+    Predict tomorrow's direction with every classifier, one model after another like the prediction
+    step of `main.ipynb` (benchmark reference for `predict_all`).
+
+    Parameters:
+    - features: DataFrame with the features of every scaler (extra columns are ignored)
+    - loaded_models: Models returned by `load_prediction_models`
+
+    Returns:
+    - Dict of prediction column prefix -> array of directions (1 up, -1 down)
+    """
+    directions = {}
+    for prefix, entry in loaded_models.items():
+        scaled = entry["scaler"].transform(features[entry["features"]])
+        predictions = np.asarray(entry["model"].predict(scaled)).astype(np.int8)
+        predictions[predictions == 0] = -1
+        directions[prefix] = predictions
+    return directions
+
+# ================================================
+# Metrics
+# ================================================
+class LatencyTracker:
+    """
+    Thread-safe request counters and latency percentiles of the prediction service.
+
+    The latencies of the last `window` requests are kept in a ring buffer for the percentiles;
+    the counters cover the whole lifetime of the service.
+
+    Parameters:
+    - window: Number of recent requests kept for the percentiles
+    """
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.latencies = deque(maxlen=window)  # Seconds per request (most recent requests)
+        self.requests = 0
+        self.rows = 0
+        self.errors = 0
+        self.busy_time = 0.0                   # Total seconds spent handling requests
+        self.start_time = time.time()
+        self.lock = threading.Lock()
+
+    def record(self, latency, n_rows):
+        """Record a successful request."""
+        with self.lock:
+            self.latencies.append(latency)
+            self.requests += 1
+            self.rows += n_rows
+            self.busy_time += latency
+
+    def record_error(self):
+        """Record a failed request."""
+        with self.lock:
+            self.errors += 1
+
+    def summary(self):
+        """
+        Summarize the counters and latencies.
+
+        Returns:
+        - Dict with the request, row and error counts, the p50/p99/max latency (ms) of the recent
+          requests and the throughput (rows per second of handling time and requests per second of uptime)
+        """
+        with self.lock:
+            latencies = np.array(self.latencies) * 1000
+            summary = {
+                "requests": self.requests,
+                "rows": self.rows,
+                "errors": self.errors,
+                "uptime_s": time.time() - self.start_time,
+                "busy_s": self.busy_time,
+            }
+
+        p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (np.nan, np.nan)
+        summary.update({
+            "p50_ms": float(p50),
+            "p99_ms": float(p99),
+            "max_ms": float(latencies.max()) if len(latencies) else float("nan"),
+            "rows_per_s": summary["rows"] / summary["busy_s"] if summary["busy_s"] else 0.0,
+            "requests_per_s": summary["requests"] / summary["uptime_s"] if summary["uptime_s"] else 0.0,
+        })
+        return summary
+
+# ================================================
+# HTTP Service
+# ================================================
+class PredictionRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP endpoints of the prediction service.
+
+    - `POST /predict`: JSON feature batch `{"columns": [...], "data": [[...], ...]}` (like
+      `DataFrame.to_json(orient="split")`); returns `{"predictions": {prefix: [...]}, "rows": n}`
+    - `GET /metrics`: request counters, latency percentiles and throughput
+    - `GET /health`: the served models and their features
+    """
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self._send_json(200, self.server.tracker.summary())
+        elif self.path == "/health":
+            self._send_json(200, {prefix: entry["features"] for prefix, entry in self.server.loaded_models.items()})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint '{self.path}'"})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": f"Unknown endpoint '{self.path}'"})
+            return
+
+        start_time = time.perf_counter()
+        try:
+            batch = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            features = pd.DataFrame(np.asarray(batch["data"], dtype=np.float64), columns=batch["columns"])
+            directions = predict_all(features, self.server.loaded_models, executor=self.server.executor)
+        except (ValueError, KeyError, TypeError) as e:
+            # Malformed batch or missing feature columns
+            self.server.tracker.record_error()
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            # Any other failure (e.g. inside a model's `predict`) still gets a response and is counted
+            self.server.tracker.record_error()
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+
+        predictions = {prefix: directions[:, model_index].tolist() for model_index, prefix in enumerate(self.server.loaded_models)}
+        self._send_json(200, {"predictions": predictions, "rows": len(features)})
+        self.server.tracker.record(time.perf_counter() - start_time, len(features))
+
+    def log_message(self, format, *args):
+        # Keep the service quiet: the counters are exposed on /metrics
+        pass
+
+class PredictionServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server of the prediction service, with the models and one prediction thread pool
+    shared by all the requests.
+
+    Parameters:
+    - server_address: (host, port) to listen on
+    - loaded_models: Models returned by `load_prediction_models`
+    """
+
+    def __init__(self, server_address, loaded_models):
+        super().__init__(server_address, PredictionRequestHandler)
+        self.loaded_models = loaded_models
+        self.tracker = LatencyTracker()
+        self.executor = ThreadPoolExecutor(max_workers=len(loaded_models), thread_name_prefix="predict")
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+def create_prediction_server(host=DEFAULT_HOST, port=DEFAULT_PORT, models=PREDICTION_MODELS, models_dir=DEFAULT_MODELS_DIR):
+    """
+    Create the prediction service with the scalers and classifiers loaded once and kept in memory.
+
+    Parameters:
+    - host: Address to listen on (local only by default)
+    - port: Port to listen on (0 picks a free port)
+    - models: Dict of prediction column prefix -> (model name, version, scaler name)
+    - models_dir: Root of the saved models
+
+    Returns:
+    - `PredictionServer` (call `serve_forever()`, or `shutdown()` from another thread, then `server_close()`)
+    """
+    return PredictionServer((host, port), load_prediction_models(models, models_dir))
+
+def request_predictions(features, url=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout=10):
+    """
+    Send a feature batch to the prediction service.
+
+    Parameters:
+    - features: DataFrame with the features of every model
+    - url: Address of the prediction service
+    - timeout: Request timeout in seconds
+
+    Returns:
+    - DataFrame with one `<prefix> Today to Tomorrow` direction column per model, on the index of `features`
+    """
+    body = json.dumps({"columns": [str(column) for column in features.columns], "data": features.to_numpy(dtype=np.float64).tolist()})
+    request = Request(f"{url}/predict", data=body.encode(), headers={"Content-Type": "application/json"})
+    with urlopen(request, timeout=timeout) as response:
+        predictions = json.loads(response.read())["predictions"]
+    return pd.DataFrame({f"{prefix} Today to Tomorrow": np.asarray(values, dtype=np.int8) for prefix, values in predictions.items()}, index=features.index)
+
+def request_metrics(url=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout=10):
+    """Fetch the counters and latency percentiles of the prediction service."""
+    with urlopen(f"{url}/metrics", timeout=timeout) as response:
+        return json.loads(response.read())
+
+def print_service_metrics(metrics, title="Prediction Service"):
+    """
+    Print the metrics of the prediction service.
+
+    Parameters:
+    - metrics: Metrics returned by `request_metrics`
+    - title: Title of the report
+    """
+    BORDER_COLOR = "blue"
+    TEXT_COLOR = "bright_blue"
+
+    print_title(title, TEXT_COLOR, BORDER_COLOR, closed_corners=False)
+    print_label("Requests | rows | errors:", f"{metrics['requests']:,} | {metrics['rows']:,} | {metrics['errors']:,}", TEXT_COLOR, BORDER_COLOR)
+    print_label("Latency p50 | p99:", f"{metrics['p50_ms']:.2f} ms | {metrics['p99_ms']:.2f} ms", TEXT_COLOR, BORDER_COLOR)
+    print_label("Throughput:", f"{metrics['rows_per_s']:,.0f} rows/s", TEXT_COLOR, BORDER_COLOR)
+    print_label("", "", closed_corners=True)
+
+if __name__ == "__main__":
+    # Serve the classifiers of the model registry, or benchmark the service with stand-in models
+    # Usage: python -m utilities.prediction_service [port]
+    #        python -m utilities.prediction_service benchmark [n_requests]
+    if len(sys.argv) < 2 or sys.argv[1] != "benchmark":
+        port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT
+        server = create_prediction_server(port=port)
+        print(f"Serving {list(server.loaded_models)} on http://{DEFAULT_HOST}:{port} (POST /predict, GET /metrics, GET /health)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
+        sys.exit()
+
+    import shutil
+    import tempfile
+    from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+    from sklearn.linear_model import LogisticRegression
+    if current_dir in sys.path:
+        from model_registry import save_model
+        from benchmark_utils import time_function
+    else:
+        from utilities.model_registry import save_model
+        from utilities.benchmark_utils import time_function
+
+    n_requests = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        # The saved scalers, with stand-in classifiers trained on synthetic features (xgboost may not be installed)
+        for scaler_name in ("X_scaler", "X_scaler_log"):
+            shutil.copy(DEFAULT_MODELS_DIR / "christian's_models" / f"{scaler_name}.pkl", models_dir)
+        scaler = load_model("X_scaler", models_dir=models_dir)
+        features = list(scaler.feature_names_in_)
+        log_features = list(load_model("X_scaler_log", models_dir=models_dir).feature_names_in_)
+
+        rng = np.random.default_rng(0)
+        X = rng.standard_normal((20_000, len(features)))
+        y = np.where(X[:, 1] + rng.standard_normal(len(X)) > 0, 1, -1)
+        log_columns = [features.index(feature) for feature in log_features]
+        save_model(HistGradientBoostingClassifier(max_iter=100).fit(X, y), "clf_XGB", 2, models_dir=models_dir)
+        save_model(RandomForestClassifier(n_estimators=100, random_state=0).fit(X, y), "random_forest_classifier", 2, models_dir=models_dir)
+        save_model(LogisticRegression().fit(X[:, log_columns], (y > 0).astype(int)), "logistic_regression", 1, models_dir=models_dir)
+
+        # Today's cross-section: ~500 rows in the units of the scaler
+        batch = pd.DataFrame(rng.standard_normal((500, len(features))) * scaler.scale_ + scaler.mean_, columns=features)
+
+        start_time = time.perf_counter()
+        server = create_prediction_server(port=0, models_dir=models_dir)
+        startup_time = time.perf_counter() - start_time
+        url = f"http://{DEFAULT_HOST}:{server.server_address[1]}"
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+
+        round_trips = []
+        for _ in range(n_requests):
+            start_time = time.perf_counter()
+            predictions = request_predictions(batch, url)
+            round_trips.append(time.perf_counter() - start_time)
+
+        # Same directions as calling the models directly
+        matches = all(np.array_equal(predictions[f"{prefix} Today to Tomorrow"], values)
+                      for prefix, values in predict_directions(batch, server.loaded_models).items())
+
+        # Fused stage vs the model-by-model path of main.ipynb, on today's batch and on a large batch
+        large_batch = pd.DataFrame(rng.standard_normal((200_000, len(features))) * scaler.scale_ + scaler.mean_, columns=features)
+        stage_times = {}
+        for name, rows in (("500 rows", batch), ("200k rows", large_batch)):
+            sequential_time, expected = time_function(predict_directions, rows, server.loaded_models, repeat=3)
+            fused_time, fused = time_function(predict_all, rows, server.loaded_models, repeat=3)
+            agreement = np.mean(fused == np.column_stack(list(expected.values())))
+            stage_times[name] = (sequential_time, fused_time, agreement)
+
+        metrics = request_metrics(url)
+        server.shutdown()
+        server.server_close()
+
+    print_service_metrics(metrics, f"Prediction Service: {n_requests} x {len(batch)} rows")
+    print_title("Client Round Trip", "bright_blue", "blue", closed_corners=False)
+    print_label("Service startup:", f"{startup_time:.2f}s", "bright_blue", "blue")
+    print_label("Round trip p50 | p99:", f"{np.percentile(round_trips, 50) * 1000:.1f} ms | {np.percentile(round_trips, 99) * 1000:.1f} ms", "bright_blue", "blue")
+    print_label("Same directions:", "yes" if matches else "NO", "bright_green" if matches else "bright_red", "blue", closed_corners=True)
+
+    print_title("predict_all vs model by model", "bright_blue", "blue", closed_corners=False)
+    for name, (sequential_time, fused_time, agreement) in stage_times.items():
+        print_label(f"{name}:", f"{sequential_time * 1000:,.1f} -> {fused_time * 1000:,.1f} ms | {agreement:.4%} same", "bright_blue", "blue")
+    print_label("", "", closed_corners=True)
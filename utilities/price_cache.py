@@ -0,0 +1,228 @@
+import json
+import pandas as pd
+from pathlib import Path
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+
+# Import in-house utilities
+if current_dir in sys.path:
+    # If current directory is in sys.path, use relative import
+    from print_utils import print_title, print_label, print_footer
+else:
+    # Otherwise, use absolute import
+    from utilities.print_utils import print_title, print_label, print_footer
+
+# Default location of the local price cache
+DEFAULT_PRICE_CACHE_DIR = Path(parent_dir) / "data" / "price_cache"
+
+# File names inside the cache directory
+PRICES_FILE_NAME = "adj_close.pkl"    # Wide DataFrame of adjusted close prices (dates x tickers)
+COVERAGE_FILE_NAME = "coverage.json"  # Requested date ranges covered for each ticker: {ticker: [[start, end), ...]}
+
+# ================================================
+# Coverage Intervals
+# ================================================
+def _merge_intervals(intervals):
+    """
+    Sort date intervals and merge the ones that overlap or touch.
+
+    Intervals that do not touch are kept apart, so the dates between them are not
+    counted as cached.
+
+    Parameters:
+    - intervals: List of [start date, end date (exclusive)] (`YYYY-MM-DD` strings)
+
+    Returns:
+    - Sorted list of disjoint [start date, end date (exclusive)] intervals
+    """
+    merged = []
+    for start, end in sorted(tuple(interval) for interval in intervals):
+        if start >= end:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+def _normalize_coverage(coverage):
+    """Convert the coverage of each ticker to a sorted list of intervals (older caches stored one [start, end] pair)."""
+    return {
+        ticker: _merge_intervals([intervals] if intervals and isinstance(intervals[0], str) else intervals)
+        for ticker, intervals in coverage.items()
+    }
+
+# ================================================
+# Cache Files
+# ================================================
+def load_price_cache(cache_dir=DEFAULT_PRICE_CACHE_DIR):
+    """
+    Load the cached prices and the date coverage of each ticker.
+
+    Parameters:
+    - cache_dir: Directory of the price cache
+
+    Returns:
+    - Tuple of (wide DataFrame of cached prices, dict of ticker -> sorted list of [start date, end date (exclusive)])
+    """
+    cache_dir = Path(cache_dir)
+    prices_path = cache_dir / PRICES_FILE_NAME
+    coverage_path = cache_dir / COVERAGE_FILE_NAME
+
+    if not prices_path.exists() or not coverage_path.exists():
+        return pd.DataFrame(), {}
+
+    prices = pd.read_pickle(prices_path)
+    with open(coverage_path, "r") as coverage_file:
+        coverage = _normalize_coverage(json.load(coverage_file))
+
+    return prices, coverage
+
+def save_price_cache(prices, coverage, cache_dir=DEFAULT_PRICE_CACHE_DIR):
+    """
+    Save the cached prices and coverage. Files are replaced atomically.
+
+    Parameters:
+    - prices: Wide DataFrame of cached prices
+    - coverage: Dict of ticker -> sorted list of [start date, end date (exclusive)]
+    - cache_dir: Directory of the price cache
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    prices_path = cache_dir / PRICES_FILE_NAME
+    coverage_path = cache_dir / COVERAGE_FILE_NAME
+
+    prices.to_pickle(prices_path.with_suffix(".tmp"))
+    os.replace(prices_path.with_suffix(".tmp"), prices_path)
+
+    with open(coverage_path.with_suffix(".tmp"), "w") as coverage_file:
+        json.dump(coverage, coverage_file, indent=2, sort_keys=True)
+    os.replace(coverage_path.with_suffix(".tmp"), coverage_path)
+
+# ================================================
+# Gap Detection
+# ================================================
+def find_missing_ranges(coverage, tickers, start_date, end_date):
+    """
+    Work out which (ticker, date range) gaps are missing from the cache.
+
+    Tickers with the same missing range are grouped so that each range is fetched with one
+    request for all of its tickers.
+
+    Parameters:
+    - coverage: Dict of ticker -> sorted list of [start date, end date (exclusive)] already cached
+    - tickers: List of requested tickers
+    - start_date: Requested start date (inclusive, `YYYY-MM-DD`)
+    - end_date: Requested end date (exclusive, `YYYY-MM-DD`)
+
+    Returns:
+    - Dict of (start date, end date) -> list of tickers missing that range
+    """
+    missing_ranges = {}
+    for ticker in tickers:
+        # Subtract every cached interval from the requested range
+        gaps = []
+        gap_start = start_date
+        for cached_start, cached_end in coverage.get(ticker, []):
+            if cached_end <= gap_start:
+                continue
+            if cached_start >= end_date:
+                break
+            if cached_start > gap_start:
+                gaps.append((gap_start, cached_start))
+            gap_start = max(gap_start, cached_end)
+        if gap_start < end_date:
+            gaps.append((gap_start, end_date))
+
+        for gap in gaps:
+            missing_ranges.setdefault(gap, []).append(ticker)
+
+    return missing_ranges
+
+# ================================================
+# Cached Download
+# ================================================
+def print_cache_report(tickers, missing_ranges, fetched_ranges, offline):
+    """
+    Print the report for a cached price request.
+
+    Parameters:
+    - tickers: List of requested tickers
+    - missing_ranges: Dict of (start date, end date) -> tickers missing from the cache
+    - fetched_ranges: Number of missing ranges that were fetched
+    - offline: Whether the request was served in offline mode
+    """
+    BORDER_COLOR = "blue"
+    REQUEST_TEXT_COLOR = "bright_blue"
+    RESPONSE_TEXT_COLOR = "bright_yellow"
+    FOOTER_TEXT_COLOR = "bright_black"
+
+    missing_tickers = {ticker for gap_tickers in missing_ranges.values() for ticker in gap_tickers}
+
+    print_title("Price Cache Report", REQUEST_TEXT_COLOR, BORDER_COLOR, closed_corners=False)
+    print_label("Total Requested Tickers:", str(len(tickers)), REQUEST_TEXT_COLOR, BORDER_COLOR)
+    print_label("Tickers Served From Cache:", str(len(tickers) - len(missing_tickers)), RESPONSE_TEXT_COLOR, BORDER_COLOR)
+    print_label("Tickers With Gaps:", str(len(missing_tickers)), RESPONSE_TEXT_COLOR, BORDER_COLOR)
+    print_label("Gap Ranges Fetched:", f"{fetched_ranges} of {len(missing_ranges)}", RESPONSE_TEXT_COLOR, BORDER_COLOR)
+    print_footer("Offline mode: gaps were not fetched..." if offline and missing_ranges else "Price cache is up to date...", FOOTER_TEXT_COLOR, BORDER_COLOR)
+
+def get_cached_prices(tickers, start_date, end_date, download, cache_dir=DEFAULT_PRICE_CACHE_DIR, offline=False):
+    """
+    Get adjusted close prices from the local cache, fetching only the missing (ticker, date range) gaps.
+
+    Parameters:
+    - tickers: List of tickers
+    - start_date: Start date (inclusive, `YYYY-MM-DD`)
+    - end_date: End date (exclusive, `YYYY-MM-DD`)
+    - download: Function `download(tickers, start_date, end_date)` returning a wide DataFrame of prices
+    - cache_dir: Directory of the price cache
+    - offline: If True, serve only from the cache and never call `download`
+
+    Returns:
+    - Wide DataFrame of prices (dates x tickers) for the requested tickers and date range
+    """
+    tickers = list(tickers)
+    prices, coverage = load_price_cache(cache_dir)
+    missing_ranges = find_missing_ranges(coverage, tickers, start_date, end_date)
+
+    # Fetch the missing gaps and merge them into the cache
+    fetched_ranges = 0
+    if missing_ranges and not offline:
+        for (gap_start, gap_end), gap_tickers in missing_ranges.items():
+            gap_prices = download(gap_tickers, gap_start, gap_end)
+            if isinstance(gap_prices, pd.Series):
+                gap_prices = gap_prices.to_frame(name=gap_tickers[0])
+
+            # Newly fetched prices take precedence over cached values
+            prices = gap_prices.combine_first(prices) if not prices.empty else gap_prices
+            fetched_ranges += 1
+
+            # Only mark what was actually returned: a failed ticker (an all-NaN column) stays missing, and
+            # the coverage ends after the last returned date (e.g. today's bar may not exist yet)
+            for ticker in gap_tickers:
+                if ticker not in gap_prices.columns or not gap_prices[ticker].notna().any():
+                    continue
+                last_date = gap_prices[ticker].last_valid_index()
+                covered_end = min(gap_end, (pd.Timestamp(last_date) + pd.Timedelta(days=1)).strftime("%Y-%m-%d"))
+                coverage[ticker] = _merge_intervals(coverage.get(ticker, []) + [[gap_start, covered_end]])
+
+        prices = prices.sort_index()
+        save_price_cache(prices, coverage, cache_dir)
+
+    print_cache_report(tickers, missing_ranges, fetched_ranges, offline)
+
+    if prices.empty:
+        return pd.DataFrame(columns=tickers)
+
+    # Select the requested tickers and dates (dropping dates on which none of them traded)
+    date_mask = (prices.index >= pd.Timestamp(start_date)) & (prices.index < pd.Timestamp(end_date))
+    data = prices.loc[date_mask].reindex(columns=tickers)
+    return data.dropna(how="all")
+
+if __name__ == "__main__":
+    print("This script should not be run directly! Import these functions for use in another file.")
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+
+# Import in-house utilities
+if current_dir in sys.path:
+    # If current directory is in sys.path, use relative import
+    from print_utils import print_title, print_label
+else:
+    # Otherwise, use absolute import
+    from utilities.print_utils import print_title, print_label
+
+# ================================================
+# van Herk / Gil-Werman Kernel
+# ================================================
+def _sliding_extremum(values, window, extremum):
+    """
+    Sliding minimum or maximum over the rows of a 2D array (van Herk / Gil-Werman).
+
+    The rows are split into blocks of `window` rows. Every window is the suffix of one block
+    plus the prefix of the next, so each result is the extremum of one running suffix and one
+    running prefix: 3 comparisons per value, whatever the window length. The running extrema
+    are built one block offset at a time over all the blocks and tickers at once. NaN values
+    propagate, so windows containing a NaN are NaN (like pandas rolling with `min_periods=window`).
+
+    Parameters:
+    - values: 2D float array (dates x tickers)
+    - window: Window length
+    - extremum: `np.minimum` or `np.maximum`
+
+    Returns:
+    - 2D array of the same shape, NaN for the first `window - 1` rows
+    """
+    n_rows, n_columns = values.shape
+    if window > n_rows or window < 1:
+        return np.full(values.shape, np.nan)
+
+    # Pad the rows to a whole number of blocks (the padding is never read by a complete window)
+    n_blocks = -(-n_rows // window)
+    prefix = np.empty((n_blocks * window, n_columns))
+    prefix[:n_rows] = values
+    prefix[n_rows:] = np.nan
+    suffix = prefix.copy()
+
+    # Running extrema from the start (prefix) and from the end (suffix) of every block
+    prefix_blocks = prefix.reshape(n_blocks, window, n_columns)
+    suffix_blocks = suffix.reshape(n_blocks, window, n_columns)
+    for offset in range(1, window):
+        extremum(prefix_blocks[:, offset - 1], prefix_blocks[:, offset], out=prefix_blocks[:, offset])
+        extremum(suffix_blocks[:, window - offset], suffix_blocks[:, window - offset - 1], out=suffix_blocks[:, window - offset - 1])
+
+    # Window [start, end] = suffix from `start` + prefix up to `end` (written over the prefix)
+    extremum(suffix[:n_rows - window + 1], prefix[window - 1:n_rows], out=prefix[window - 1:n_rows])
+    prefix[:window - 1] = np.nan
+    return prefix[:n_rows]
+
+# ================================================
+# Public API
+# ================================================
+def sliding_extrema(values, windows=(50,), kinds=("min", "max")):
+    """
+    Sliding-window minimum and/or maximum of every column of a wide price matrix, for several windows.
+
+    Runs in O(rows x columns) per window, whatever the window length. Windows that are not full
+    yet, or that contain a NaN (e.g. a ticker that is not listed yet), are NaN.
+
+    Parameters:
+    - values: Wide DataFrame or 2D array (dates x tickers)
+    - windows: Window length or list of window lengths
+    - kinds: `min`, `max` or both
+
+    Returns:
+    - Dict of (kind, window) -> wide DataFrame (or 2D array if `values` is an array)
+    """
+    windows = [windows] if np.isscalar(windows) else list(windows)
+    kinds = [kinds] if isinstance(kinds, str) else list(kinds)
+    matrix = np.asarray(values, dtype=np.float64)
+    if matrix.ndim == 1:
+        matrix = matrix[:, None]
+
+    extrema = {"min": np.minimum, "max": np.maximum}
+    results = {(kind, window): _sliding_extremum(matrix, window, extrema[kind]) for window in windows for kind in kinds}
+
+    if isinstance(values, pd.DataFrame):
+        return {key: pd.DataFrame(result, index=values.index, columns=values.columns, copy=False) for key, result in results.items()}
+    if isinstance(values, pd.Series):
+        return {key: pd.Series(result[:, 0], index=values.index, name=values.name) for key, result in results.items()}
+    if np.ndim(values) == 1:
+        return {key: result[:, 0] for key, result in results.items()}
+    return results
+
+def sliding_min(values, window):
+    """Sliding-window minimum of every column (same as `values.rolling(window).min()`)."""
+    return sliding_extrema(values, window, "min")[("min", window)]
+
+def sliding_max(values, window):
+    """Sliding-window maximum of every column (same as `values.rolling(window).max()`)."""
+    return sliding_extrema(values, window, "max")[("max", window)]
+
+if __name__ == "__main__":
+    # Benchmark `sliding_extrema` against pandas rolling min/max
+    # Usage: python -m utilities.sliding_extrema [n_days] [n_tickers]
+    if current_dir in sys.path:
+        from benchmark_utils import make_sp500_prices, time_function
+    else:
+        from utilities.benchmark_utils import make_sp500_prices, time_function
+
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else 4500
+    n_tickers = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    windows = [20, 50, 200]
+
+    # Tickers that are not listed yet are NaN
+    prices = make_sp500_prices(n_days, n_tickers).replace(0.0, np.nan)
+
+    def pandas_channels(prices):
+        return {(kind, window): getattr(prices.rolling(window=window), kind)() for window in windows for kind in ("min", "max")}
+
+    pandas_time, expected = time_function(pandas_channels, prices, repeat=1)
+    engine_time, channels = time_function(sliding_extrema, prices, windows, repeat=3)
+
+    print_title(f"Sliding Extrema: {n_days} x {n_tickers}, windows {windows}", "bright_blue", "blue", closed_corners=False)
+    print_label("pandas rolling:", f"{pandas_time * 1000:.0f} ms", "bright_blue", "blue")
+    print_label("sliding_extrema:", f"{engine_time * 1000:.0f} ms", "bright_blue", "blue")
+    print_label("Speedup:", f"{pandas_time / engine_time:.1f}x", "bright_blue", "blue")
+
+    matches = all(channels[key].equals(expected[key]) for key in expected)
+    print_label("Same values:", "yes" if matches else "NO", "bright_green" if matches else "bright_red", "blue")
+    print_label("", "", closed_corners=True)
@@ -0,0 +1,162 @@
+import time
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+
+# Import in-house utilities
+if current_dir in sys.path:
+    # If current directory is in sys.path, use relative import
+    from print_utils import print_title
+else:
+    # Otherwise, use absolute import
+    from utilities.print_utils import print_title
+
+# Source of the S&P 500 constituent list
+SP500_WIKIPEDIA_URL = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+
+# Default location of the dated constituent snapshots
+DEFAULT_CONSTITUENTS_DIR = Path(parent_dir) / "data" / "constituents"
+
+# Snapshot file names: `sp500_constituents_YYYY-MM-DD.csv`
+SNAPSHOT_PREFIX = "sp500_constituents_"
+
+# ================================================
+# Snapshots
+# ================================================
+def list_constituent_snapshots(cache_dir=DEFAULT_CONSTITUENTS_DIR):
+    """
+    List the dated constituent snapshots, oldest first.
+
+    Parameters:
+    - cache_dir: Directory of the constituent snapshots
+
+    Returns:
+    - List of (snapshot date `YYYY-MM-DD`, snapshot path) tuples
+    """
+    cache_dir = Path(cache_dir)
+    if not cache_dir.exists():
+        return []
+
+    snapshots = [(path.stem[len(SNAPSHOT_PREFIX):], path) for path in cache_dir.glob(f"{SNAPSHOT_PREFIX}*.csv")]
+    return sorted(snapshots)
+
+def read_constituents_file(file_path):
+    """
+    Read a constituent list from a local file.
+
+    Parameters:
+    - file_path: Path to a `.csv` file with a `Symbol` column, an `.html` page with the
+      Wikipedia table, or a text file with one ticker per line
+
+    Returns:
+    - DataFrame with (at least) a `Symbol` column
+    """
+    file_path = Path(file_path)
+    if file_path.suffix in (".html", ".htm"):
+        return pd.read_html(file_path)[0]
+    if file_path.suffix == ".csv":
+        return pd.read_csv(file_path)
+    return pd.DataFrame({"Symbol": [line.strip() for line in file_path.read_text().splitlines() if line.strip()]})
+
+def download_constituents():
+    """Download the S&P 500 constituent table from Wikipedia."""
+    return pd.read_html(SP500_WIKIPEDIA_URL)[0]
+
+def save_constituent_snapshot(constituents, cache_dir=DEFAULT_CONSTITUENTS_DIR, snapshot_date=None):
+    """
+    Save a dated constituent snapshot (a snapshot for the same date is replaced).
+
+    Parameters:
+    - constituents: DataFrame with a `Symbol` column
+    - cache_dir: Directory of the constituent snapshots
+    - snapshot_date: Date of the snapshot. Defaults to today.
+
+    Returns:
+    - Path of the snapshot file
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    snapshot_date = snapshot_date or datetime.today().strftime("%Y-%m-%d")
+    snapshot_path = cache_dir / f"{SNAPSHOT_PREFIX}{snapshot_date}.csv"
+    constituents.to_csv(snapshot_path, index=False)
+    return snapshot_path
+
+# ================================================
+# Ticker Provider
+# ================================================
+def _to_tickers(constituents, exclude_class_b):
+    """Extract the ticker list from a constituent table."""
+    tickers = constituents["Symbol"].astype(str).tolist()
+
+    # Filter out Class B shares that have a '.B' in the ticker name
+    # Class B shares are typically held by company insiders and have different voting rights than Class A shares
+    if exclude_class_b:
+        tickers = [ticker for ticker in tickers if '.B' not in ticker]
+
+    return tickers
+
+def get_sp500_tickers(cache_dir=DEFAULT_CONSTITUENTS_DIR, ttl_hours=24, as_of=None, source=None, refresh=False, exclude_class_b=True):
+    """
+    Get the S&P 500 tickers from a local dated snapshot, refreshing it from Wikipedia when it is older than the TTL.
+
+    Every refresh is kept as a dated snapshot, so past runs can be reproduced with `as_of`.
+    If Wikipedia cannot be reached, the latest snapshot is used even if it has expired.
+
+    Parameters:
+    - cache_dir: Directory of the constituent snapshots
+    - ttl_hours: Maximum age of the latest snapshot before it is refreshed
+    - as_of: Use the latest snapshot taken on or before this date (never downloads)
+    - source: Path to a local constituent file to use instead of the snapshots (see `read_constituents_file`)
+    - refresh: If True, download a new snapshot regardless of the TTL
+    - exclude_class_b: If True, filter out Class B shares (tickers containing '.B')
+
+    Returns:
+    - List of S&P 500 tickers
+
+    Raises:
+    - FileNotFoundError: If no snapshot exists for `as_of`, or no snapshot exists and Wikipedia cannot be reached
+    """
+    # Injected local file
+    if source is not None:
+        return _to_tickers(read_constituents_file(source), exclude_class_b)
+
+    snapshots = list_constituent_snapshots(cache_dir)
+
+    # Reproducible run: latest snapshot on or before the requested date
+    if as_of is not None:
+        as_of = pd.Timestamp(as_of).strftime("%Y-%m-%d")
+        eligible_snapshots = [path for snapshot_date, path in snapshots if snapshot_date <= as_of]
+        if not eligible_snapshots:
+            raise FileNotFoundError(f"No S&P 500 constituent snapshot found on or before {as_of} in `{cache_dir}`")
+        return _to_tickers(pd.read_csv(eligible_snapshots[-1]), exclude_class_b)
+
+    # Latest snapshot while it is within the TTL
+    if snapshots and not refresh:
+        latest_path = snapshots[-1][1]
+        age_hours = (time.time() - latest_path.stat().st_mtime) / 3600
+        if age_hours < ttl_hours:
+            return _to_tickers(pd.read_csv(latest_path), exclude_class_b)
+
+    # Refresh the snapshot from Wikipedia (falling back to the latest snapshot when offline)
+    try:
+        constituents = download_constituents()
+        save_constituent_snapshot(constituents, cache_dir)
+
+    except Exception as e:
+        if not snapshots:
+            raise FileNotFoundError(f"Could not download the S&P 500 constituents and no snapshot exists in `{cache_dir}`") from e
+
+        print_title(f"Using stale constituents snapshot {snapshots[-1][0]}", "bright_magenta", "magenta")
+        constituents = pd.read_csv(snapshots[-1][1])
+
+    return _to_tickers(constituents, exclude_class_b)
+
+if __name__ == "__main__":
+    print("This script should not be run directly! Import these functions for use in another file.")
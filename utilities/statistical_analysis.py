@@ -4,10 +4,12 @@ from .print_utils import print_title, print_label
 # Feature selection
 from statsmodels.stats.outliers_influence import variance_inflation_factor
 
-# Model evaluation metrics
-from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error, accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
 import statsmodels.api as sm
 import numpy as np
+import inspect
+
+# Newer statsmodels versions standardize the features before calculating the VIF
+_VIF_STANDARDIZES = "standardize" in inspect.signature(variance_inflation_factor).parameters
 
 def highlight_vif(row: pd.Series, threshold: float) -> list:
     """
@@ -22,17 +24,93 @@ def highlight_vif(row: pd.Series, threshold: float) -> list:
     """
     return ["background-color: black" if value < threshold else "" for value in row]
 
-def calc_vif(df: pd.DataFrame) -> pd.DataFrame:
+def _gram_vif(values: np.ndarray, standardize: bool = False, chunk_rows: int = 65536) -> np.ndarray:
+    """
+    Calculate the VIF of every column at once from the diagonal of the inverse Gram matrix.
+
+    Regressing column i on the other columns leaves a residual sum of squares of 1 / inv(X'X)[i, i],
+    so VIF_i = SS_i * inv(X'X)[i, i]. Like statsmodels' `variance_inflation_factor` (no constant is
+    added), SS_i is the uncentered sum of squares, or the centered one when another column is a
+    constant. With `standardize` the non-constant columns are centered and scaled first (like the
+    `standardize` option of newer statsmodels), which makes inv(X'X) the inverse correlation matrix.
+    The Gram matrix is accumulated over chunks of rows, so the standardized matrix is never stored.
+
+    Parameters:
+    values (np.ndarray): The 2D feature matrix (rows x features).
+    standardize (bool): Whether to center and scale the non-constant columns first.
+    chunk_rows (int): The number of rows per chunk of the Gram matrix.
+
+    Returns:
+    np.ndarray: The VIF of each column.
+
+    Raises:
+    np.linalg.LinAlgError: If the features are (nearly) perfectly collinear.
+    """
+    n_rows, n_columns = values.shape
+    means = values.mean(axis=0)
+    stds = values.std(axis=0)
+    varying = stds > 1e-10 if standardize else np.zeros(n_columns, dtype=bool)
+    shift = np.where(varying, means, 0.0)
+    scale = np.where(varying, stds, 1.0)
+
+    gram = np.zeros((n_columns, n_columns))
+    for start in range(0, n_rows, chunk_rows):
+        chunk = (values[start:start + chunk_rows] - shift) / scale
+        gram += chunk.T @ chunk
+
+    diagonal = np.diag(gram).copy()
+    if not np.all(np.isfinite(gram)) or np.any(diagonal <= 0):
+        raise np.linalg.LinAlgError("The Gram matrix is not positive definite")
+
+    # Invert the Gram matrix scaled to a unit diagonal (better conditioned)
+    unit_scale = np.sqrt(diagonal)
+    scaled_gram = gram / np.outer(unit_scale, unit_scale)
+    if np.linalg.cond(scaled_gram) > 1e12:
+        raise np.linalg.LinAlgError("The features are (nearly) perfectly collinear")
+    inverse_diagonal = np.diag(np.linalg.inv(scaled_gram)) / diagonal
+
+    # Centered sums of squares where one of the other columns is a constant (centered R-squared)
+    is_constant = (stds == 0) & (means != 0)
+    other_constant = is_constant.sum() - is_constant > 0
+    working_means = (means - shift) / scale
+    sum_of_squares = np.where(other_constant, diagonal - n_rows * working_means ** 2, diagonal)
+    return sum_of_squares * inverse_diagonal
+
+def calc_vif(df: pd.DataFrame, method: str = "closed_form", sample_size: int = None, random_state: int = None) -> pd.DataFrame:
     """
     Calculate Variance Inflation Factor (VIF) for each feature in the DataFrame.
 
+    The default closed-form method calculates every VIF at once from one Gram matrix (see
+    `_gram_vif`) instead of one OLS regression per feature, with the same values as the installed
+    statsmodels version.
+    It falls back to statsmodels when the features are (nearly) perfectly collinear.
+
     Parameters:
     df (pd.DataFrame): The input DataFrame with features.
+    method (str): "closed_form" (default) or "statsmodels" (one regression per feature).
+    sample_size (int): If set, calculate the VIF on a random sample of this many rows.
+    random_state (int): Seed of the row sample.
 
     Returns:
     pd.DataFrame: A DataFrame containing VIF values for each feature.
     """
-    vif_values = [variance_inflation_factor(df.values, i) for i in range(df.shape[1])]
+    if method not in ("closed_form", "statsmodels"):
+        raise ValueError(f"Unknown VIF method '{method}'. Use 'closed_form' or 'statsmodels'.")
+
+    values = df.to_numpy(dtype=np.float64)
+    if sample_size is not None and sample_size < len(values):
+        rows = np.random.default_rng(random_state).choice(len(values), size=sample_size, replace=False)
+        values = values[np.sort(rows)]
+
+    vif_values = None
+    if method == "closed_form":
+        try:
+            vif_values = _gram_vif(values, standardize=_VIF_STANDARDIZES)
+        except np.linalg.LinAlgError:
+            vif_values = None
+    if vif_values is None:
+        vif_values = [variance_inflation_factor(values, i) for i in range(values.shape[1])]
+
     vif = pd.DataFrame(data={"VIF": vif_values}, index=df.columns).sort_values(by="VIF", ascending=True)
     return vif
 
@@ -95,10 +173,285 @@ def adj_r2_score(model, X, y):
     adj_r2 = 1 - (1 - r2) * (n - 1) / (n - p - 1)
     return adj_r2
 
-def evaluate_regression_model(model, model_name, X_train, y_train, X_test, y_test, y_train_unscaled, y_test_unscaled, y_train_pred_unscaled, y_test_pred_unscaled):
+# Largest label range encoded with lookup tables instead of sorting
+_MAX_LABEL_RANGE = 1 << 16
+
+def _integer_labels(values: np.ndarray) -> np.ndarray:
+    """Return whole-number float labels (e.g. -1.0/1.0 directions) as int64, other labels unchanged."""
+    if np.issubdtype(values.dtype, np.floating) and len(values):
+        with np.errstate(invalid="ignore"):
+            integer_values = values.astype(np.int64)
+        if np.array_equal(integer_values, values):
+            return integer_values
+    return values
+
+def _small_integer_range(*arrays):
+    """Return the (low, number of values) range of integer arrays, or None if they are not small-range integers."""
+    arrays = [values for values in arrays if len(values)]
+    if not arrays or not all(np.issubdtype(values.dtype, np.integer) for values in arrays):
+        return None
+    low = min(values.min() for values in arrays)
+    n_values = int(max(values.max() for values in arrays) - low) + 1
+    return (low, n_values) if n_values <= _MAX_LABEL_RANGE else None
+
+def _label_set(*arrays) -> np.ndarray:
+    """Return the sorted union of the labels of several arrays."""
+    integer_range = _small_integer_range(*arrays)
+    if integer_range is None:
+        return np.unique(np.concatenate([np.unique(values) for values in arrays]))
+
+    low, n_values = integer_range
+    present = np.zeros(n_values, dtype=bool)
+    for values in arrays:
+        present |= np.bincount(values - low, minlength=n_values) > 0
+    return np.flatnonzero(present) + low
+
+def _label_codes(values: np.ndarray, label_values: np.ndarray) -> tuple:
+    """
+    Map labels to their positions (codes) in a sorted label set.
+
+    Returns:
+    tuple: The codes and a mask of the labels found in the label set.
+    """
+    integer_range = _small_integer_range(values, _integer_labels(label_values))
+    if integer_range is not None:
+        low, n_values = integer_range
+        table = np.full(n_values, -1, dtype=np.intp)
+        table[_integer_labels(label_values) - low] = np.arange(len(label_values))
+        codes = table[values - low]
+        return codes, codes >= 0
+
+    codes = np.searchsorted(label_values, values).clip(max=max(len(label_values) - 1, 0))
+    return codes, label_values[codes] == values if len(label_values) else np.zeros(len(values), dtype=bool)
+
+def _check_missing_labels(*arrays) -> None:
+    """Raise a ValueError if any label is missing (NaN, None or `pd.NA`, e.g. from a nullable `Int8` column), like sklearn."""
+    for values in arrays:
+        if values.dtype.kind in "fcOmM" and pd.isna(values).any():
+            raise ValueError("Input contains missing labels (NaN or NA). Drop or fill them before calculating the metrics.")
+
+def _encode_labels(y_true, y_pred, labels=None):
+    """
+    Encode true and predicted labels as codes 0..k-1 of one shared, sorted label set.
+
+    Small-range integer labels (including whole-number floats) are encoded with lookup tables
+    and bincounts instead of sorting.
+
+    Parameters:
+    y_true (array-like): The true labels.
+    y_pred (array-like): The predicted labels.
+    labels (array-like): The labels to keep (default: every label found in y_true or y_pred).
+
+    Returns:
+    tuple: The label values, the true codes, the predicted codes and a mask of the rows whose
+    labels are both in the label set.
+    """
+    y_true, y_pred = np.asarray(y_true).ravel(), np.asarray(y_pred).ravel()
+    if len(y_true) != len(y_pred):
+        raise ValueError(f"y_true and y_pred have different lengths ({len(y_true)} and {len(y_pred)})")
+    _check_missing_labels(y_true, y_pred)
+
+    label_dtype = np.result_type(y_true, y_pred)
+    y_true, y_pred = _integer_labels(y_true), _integer_labels(y_pred)
+    label_values = _label_set(y_true, y_pred) if labels is None else np.unique(np.asarray(labels))
+
+    true_codes, true_found = _label_codes(y_true, label_values)
+    pred_codes, pred_found = _label_codes(y_pred, label_values)
+    if labels is None:
+        label_values = label_values.astype(label_dtype)
+    return label_values, true_codes, pred_codes, true_found & pred_found
+
+def _confusion_metrics(confusion: np.ndarray) -> dict:
+    """
+    Derive the accuracy and the support-weighted precision, recall and F1 from confusion counts.
+
+    Works on one (k x k) confusion matrix or on a stack of them (... x k x k), like sklearn's
+    `average='weighted'` with `zero_division=0`.
+
+    Parameters:
+    confusion (np.ndarray): The confusion counts (true labels in rows, predictions in columns).
+
+    Returns:
+    dict: The support, accuracy, precision, recall and F1 (arrays for stacked matrices).
+    """
+    confusion = confusion.astype(np.float64)
+    true_positives = np.diagonal(confusion, axis1=-2, axis2=-1)
+    support = confusion.sum(axis=-1)
+    predicted = confusion.sum(axis=-2)
+    total = support.sum(axis=-1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, true_positives / predicted, 0.0)
+        recall = np.where(support > 0, true_positives / support, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+        weights = np.where(total[..., None] > 0, support / total[..., None], 0.0)
+        accuracy = np.where(total > 0, true_positives.sum(axis=-1) / total, np.nan)
+
+    return {
+        "support": total,
+        "accuracy": accuracy,
+        "precision": (weights * precision).sum(axis=-1),
+        "recall": (weights * recall).sum(axis=-1),
+        "f1": (weights * f1).sum(axis=-1),
+    }
+
+def classification_metrics(y_true, y_pred, labels=None) -> dict:
+    """
+    Calculate the classification metrics of a set of predictions from one confusion matrix.
+
+    The confusion matrix is counted once with `np.bincount` and every metric is derived from it.
+    Precision, recall and F1 are support-weighted (`average='weighted'`, `zero_division=0`).
+
+    Parameters:
+    y_true (array-like): The true labels.
+    y_pred (array-like): The predicted labels.
+    labels (array-like): The labels to keep (default: every label found in y_true or y_pred).
+
+    Returns:
+    dict: The labels, confusion matrix, support, accuracy, precision, recall and F1.
+
+    Raises:
+    ValueError: If a label is missing (NaN or NA).
+    """
+    label_values, true_codes, pred_codes, mask = _encode_labels(y_true, y_pred, labels)
+    n_labels = len(label_values)
+    keys = true_codes[mask] * n_labels + pred_codes[mask]
+    confusion = np.bincount(keys, minlength=n_labels * n_labels).reshape(n_labels, n_labels)
+
+    metrics = {key: value.item() for key, value in _confusion_metrics(confusion).items()}
+    metrics["support"] = int(metrics["support"])
+    return {"labels": label_values, "confusion_matrix": confusion, **metrics}
+
+def regression_metrics(y_true, y_pred, n_features: int = None, chunk_rows: int = 1 << 20) -> dict:
+    """
+    Calculate the regression metrics of a set of predictions in one pass over the rows.
+
+    The error sums (squared, absolute, percentage) and the sums for R-squared are accumulated
+    together over chunks of rows, so no full-length temporaries are kept.
+
+    Parameters:
+    y_true (array-like): The true values.
+    y_pred (array-like): The predicted values.
+    n_features (int): The number of features of the model (for the adjusted R-squared).
+    chunk_rows (int): The number of rows per chunk.
+
+    Returns:
+    dict: The MSE, RMSE, R-squared, adjusted R-squared (NaN without n_features), MAE and MAPE.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64).ravel()
+    y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
+    if len(y_true) != len(y_pred):
+        raise ValueError(f"y_true and y_pred have different lengths ({len(y_true)} and {len(y_pred)})")
+
+    n = len(y_true)
+    shift = y_true[0] if n else 0.0  # Shifted sums keep the total sum of squares accurate
+    squared_error = absolute_error = percentage_error = shifted_sum = shifted_squares = 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, n, chunk_rows):
+            true_chunk, pred_chunk = y_true[start:start + chunk_rows], y_pred[start:start + chunk_rows]
+            error = true_chunk - pred_chunk
+            squared_error += error @ error
+            absolute_error += np.abs(error).sum()
+            percentage_error += np.abs(error / true_chunk).sum()
+            shifted = true_chunk - shift
+            shifted_sum += shifted.sum()
+            shifted_squares += shifted @ shifted
+
+        mse = squared_error / n
+        total_squares = shifted_squares - shifted_sum ** 2 / n
+        r2 = 1 - squared_error / total_squares if total_squares > 0 else np.nan
+        adj_r2 = 1 - (1 - r2) * (n - 1) / (n - n_features - 1) if n_features is not None else np.nan
+
+    metrics = {
+        "mse": mse,
+        "rmse": np.sqrt(mse),
+        "r2": r2,
+        "adj_r2": adj_r2,
+        "mae": absolute_error / n,
+        "mape": percentage_error / n * 100,
+    }
+    return {key: float(value) for key, value in metrics.items()}
+
+def grouped_classification_metrics(groups, y_true, y_pred, labels=None, group_name=None) -> pd.DataFrame:
+    """
+    Calculate the classification metrics of every group (e.g. ticker or date), for one or several models.
+
+    The (model, group, true label, predicted label) combinations are packed into one integer key
+    and counted with a single `np.bincount`, so there is no loop over groups. The metrics
+    of every group are derived from its confusion counts like in `classification_metrics`.
+
+    Parameters:
+    groups (array-like): The group of each row (labels or a categorical; missing groups are skipped).
+    y_true (array-like): The true labels.
+    y_pred (array-like or dict): The predicted labels, or a dict of model name -> predicted labels.
+    labels (array-like): The labels to keep (default: every label found in y_true or the predictions).
+    group_name (str): The name of the group index (default: the name of `groups`, or "Group").
+
+    Returns:
+    pd.DataFrame: One row per group (per model and group for a dict of predictions) with the support,
+    accuracy, precision, recall, F1 and the confusion counts ("True a / Pred b" columns).
+    """
+    group_name = group_name or getattr(groups, "name", None) or "Group"
+    if isinstance(groups, pd.Series) and isinstance(groups.dtype, pd.CategoricalDtype):
+        group_codes, group_values = groups.cat.codes.to_numpy(), groups.cat.categories
+    else:
+        group_codes, group_values = pd.factorize(np.asarray(groups), sort=True)
+
+    models = list(y_pred) if isinstance(y_pred, dict) else None
+    predictions = [np.asarray(y_pred[model]).ravel() for model in models] if models is not None else [np.asarray(y_pred).ravel()]
+    y_true = np.asarray(y_true).ravel()
+    n_rows, n_models, n_groups = len(group_codes), len(predictions), len(group_values)
+    if any(len(prediction) != n_rows for prediction in predictions) or len(y_true) != n_rows:
+        raise ValueError("groups, y_true and every set of predictions must have the same length")
+    _check_missing_labels(y_true, *predictions)
+
+    # One label set shared by the true labels and every model
+    label_dtype = np.result_type(y_true, *predictions)
+    y_true, predictions = _integer_labels(y_true), [_integer_labels(prediction) for prediction in predictions]
+    label_values = _label_set(y_true, *predictions) if labels is None else np.unique(np.asarray(labels))
+    n_labels = len(label_values)
+    n_cells = n_groups * n_labels * n_labels
+
+    # Combined (model, group, true, predicted) keys; skipped rows go to an extra last bin
+    true_codes, true_found = _label_codes(y_true, label_values)
+    row_keys = (group_codes.astype(np.int64) * n_labels + true_codes) * n_labels
+    row_skipped = ~true_found | (group_codes < 0)
+    keys = np.empty(n_models * n_rows, dtype=np.int64)
+    for model_index, prediction in enumerate(predictions):
+        pred_codes, pred_found = _label_codes(prediction, label_values)
+        model_keys = keys[model_index * n_rows:(model_index + 1) * n_rows]
+        np.add(row_keys, pred_codes + model_index * n_cells, out=model_keys)
+        model_keys[row_skipped | ~pred_found] = n_models * n_cells
+
+    counts = np.bincount(keys, minlength=n_models * n_cells + 1)[:-1]
+    counts = counts.reshape(n_models * n_groups, n_labels, n_labels)
+    if labels is None:
+        label_values = label_values.astype(label_dtype)
+
+    metrics = _confusion_metrics(counts)
+    report = pd.DataFrame({
+        "Support": metrics["support"].astype(np.int64),
+        "Accuracy": metrics["accuracy"],
+        "Precision": metrics["precision"],
+        "Recall": metrics["recall"],
+        "F1": metrics["f1"],
+        **{f"True {true_label} / Pred {pred_label}": counts[:, i, j]
+           for i, true_label in enumerate(label_values) for j, pred_label in enumerate(label_values)},
+    })
+
+    if models is None:
+        report.index = pd.Index(group_values, name=group_name)
+    else:
+        report.index = pd.MultiIndex.from_product([models, group_values], names=["Model", group_name])
+    return report
+
+def evaluate_regression_model(model, model_name, X_train, y_train, X_test, y_test, y_train_unscaled, y_test_unscaled, y_train_pred_unscaled, y_test_pred_unscaled, use_model_score=False):
     """
     Evaluate a regression model and print relevant metrics.
 
+    Every metric comes from one `regression_metrics` pass over the unscaled values, including the
+    adjusted R-squared (from the R-squared of the unscaled predictions), so the model is not re-scored.
+
     Parameters:
     model: The regression model.
     model_name (str): The name of the regression model.
@@ -110,85 +463,91 @@ def evaluate_regression_model(model, model_name, X_train, y_train, X_test, y_tes
     y_test_unscaled (pd.Series): The unscaled testing target variable.
     y_train_pred_unscaled (pd.Series): The unscaled training predictions.
     y_test_pred_unscaled (pd.Series): The unscaled testing predictions.
+    use_model_score (bool): If True, calculate the adjusted R-squared with `adj_r2_score` from
+        `model.score` on the scaled data instead (one more prediction per data set; differs from
+        the default only when the target scaler is not affine).
+    """
+    train_metrics = regression_metrics(y_train_unscaled, y_train_pred_unscaled, n_features=X_train.shape[1])
+    test_metrics = regression_metrics(y_test_unscaled, y_test_pred_unscaled, n_features=X_test.shape[1])
+    if use_model_score:
+        train_metrics["adj_r2"] = adj_r2_score(model, X_train, y_train)
+        test_metrics["adj_r2"] = adj_r2_score(model, X_test, y_test)
+
+    print_regression_metrics(model_name, train_metrics, test_metrics)
+
+def print_regression_metrics(model_name: str, train_metrics: dict, test_metrics: dict) -> None:
+    """
+    Print the training and testing metrics of a regression model.
+
+    Parameters:
+    model_name (str): The name of the regression model.
+    train_metrics (dict): The training metrics from `regression_metrics`.
+    test_metrics (dict): The testing metrics from `regression_metrics`.
     """
-    # Calculate metrics for training data
-    mse_train = mean_squared_error(y_train_unscaled, y_train_pred_unscaled)
-    rmse_train = np.sqrt(mse_train)
-    r2_train = r2_score(y_train_unscaled, y_train_pred_unscaled)
-    adj_r2_train = adj_r2_score(model, X_train, y_train)
-    mae_train = mean_absolute_error(y_train_unscaled, y_train_pred_unscaled)
-    mape_train = np.mean(np.abs((y_train_unscaled - y_train_pred_unscaled) / y_train_unscaled)) * 100
-
-    # Calculate metrics for testing data
-    mse_test = mean_squared_error(y_test_unscaled, y_test_pred_unscaled)
-    rmse_test = np.sqrt(mse_test)
-    r2_test = r2_score(y_test_unscaled, y_test_pred_unscaled)
-    adj_r2_test = adj_r2_score(model, X_test, y_test)
-    mae_test = mean_absolute_error(y_test_unscaled, y_test_pred_unscaled)
-    mape_test = np.mean(np.abs((y_test_unscaled - y_test_pred_unscaled) / y_test_unscaled)) * 100
-
-    # Print metrics
     print_title(f"{model_name} Model Evaluation", text_color="bright_cyan", closed_corners=False)
     print_label("", "")
     print_label("Training Data Metrics", "", text_color="yellow")
-    print_label("Mean Squared Error (Train):", mse_train, text_color="bright_cyan")
-    print_label("Root Mean Squared Error (Train):", rmse_train, text_color="bright_cyan")
-    print_label("R-Squared (Train):", r2_train, text_color="bright_cyan")
-    print_label("Adjusted R-Squared (Train):", adj_r2_train, text_color="bright_cyan")
-    print_label("Mean Absolute Error (Train):", mae_train, text_color="bright_cyan")
-    print_label("Mean Absolute Percentage Error (Train):", mape_train, text_color="bright_cyan")
+    print_label("Mean Squared Error (Train):", train_metrics["mse"], text_color="bright_cyan")
+    print_label("Root Mean Squared Error (Train):", train_metrics["rmse"], text_color="bright_cyan")
+    print_label("R-Squared (Train):", train_metrics["r2"], text_color="bright_cyan")
+    print_label("Adjusted R-Squared (Train):", train_metrics["adj_r2"], text_color="bright_cyan")
+    print_label("Mean Absolute Error (Train):", train_metrics["mae"], text_color="bright_cyan")
+    print_label("Mean Absolute Percentage Error (Train):", train_metrics["mape"], text_color="bright_cyan")
     print_label("", "")
     print_label("Testing Data Metrics", "", text_color="yellow")
-    print_label("Mean Squared Error (Test):", mse_test, text_color="bright_cyan")
-    print_label("Root Mean Squared Error (Test):", rmse_test, text_color="bright_cyan")
-    print_label("R-Squared (Test):", r2_test, text_color="bright_cyan")
-    print_label("Adjusted R-Squared (Test):", adj_r2_test, text_color="bright_cyan")
-    print_label("Mean Absolute Error (Test):", mae_test, text_color="bright_cyan")
-    print_label("Mean Absolute Percentage Error (Test):", mape_test, text_color="bright_cyan", closed_corners=True)
-
-def evaluate_classifier_model(model_name, y_train, y_test, y_train_pred, y_test_pred):
+    print_label("Mean Squared Error (Test):", test_metrics["mse"], text_color="bright_cyan")
+    print_label("Root Mean Squared Error (Test):", test_metrics["rmse"], text_color="bright_cyan")
+    print_label("R-Squared (Test):", test_metrics["r2"], text_color="bright_cyan")
+    print_label("Adjusted R-Squared (Test):", test_metrics["adj_r2"], text_color="bright_cyan")
+    print_label("Mean Absolute Error (Test):", test_metrics["mae"], text_color="bright_cyan")
+    print_label("Mean Absolute Percentage Error (Test):", test_metrics["mape"], text_color="bright_cyan", closed_corners=True)
+
+def evaluate_classifier_model(model_name, y_train, y_test, y_train_pred, y_test_pred, verbose=True):
     """
     Evaluate a classifier model and print relevant metrics.
 
+    The metrics come from `classification_metrics` (one confusion matrix per data set).
+
     Parameters:
     model_name (str): The name of the classifier model.
     y_train (pd.Series): The training target variable.
     y_test (pd.Series): The testing target variable.
     y_train_pred (pd.Series): The training predictions.
     y_test_pred (pd.Series): The testing predictions.
+    verbose (bool): Whether to print the metrics.
 
     Returns:
     tuple: Confusion matrices for training and testing data.
     """
-    # Calculate metrics for training data
-    accuracy_train = accuracy_score(y_train, y_train_pred)
-    precision_train = precision_score(y_train, y_train_pred, average='weighted', zero_division=0)
-    recall_train = recall_score(y_train, y_train_pred, average='weighted', zero_division=0)
-    f1_train = f1_score(y_train, y_train_pred, average='weighted', zero_division=0)
-    confusion_train = confusion_matrix(y_train, y_train_pred)
-
-    # Calculate metrics for testing data
-    accuracy_test = accuracy_score(y_test, y_test_pred)
-    precision_test = precision_score(y_test, y_test_pred, average='weighted', zero_division=0)
-    recall_test = recall_score(y_test, y_test_pred, average='weighted', zero_division=0)
-    f1_test = f1_score(y_test, y_test_pred, average='weighted', zero_division=0)
-    confusion_test = confusion_matrix(y_test, y_test_pred)
-
-    # Print metrics
+    train_metrics = classification_metrics(y_train, y_train_pred)
+    test_metrics = classification_metrics(y_test, y_test_pred)
+
+    if verbose:
+        print_classification_metrics(model_name, train_metrics, test_metrics)
+    return train_metrics["confusion_matrix"], test_metrics["confusion_matrix"]
+
+def print_classification_metrics(model_name: str, train_metrics: dict, test_metrics: dict) -> None:
+    """
+    Print the training and testing metrics of a classifier model.
+
+    Parameters:
+    model_name (str): The name of the classifier model.
+    train_metrics (dict): The training metrics from `classification_metrics`.
+    test_metrics (dict): The testing metrics from `classification_metrics`.
+    """
     print_title(f"{model_name} Model Evaluation", text_color="bright_cyan", closed_corners=False)
     print_label("", "")
     print_label("Training Data Metrics", "", text_color="yellow")
-    print_label("Accuracy (Train):", accuracy_train, text_color="bright_cyan")
-    print_label("Precision (Train):", precision_train, text_color="bright_cyan")
-    print_label("Recall (Train):", recall_train, text_color="bright_cyan")
-    print_label("F1 Score (Train):", f1_train, text_color="bright_cyan")
+    print_label("Accuracy (Train):", train_metrics["accuracy"], text_color="bright_cyan")
+    print_label("Precision (Train):", train_metrics["precision"], text_color="bright_cyan")
+    print_label("Recall (Train):", train_metrics["recall"], text_color="bright_cyan")
+    print_label("F1 Score (Train):", train_metrics["f1"], text_color="bright_cyan")
     print_label("", "")
     print_label("Testing Data Metrics", "", text_color="yellow")
-    print_label("Accuracy (Test):", accuracy_test, text_color="bright_cyan")
-    print_label("Precision (Test):", precision_test, text_color="bright_cyan")
-    print_label("Recall (Test):", recall_test, text_color="bright_cyan")
-    print_label("F1 Score (Test):", f1_test, text_color="bright_cyan", closed_corners=True)
-    return confusion_train, confusion_test
+    print_label("Accuracy (Test):", test_metrics["accuracy"], text_color="bright_cyan")
+    print_label("Precision (Test):", test_metrics["precision"], text_color="bright_cyan")
+    print_label("Recall (Test):", test_metrics["recall"], text_color="bright_cyan")
+    print_label("F1 Score (Test):", test_metrics["f1"], text_color="bright_cyan", closed_corners=True)
 
 def evaluate_cross_validation(cv_scores: np.ndarray, model_name: str) -> None:
     """
@@ -205,4 +564,44 @@ def evaluate_cross_validation(cv_scores: np.ndarray, model_name: str) -> None:
 
     print_label("", "")
     print_label("Mean Score:", cv_scores.mean(), text_color="green")
-    print_label("Standard Deviation:", cv_scores.std(), text_color="green", closed_corners=True)
\ No newline at end of file
+    print_label("Standard Deviation:", cv_scores.std(), text_color="green", closed_corners=True)
+if __name__ == "__main__":
+    # Per-ticker and per-date evaluation of the saved classifier predictions, then a universe-scale benchmark
+    # Usage: python -m utilities.statistical_analysis [n_days] [n_tickers]
+    import sys
+    import time
+    from .backtesting import DEFAULT_PREDICTIONS_DIR
+    from .dataframe_utils import load_data
+
+    prediction_sets = {path.stem: load_data(path) for path in sorted(DEFAULT_PREDICTIONS_DIR.glob("clf_*.zip"))}
+    reference = next(iter(prediction_sets.values()))
+    predictions = {model: np.where(df["Pred Today to Tomorrow"] > 0, 1, -1) for model, df in prediction_sets.items()}
+
+    start_time = time.perf_counter()
+    by_ticker = grouped_classification_metrics(reference["Ticker"], reference["Today to Tomorrow"], predictions)
+    by_date = grouped_classification_metrics(reference["Date"], reference["Today to Tomorrow"], predictions)
+    elapsed = time.perf_counter() - start_time
+
+    print_title("Saved Predictions by Ticker and Date", text_color="bright_cyan", closed_corners=False)
+    print_label("Elapsed:", f"{elapsed * 1000:.1f} ms", text_color="bright_cyan")
+    for model in predictions:
+        ticker_accuracy = by_ticker.loc[model, "Accuracy"]
+        print_label(f"{model[4:]}:", f"{ticker_accuracy.min():.0%}-{ticker_accuracy.max():.0%} by ticker, "
+                    f"{by_date.loc[model, 'Accuracy'].mean():.1%} mean", text_color="bright_cyan")
+    print_label("", "", closed_corners=True)
+
+    # Synthetic universe: every ticker on every day, 6 models
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else 4500
+    n_tickers = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    rng = np.random.default_rng(0)
+    tickers = pd.Categorical.from_codes(np.tile(np.arange(n_tickers), n_days), categories=[f"T{i:03d}" for i in range(n_tickers)])
+    y_true = rng.choice([-1, 1], size=n_days * n_tickers)
+    y_preds = {f"model_{i}": np.where(rng.random(len(y_true)) < 0.55, y_true, -y_true) for i in range(6)}
+
+    start_time = time.perf_counter()
+    report = grouped_classification_metrics(pd.Series(tickers, name="Ticker"), y_true, y_preds)
+    elapsed = time.perf_counter() - start_time
+
+    print_title(f"Grouped Metrics: {len(y_true):,} rows x 6 models", text_color="bright_cyan", closed_corners=False)
+    print_label("Per-ticker report:", f"{elapsed:.2f}s | {len(report):,} rows", text_color="bright_cyan")
+    print_label("Mean accuracy:", f"{report['Accuracy'].mean():.3f}", text_color="bright_cyan", closed_corners=True)
@@ -1,8 +1,12 @@
 import pandas as pd
-import yfinance as yf
+import time as time_module
 
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from utilities.print_utils import print_title, print_label, print_footer
+from utilities.price_cache import get_cached_prices
+from utilities.sp500_constituents import get_sp500_tickers
+from utilities.market_data_providers import YFinanceProvider
 
 # ================================================
 # Utility to Print Report
@@ -39,7 +43,7 @@ def print_download_report_historical(data, sp500_tickers, start_date, end_date):
     print_label("Downloaded Date Range:", f"{actual_start_date} to {actual_end_date}", RESPONSE_TEXT_COLOR, BORDER_COLOR)
     print_footer("S&P 500 Data Downloaded Successfully...", FOOTER_TEXT_COLOR, BORDER_COLOR)
 
-def print_download_report_today(data, sp500_tickers, time):
+def print_download_report_today(data, sp500_tickers, time, collection_report=None):
     """
     Print the download report for the S&P 500 data for today.
 
@@ -47,6 +51,7 @@ def print_download_report_today(data, sp500_tickers, time):
     - data: DataFrame with historical prices for S&P 500 tickers
     - sp500_tickers: List of S&P 500 tickers
     - time: Time to fetch the data for
+    - collection_report: Optional DataFrame with the latency, attempts and error of each ticker
     """
     BORDER_COLOR = "blue"
     REQUEST_TEXT_COLOR = "bright_blue"
@@ -64,15 +69,33 @@ def print_download_report_today(data, sp500_tickers, time):
     print_label("Total Requested Tickers:", str(total_tickers_count), REQUEST_TEXT_COLOR, BORDER_COLOR)
     print_label("Requested Time:", time, REQUEST_TEXT_COLOR, BORDER_COLOR)
     print_label("Downloaded Date:", actual_date, RESPONSE_TEXT_COLOR, BORDER_COLOR)
+
+    if collection_report is not None:
+        latencies = collection_report["Latency"]
+        failed_count = collection_report["Error"].notna().sum()
+        print_label("Failed Tickers:", str(failed_count), RESPONSE_TEXT_COLOR, BORDER_COLOR)
+        print_label("Retried Tickers:", str((collection_report["Attempts"] > 1).sum()), RESPONSE_TEXT_COLOR, BORDER_COLOR)
+        print_label("Latency p50 / p99 / max:", f"{latencies.quantile(0.5):.2f}s / {latencies.quantile(0.99):.2f}s / {latencies.max():.2f}s", RESPONSE_TEXT_COLOR, BORDER_COLOR)
+        print_label("Total Collection Time:", f"{collection_report.attrs.get('elapsed', 0):.2f}s", RESPONSE_TEXT_COLOR, BORDER_COLOR)
+
     print_footer("S&P 500 Data Downloaded Successfully...", FOOTER_TEXT_COLOR, BORDER_COLOR)
 
 # ================================================
 # Fetching Historical Data
 # ================================================
-def fetch_and_download_sp500_data(start_date='2020-10-01', end_date=None):
+def fetch_and_download_sp500_data(start_date='2020-10-01', end_date=None, cache_dir=None, offline=False, tickers=None, provider=None):
     """
     Fetch and download historical adjusted close prices for S&P 500 tickers.
 
+    Parameters:
+    - start_date: Start date for the data download
+    - end_date: End date for the data download: if not provided, it will default to today's date
+    - cache_dir: Directory of a local price cache (see `utilities.price_cache`). If provided, only
+      the (ticker, date range) gaps that are missing from the cache are downloaded.
+    - offline: If True, serve the data from the price cache only (requires `cache_dir`)
+    - tickers: List of tickers to download. Defaults to the cached S&P 500 constituents (see `get_sp500_tickers`).
+    - provider: Market data provider (see `utilities.market_data_providers`). Defaults to Yahoo Finance.
+
     Returns:
     - data: DataFrame with historical prices for S&P 500 tickers
     """
@@ -80,22 +103,22 @@ def fetch_and_download_sp500_data(start_date='2020-10-01', end_date=None):
     if end_date is None:
         end_date = datetime.today().strftime('%Y-%m-%d')
 
-    # Fetch S&P 500 tickers
+    # Fetch S&P 500 tickers (from the local constituents snapshot, excluding Class B shares)
+    sp500_tickers = list(tickers) if tickers is not None else get_sp500_tickers()
 
-    #Get tickers from wikipedia
-    sp500_tickers = pd.read_html('https://en.wikipedia.org/wiki/List_of_S%26P_500_companies')[0]['Symbol'].to_numpy()
-
-    # Filter out Class B shares that have a '.B' in the ticker name
-    # Class B shares are typically held by company insiders and have different voting rights than Class A shares
-    sp500_tickers = [ticker for ticker in sp500_tickers if '.B' not in ticker]
+    # Use Yahoo Finance unless another market data provider is given
+    provider = provider or YFinanceProvider()
 
     # Define dates for historical data download
     start_date = start_date
     end_date = end_date
 
     try:
-        # Download historical prices
-        data = yf.download(sp500_tickers, start=start_date, end=end_date)['Adj Close']
+        # Download historical prices (only the missing gaps when a price cache is used)
+        if cache_dir is not None:
+            data = get_cached_prices(sp500_tickers, start_date, end_date, provider.download_adj_close, cache_dir=cache_dir, offline=offline)
+        else:
+            data = provider.download_adj_close(sp500_tickers, start_date, end_date)
 
         # Fill NaN values with 0
         data.fillna(0, inplace=True)
@@ -113,19 +136,21 @@ def fetch_and_download_sp500_data(start_date='2020-10-01', end_date=None):
 # ================================================
 # Fetching Data for Today
 # ================================================
-def fetch_ticker_data(ticker_symbol, time):
+def fetch_ticker_data(ticker_symbol, time, timeout=10, provider=None):
     """ 
     Fetches the stock data for a given ticker symbol at 3:59 PM
 
     Parameters:
     - ticker_symbol: The stock ticker symbol to fetch data for.
     - time: The time to fetch the stock data for. Default is 3:59 PM.
+    - timeout: Timeout in seconds for the request.
+    - provider: Market data provider. Defaults to Yahoo Finance.
 
     Returns:
     - data: The stock data for the given ticker symbol at 3:59 PM.
     """
-    ticker = yf.Ticker(ticker_symbol)
-    data = ticker.history(period="1d", interval="1m")
+    provider = provider or YFinanceProvider()
+    data = provider.minute_bars(ticker_symbol, timeout=timeout)
     data["Ticker"] = ticker_symbol
 
     # Filter for 3:59 PM data
@@ -134,6 +159,36 @@ def fetch_ticker_data(ticker_symbol, time):
 
     return data
 
+def fetch_ticker_data_with_retry(ticker_symbol, time, timeout=10, retries=2, backoff=0.5, provider=None):
+    """
+    Fetches the stock data for a ticker, retrying failed requests with exponential backoff.
+
+    Parameters:
+    - ticker_symbol: The stock ticker symbol to fetch data for.
+    - time: The time to fetch the stock data for.
+    - timeout: Timeout in seconds for each request.
+    - retries: Number of retries after a failed request.
+    - backoff: Delay in seconds before the first retry (doubled for every further retry).
+    - provider: Market data provider. Defaults to Yahoo Finance.
+
+    Returns:
+    - Tuple of (data or None, latency in seconds, number of attempts, error message or None)
+    """
+    start = time_module.perf_counter()
+    error = None
+
+    for attempt in range(retries + 1):
+        try:
+            data = fetch_ticker_data(ticker_symbol, time, timeout=timeout, provider=provider)
+            return data, time_module.perf_counter() - start, attempt + 1, None
+
+        except Exception as e:
+            error = str(e)
+            if attempt < retries:
+                time_module.sleep(backoff * 2 ** attempt)
+
+    return None, time_module.perf_counter() - start, retries + 1, error
+
 def process_dataframe(dataframe):
     """ 
     Process the DataFrame to only include the Ticker and Close columns.
@@ -166,33 +221,64 @@ def reshape_dataframe(dataframe):
     reshaped_dataframe = dataframe.pivot(index='Datetime', columns='Ticker', values='Close')
     return reshaped_dataframe
 
-def sp500_data_for_today(time="15:59:00"):
+def sp500_data_for_today(time="15:59:00", max_workers=32, timeout=10, retries=2, backoff=0.5, return_report=False, tickers=None, provider=None):
     """
     Fetches the stock data for all S&P 500 tickers at 3:59 PM.
     Note: You can change the time to fetch the data at a different time.
 
+    The tickers are fetched concurrently by a bounded thread pool, with a timeout, retries
+    and exponential backoff for each ticker.
+
     Parameters:
     - time: The time to fetch the stock data for. Default is 3:59 PM.
+    - max_workers: Maximum number of concurrent requests.
+    - timeout: Timeout in seconds for each request.
+    - retries: Number of retries for each ticker after a failed request.
+    - backoff: Delay in seconds before the first retry (doubled for every further retry).
+    - return_report: If True, also return the collection report.
+    - tickers: List of tickers to fetch. Defaults to the cached S&P 500 constituents (see `get_sp500_tickers`).
+    - provider: Market data provider (see `utilities.market_data_providers`). Defaults to Yahoo Finance.
 
     Returns:
     - reshaped_dataframe: The reshaped DataFrame with the Ticker as columns and the Datetime as the index.
-    """
-
-    # Get tickers from Wikipedia
-    sp500_tickers = pd.read_html('https://en.wikipedia.org/wiki/List_of_S%26P_500_companies')[0]['Symbol'].to_numpy()
-
-    # Filter out Class B shares that have a '.B' in the ticker name
-    sp500_tickers = [ticker for ticker in sp500_tickers if '.B' not in ticker]
+    - collection_report: (Only if `return_report` is True) DataFrame with the latency, attempts and error of each ticker.
 
-    combined_dataframe = pd.DataFrame()
-
-    for ticker in sp500_tickers:
-        try:
-            ticker_data = fetch_ticker_data(ticker, time)
-            combined_dataframe = pd.concat([combined_dataframe, ticker_data])
+    Raises:
+    - ValueError: If no data could be fetched for any ticker (the message lists the failed tickers).
+    """
 
-        except Exception as e:
-            print(f"Error fetching {ticker}: {e}")
+    # Get S&P 500 tickers (from the local constituents snapshot, excluding Class B shares)
+    sp500_tickers = list(tickers) if tickers is not None else get_sp500_tickers()
+
+    # Use Yahoo Finance unless another market data provider is given
+    provider = provider or YFinanceProvider()
+
+    # Fetch all tickers concurrently
+    start = time_module.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(
+            lambda ticker: fetch_ticker_data_with_retry(ticker, time, timeout=timeout, retries=retries, backoff=backoff, provider=provider),
+            sp500_tickers
+        ))
+    elapsed = time_module.perf_counter() - start
+
+    # Collect the latency, attempts and errors of each ticker
+    collection_report = pd.DataFrame(
+        [(ticker, latency, attempts, error) for ticker, (_, latency, attempts, error) in zip(sp500_tickers, results)],
+        columns=["Ticker", "Latency", "Attempts", "Error"]
+    ).set_index("Ticker")
+    collection_report.attrs["elapsed"] = elapsed
+
+    for ticker, error in collection_report["Error"].dropna().items():
+        print(f"Error fetching {ticker}: {error}")
+
+    # Combine the data of all tickers with a single concat
+    fetched_data = [data for data, _, _, _ in results if data is not None]
+    if not fetched_data:
+        failed_tickers = collection_report.index[collection_report["Error"].notna()].tolist()
+        raise ValueError(f"No data could be fetched for any of the {len(sp500_tickers)} tickers. "
+                         f"Failed tickers: {', '.join(failed_tickers) if failed_tickers else 'none (no data returned)'}")
+    combined_dataframe = pd.concat(fetched_data)
 
     # Process the DataFrame
     processed_dataframe = process_dataframe(combined_dataframe)
@@ -201,6 +287,37 @@ def sp500_data_for_today(time="15:59:00"):
     reshaped_dataframe = reshape_dataframe(processed_dataframe)
 
     # Print Report
-    print_download_report_today(combined_dataframe, sp500_tickers, time)
+    print_download_report_today(combined_dataframe, sp500_tickers, time, collection_report)
+
+    if return_report:
+        return reshaped_dataframe, collection_report
+
+    return reshaped_dataframe
 
-    return reshaped_dataframe
\ No newline at end of file
+if __name__ == "__main__":
+    # Benchmark the concurrency of the snapshot collection against a local replay provider
+    # Usage: python -m utilities.stock_data_collection [n_tickers] [latency_seconds] [failure_rate]
+    import sys
+    import tempfile
+    from utilities.benchmark_utils import make_sp500_prices
+    from utilities.market_data_providers import ReplayProvider, write_synthetic_replay_data
+
+    n_tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    failure_rate = float(sys.argv[3]) if len(sys.argv) > 3 else 0.02
+
+    with tempfile.TemporaryDirectory() as replay_dir:
+        prices = make_sp500_prices(n_days=30, n_tickers=n_tickers)
+        write_synthetic_replay_data(replay_dir, prices)
+
+        results = []
+        for max_workers in [1, 8, 32, 64]:
+            provider = ReplayProvider(replay_dir, latency=latency, latency_jitter=latency / 2, failure_rate=failure_rate, seed=42)
+            _, collection_report = sp500_data_for_today(
+                max_workers=max_workers, backoff=0.01, return_report=True, tickers=prices.columns, provider=provider)
+            results.append((max_workers, collection_report))
+
+    print_title(f"Snapshot Concurrency Benchmark ({n_tickers} tickers)", "bright_blue", "blue", closed_corners=False)
+    for max_workers, collection_report in results:
+        print_label(f"{max_workers} workers:", f"{collection_report.attrs['elapsed']:.2f}s | {collection_report['Error'].notna().sum()} failed", "bright_blue", "blue")
+    print_label("", "", closed_corners=True)
@@ -1,10 +1,15 @@
 import numpy as np
 
-def generate_directions(data):
+def generate_directions(data, compact=False):
   next_day = data.shift(-1)  # Next day's price data
   prev_day = data.shift(1)   # Previous day's price data
 
   today_to_tomorrow = np.sign(next_day - data)
   yesterday_to_today = np.sign(data - prev_day)
 
+  # Compact mode: -1/0/1 as nullable 8-bit integers (NaN at the edges becomes <NA>)
+  if compact:
+    today_to_tomorrow = today_to_tomorrow.astype("Int8")
+    yesterday_to_today = yesterday_to_today.astype("Int8")
+
   return today_to_tomorrow, yesterday_to_today
\ No newline at end of file
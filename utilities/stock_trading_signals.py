@@ -1,6 +1,35 @@
 import numpy as np
 import pandas as pd
 
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+
+# Import in-house utilities
+if current_dir in sys.path:
+    # If current directory is in sys.path, use relative import
+    from print_utils import print_title, print_label
+    from stock_indicators import calculate_rsi
+else:
+    # Otherwise, use absolute import
+    from utilities.print_utils import print_title, print_label
+    from utilities.stock_indicators import calculate_rsi
+
+# Categories of the trading signals (the order of the compact category codes)
+ACTION_CATEGORIES = ["buy", "hold", "sell", "short"]
+
+# Codes of the rule-based signals (see `generate_rule_signals`)
+RULE_SIGNAL_CODES = {"sell": -1, "hold": 0, "buy": 1}
+
+# Default rules of `generate_rule_signals`: rule name -> rule type and parameters
+DEFAULT_SIGNAL_RULES = {
+    "bollinger": {"type": "band_breach", "window": 20, "num_std": 2},                # Sell above the upper band, buy below the lower band
+    "rsi":       {"type": "rsi_threshold", "window": 14, "oversold": 30, "overbought": 70},  # Buy when oversold, sell when overbought
+    "sma_cross": {"type": "sma_cross", "fast_window": 50, "slow_window": 200},       # Buy on a golden cross, sell on a death cross
+}
+
 
 def calculate_signals(today_to_tomorrow, yesterday_to_today):
     """
@@ -92,16 +121,21 @@ def handle_neutral_cases(actions, today_to_tomorrow, yesterday_to_today):
     return actions
 
 
-def generate_trading_signals(data):
+def generate_trading_signals(data, compact=False, as_codes=False):
     """
     Generate trading signals by first calculating primary signals and then handling neutral cases.
 
     Parameters:
     data (pd.DataFrame): The input DataFrame with adjusted closing prices.
+    compact (bool): If True, return the signals as a categorical (8-bit codes into `ACTION_CATEGORIES`).
+    as_codes (bool): If True, return int8 action codes with run-aware neutral handling (see `generate_action_codes`).
+        Works on a wide DataFrame of prices (dates x tickers) as well as on a single Series.
 
     Returns:
     pd.Series: The trading signals for the input DataFrame.
     """
+    if as_codes:
+        return generate_action_codes(data)
 
     # Shift the data to get the price differences
     next_day = data.shift(-1)  # Next day's price data
@@ -117,4 +151,257 @@ def generate_trading_signals(data):
     # Part 2: Handle neutral cases based on previous action (Where both differences are zero)
     actions = handle_neutral_cases(actions, today_to_tomorrow, yesterday_to_today)
 
-    return actions
\ No newline at end of file
+    # Compact mode: categorical signals instead of Python strings
+    if compact:
+        actions = actions.astype(pd.CategoricalDtype(ACTION_CATEGORIES))
+
+    return actions
+
+
+# Action code of each (today to tomorrow, yesterday to today) direction pair, indexed by
+# `today_to_tomorrow_step * 4 + yesterday_to_today_step` with steps 0/1/2 for falling/no change/rising
+# and 3 for a missing direction. The neutral pair (no change, no change) is marked with NEUTRAL_CODE
+# and resolved from the previous action.
+NEUTRAL_CODE = -2
+ACTION_CODE_TABLE = np.array([
+    3, 3, 2, -1,             # Falling tomorrow: short, short, sell
+    3, NEUTRAL_CODE, 1, -1,  # No change tomorrow: short, neutral, hold
+    0, 1, 1, -1,             # Rising tomorrow: buy, hold, hold
+    -1, -1, -1, -1,          # Missing direction: no action
+], dtype=np.int8)
+
+# Action taken on a neutral day after each action: buy/hold -> hold, sell/short -> short (indexed by code + 1)
+NEUTRAL_FOLLOW_UP_TABLE = np.array([-1, 1, 1, 3, 3], dtype=np.int8)
+
+
+def generate_action_codes(data, fill_neutral_runs=True):
+    """
+    Generate the trading signals of `generate_trading_signals` as int8 codes into `ACTION_CATEGORIES`
+    (-1 where there is no action), for all tickers at once.
+
+    Neutral days (no change yesterday to today nor today to tomorrow) take the action that
+    follows the last non-neutral day of the same ticker (hold after buy/hold, short after
+    sell/short), however long the neutral run is. The runs are resolved with one forward-fill
+    pass of row positions down each column, so they never cross from one ticker to another.
+    (`handle_neutral_cases` only looks one day back, which leaves longer runs without an action.)
+
+    Parameters:
+    data (pd.DataFrame or pd.Series): The prices (dates x tickers, or one ticker).
+    fill_neutral_runs (bool): If False, neutral days only follow the previous day like
+        `handle_neutral_cases`, so the codes match `generate_trading_signals` exactly.
+
+    Returns:
+    pd.DataFrame or pd.Series: The int8 action codes, with `attrs["categories"]` set to `ACTION_CATEGORIES`.
+    """
+    prices = np.asarray(data, dtype=np.float64)
+    if prices.ndim == 1:
+        prices = prices[:, None]
+
+    # Day-to-day direction steps (3 where a price is missing)
+    with np.errstate(invalid="ignore"):
+        direction = np.sign(prices[1:] - prices[:-1])
+    steps = np.full((len(prices) + 1, prices.shape[1]), 3, dtype=np.int8)
+    np.add(direction, 1, out=direction)
+    steps[1:-1] = np.where(np.isnan(direction), 3, direction)
+    del direction
+
+    # Primary signals from the lookup table: row `i` goes from step `i` (yesterday to today)
+    # to step `i + 1` (today to tomorrow); the first and last days have a missing direction
+    table_index = steps[1:] * 4
+    table_index += steps[:-1]
+    codes = ACTION_CODE_TABLE[table_index]
+    del steps, table_index
+
+    # Neutral runs: row of the last non-neutral day of each ticker (forward-filled down each column)
+    neutral = codes == NEUTRAL_CODE
+    if neutral.any() and not fill_neutral_runs:
+        # Previous day's primary action only (none after another neutral day)
+        previous_codes = np.full_like(codes, -1)
+        previous_codes[1:] = np.where(codes[:-1] == NEUTRAL_CODE, -1, codes[:-1])
+        codes[neutral] = NEUTRAL_FOLLOW_UP_TABLE[previous_codes[neutral] + 1]
+    elif neutral.any():
+        rows = np.arange(len(codes), dtype=np.int32)[:, None]
+        last_row = np.where(neutral, -1, rows)
+        np.maximum.accumulate(last_row, axis=0, out=last_row)
+
+        previous_codes = np.take_along_axis(codes, np.maximum(last_row, 0), axis=0)
+        follow_up = np.where(last_row >= 0, NEUTRAL_FOLLOW_UP_TABLE[previous_codes + 1], -1)
+        codes[neutral] = follow_up[neutral]
+
+    if isinstance(data, pd.DataFrame):
+        result = pd.DataFrame(codes, index=data.index, columns=data.columns, copy=False)
+    else:
+        result = pd.Series(codes[:, 0], index=getattr(data, "index", None), name=getattr(data, "name", None))
+    result.attrs["categories"] = ACTION_CATEGORIES
+    return result
+
+
+def _signal_codes(buy_mask, sell_mask):
+    """
+    Combine buy and sell masks into int8 signal codes (see `RULE_SIGNAL_CODES`).
+
+    Parameters:
+    buy_mask (np.ndarray): Where the rule signals a buy.
+    sell_mask (np.ndarray): Where the rule signals a sell.
+
+    Returns:
+    np.ndarray: The int8 signal codes (hold where neither mask is set).
+    """
+    codes = np.zeros(buy_mask.shape, dtype=np.int8)
+    codes[buy_mask] = RULE_SIGNAL_CODES["buy"]
+    codes[sell_mask] = RULE_SIGNAL_CODES["sell"]
+    return codes
+
+
+def band_breach_signals(data, window=20, num_std=2):
+    """
+    Bollinger Band breach rule: sell when the price closes above the upper band, buy below the lower band.
+
+    Parameters:
+    data (pd.DataFrame): The wide DataFrame of prices (dates x tickers).
+    window (int): The window of the moving average and standard deviation.
+    num_std (float): The width of the bands in standard deviations.
+
+    Returns:
+    np.ndarray: The int8 signal codes.
+    """
+    rolling = data.rolling(window=window)
+    sma, std = rolling.mean().to_numpy(), rolling.std().to_numpy()
+    prices = data.to_numpy()
+
+    with np.errstate(invalid="ignore"):
+        return _signal_codes(prices < sma - num_std * std, prices > sma + num_std * std)
+
+
+def rsi_threshold_signals(data, window=14, oversold=30, overbought=70):
+    """
+    RSI threshold rule: buy when the RSI is below `oversold`, sell when it is above `overbought`.
+
+    Parameters:
+    data (pd.DataFrame): The wide DataFrame of prices (dates x tickers).
+    window (int): The window of the RSI (see `calculate_rsi`).
+    oversold (float): The RSI below which the rule buys.
+    overbought (float): The RSI above which the rule sells.
+
+    Returns:
+    np.ndarray: The int8 signal codes.
+    """
+    rsi = calculate_rsi(data, window=window).to_numpy()
+
+    with np.errstate(invalid="ignore"):
+        return _signal_codes(rsi < oversold, rsi > overbought)
+
+
+def sma_cross_signals(data, fast_window=50, slow_window=200):
+    """
+    SMA crossover rule: buy on the day the fast SMA crosses above the slow SMA (golden cross),
+    sell on the day it crosses below (death cross).
+
+    Parameters:
+    data (pd.DataFrame): The wide DataFrame of prices (dates x tickers).
+    fast_window (int): The window of the fast moving average.
+    slow_window (int): The window of the slow moving average.
+
+    Returns:
+    np.ndarray: The int8 signal codes.
+    """
+    spread = (data.rolling(window=fast_window).mean() - data.rolling(window=slow_window).mean()).to_numpy()
+
+    # Compare each day with the previous day (no cross on the first day)
+    previous_spread = np.full(spread.shape, np.nan)
+    previous_spread[1:] = spread[:-1]
+
+    with np.errstate(invalid="ignore"):
+        return _signal_codes((spread > 0) & (previous_spread <= 0), (spread < 0) & (previous_spread >= 0))
+
+
+# Rule types of `generate_rule_signals`: rule type -> signal function
+SIGNAL_RULE_TYPES = {
+    "band_breach": band_breach_signals,
+    "rsi_threshold": rsi_threshold_signals,
+    "sma_cross": sma_cross_signals,
+}
+
+
+def generate_rule_signals(data, rules=None):
+    """
+    Generate rule-based trading signals for every ticker and date at once.
+
+    Each rule is declared as a rule type (see `SIGNAL_RULE_TYPES`) and its parameters, and is
+    evaluated as vectorized masks over the full date x ticker matrix. Days where an indicator
+    is not defined yet are holds.
+
+    Parameters:
+    data (pd.DataFrame or pd.Series): The prices (dates x tickers, or one ticker).
+    rules (dict): Rule name -> {"type": rule type, **parameters}. Defaults to `DEFAULT_SIGNAL_RULES`.
+
+    Returns:
+    dict: Rule name -> int8 signal codes (see `RULE_SIGNAL_CODES`) with the shape, index and columns of `data`.
+    """
+    rules = DEFAULT_SIGNAL_RULES if rules is None else rules
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    frame = frame.astype(np.float64)
+
+    signals = {}
+    for name, rule in rules.items():
+        parameters = {key: value for key, value in rule.items() if key != "type"}
+        if rule["type"] not in SIGNAL_RULE_TYPES:
+            raise ValueError(f"Unknown rule type '{rule['type']}' for rule '{name}'. Supported types: {list(SIGNAL_RULE_TYPES)}")
+
+        codes = SIGNAL_RULE_TYPES[rule["type"]](frame, **parameters)
+        if isinstance(data, pd.Series):
+            signals[name] = pd.Series(codes[:, 0], index=data.index, name=data.name)
+        else:
+            signals[name] = pd.DataFrame(codes, index=data.index, columns=data.columns, copy=False)
+
+    return signals
+
+
+if __name__ == "__main__":
+    # Benchmark `generate_rule_signals` over the whole universe and check the Bollinger rule
+    # against the row-by-row `generate_signals` loop of `scripts/bollinger_bands.py`
+    # Usage: python -m utilities.stock_trading_signals [n_days] [n_tickers]
+    import time
+
+    if current_dir in sys.path:
+        from benchmark_utils import make_sp500_prices
+    else:
+        from utilities.benchmark_utils import make_sp500_prices
+
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else 4500
+    n_tickers = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    prices = make_sp500_prices(n_days, n_tickers)
+
+    start_time = time.perf_counter()
+    signals = generate_rule_signals(prices)
+    elapsed = time.perf_counter() - start_time
+
+    # Row-by-row loop of `scripts/bollinger_bands.py` on the first ticker
+    data = prices.iloc[:, :1].set_axis(["Close"], axis=1).reset_index(drop=True)
+    data['SMA'] = data['Close'].rolling(window=20).mean()
+    data['STD'] = data['Close'].rolling(window=20).std()
+    data['Upper Band'] = data['SMA'] + (data['STD'] * 2)
+    data['Lower Band'] = data['SMA'] - (data['STD'] * 2)
+
+    start_time = time.perf_counter()
+    loop_signals = []
+    for i in range(len(data)):
+        if data['Close'][i] > data['Upper Band'][i]:
+            loop_signals.append('Sell')
+        elif data['Close'][i] < data['Lower Band'][i]:
+            loop_signals.append('Buy')
+        else:
+            loop_signals.append('Hold')
+    loop_elapsed = time.perf_counter() - start_time
+
+    expected = pd.Series(loop_signals).map({"Sell": -1, "Hold": 0, "Buy": 1}).to_numpy()
+    matches = np.array_equal(signals["bollinger"].iloc[:, 0].to_numpy(), expected)
+
+    print_title(f"Rule Signals: {n_days} days x {n_tickers} tickers", "bright_blue", "blue", closed_corners=False)
+    print_label("generate_rule_signals:", f"{elapsed:.3f}s ({len(signals)} rules)", "bright_blue", "blue")
+    print_label("Loop, 1 ticker, 1 rule:", f"{loop_elapsed:.3f}s", "bright_blue", "blue")
+    for name, codes in signals.items():
+        counts = pd.Series(codes.to_numpy().ravel()).value_counts()
+        print_label(f"{name} (buy | sell):", f"{counts.get(1, 0):,} | {counts.get(-1, 0):,}", "bright_blue", "blue")
+    print_label("Bollinger matches loop:", "yes" if matches else "NO", "bright_green" if matches else "bright_red", "blue")
+    print_label("", "", closed_corners=True)
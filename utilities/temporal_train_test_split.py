@@ -1,5 +1,11 @@
+import numpy as np
 import pandas as pd
+import copy
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from datetime import datetime
+from sklearn.metrics import get_scorer
 
 import os
 import sys
@@ -11,13 +17,13 @@ parent_dir = os.path.dirname(current_dir)
 if current_dir in sys.path:
     # If current directory is in sys.path, use relative import
     from print_utils import print_title, print_label
-    from dataframe_utils import load_data
+    from dataframe_utils import load_data, compact_dtypes
 else:
     # Otherwise, use absolute import
     from utilities.print_utils import print_title, print_label
-    from utilities.dataframe_utils import load_data
+    from utilities.dataframe_utils import load_data, compact_dtypes
 
-def temporal_train_test_split(df, date_column, target_column, cutoff_date, feature_columns=None):
+def temporal_train_test_split(df, date_column, target_column, cutoff_date, feature_columns=None, compact=False):
   """
   Split a dataset into training and testing sets based on a cutoff date,
   separating features (X) and target (y).
@@ -35,6 +41,9 @@ def temporal_train_test_split(df, date_column, target_column, cutoff_date, featu
   feature_columns : list of str, optional
     Specific columns to use as features. If None, all columns except
     date_column and target_column will be used.
+  compact : bool, optional
+    If True, return the splits with compact dtypes (float32 features,
+    Int8 directions, categorical strings; see `compact_dtypes`).
 
   Returns:
   --------
@@ -54,7 +63,8 @@ def temporal_train_test_split(df, date_column, target_column, cutoff_date, featu
     If no data is found before or after the cutoff date
     If target_column is not in the DataFrame
   """
-  df = df.copy()
+  # Compact mode: convert once up front (this also replaces the defensive copy)
+  df = compact_dtypes(df, date_column) if compact else df.copy()
   
   if target_column not in df.columns:
     raise ValueError(f"Target column '{target_column}' not found in DataFrame")
@@ -85,11 +95,12 @@ def temporal_train_test_split(df, date_column, target_column, cutoff_date, featu
   train_mask = df[date_column] < cutoff_date
   test_mask = df[date_column] >= cutoff_date
   
-  # Create X and y splits
-  X_train = df.loc[train_mask, feature_columns].copy()
-  X_test = df.loc[test_mask, feature_columns].copy()
-  y_train = df.loc[train_mask, target_column].copy()
-  y_test = df.loc[test_mask, target_column].copy()
+  # Create X and y splits (boolean-mask selection already returns new objects, and `df` is
+  # a private copy, so the splits never share data with the caller's DataFrame)
+  X_train = df.loc[train_mask, feature_columns]
+  X_test = df.loc[test_mask, feature_columns]
+  y_train = df.loc[train_mask, target_column]
+  y_test = df.loc[test_mask, target_column]
   
   if len(X_train) == 0:
     raise ValueError("No training data found before the cutoff date")
@@ -98,6 +109,238 @@ def temporal_train_test_split(df, date_column, target_column, cutoff_date, featu
   
   return X_train, X_test, y_train, y_test
 
+# ================================================
+# Walk-Forward Splits
+# ================================================
+def _walk_forward_bounds(df, date_column, n_splits, train_window, test_window, gap):
+  """
+  Sort the rows by date once and find the row boundaries of every walk-forward fold.
+
+  Returns
+  -------
+  order : numpy.ndarray
+    Positional indices of the rows, sorted by date (stable)
+  bounds : list of tuple
+    (train_start, train_end, test_start, test_end) positions in `order` for every fold
+  """
+  if date_column not in df.columns:
+    raise ValueError(f"Date column '{date_column}' not found in DataFrame")
+  if n_splits < 1:
+    raise ValueError(f"n_splits must be at least 1, got {n_splits}")
+  if gap < 0 or (train_window is not None and train_window < 1) or (test_window is not None and test_window < 1):
+    raise ValueError("train_window and test_window must be positive and gap must not be negative")
+
+  dates = df[date_column]
+  if not pd.api.types.is_datetime64_any_dtype(dates):
+    try:
+      dates = pd.to_datetime(dates)
+    except (ValueError, TypeError) as e:
+      raise ValueError(f"Could not convert '{date_column}' to datetime. Please ensure the column contains valid dates.") from e
+
+  # Sort once; the folds are contiguous ranges of this order
+  date_values = pd.DatetimeIndex(dates).asi8
+  order = np.argsort(date_values, kind="stable")
+  sorted_dates = date_values[order]
+  unique_dates = np.unique(sorted_dates)
+  n_dates = len(unique_dates)
+
+  # Fold boundaries in unique dates (the last fold ends on the last date)
+  test_window = test_window or n_dates // (n_splits + 1)
+  test_starts = n_dates - test_window * np.arange(n_splits, 0, -1)
+  train_ends = test_starts - gap
+  train_starts = np.zeros(n_splits, dtype=np.int64) if train_window is None else np.maximum(train_ends - train_window, 0)
+  if test_window < 1 or train_ends[0] < 1:
+    raise ValueError(f"Not enough dates ({n_dates}) for {n_splits} splits of {test_window} test dates with a gap of {gap}")
+
+  # Unique date positions -> row positions
+  date_bounds = np.append(np.searchsorted(sorted_dates, unique_dates), len(order))
+  bounds = [
+    (date_bounds[train_start], date_bounds[train_end], date_bounds[test_start], date_bounds[test_start + test_window])
+    for train_start, train_end, test_start in zip(train_starts, train_ends, test_starts)
+  ]
+  return order, bounds
+
+def walk_forward_splits(df, date_column, n_splits=5, train_window=None, test_window=None, gap=0):
+  """
+  Generate walk-forward (time-series cross-validation) splits of a dataset by date.
+
+  The rows are sorted by date once and the fold boundaries are found with
+  `searchsorted`, so every fold is a pair of slices of the same sorted
+  position array: no frame is copied or re-sorted per fold. All the rows of
+  a date always fall in the same side of a split.
+  
+  Parameters:
+  -----------
+  df : pandas.DataFrame
+    The input DataFrame containing the time-series data (in any row order)
+  date_column : str
+    Name of the column containing datetime information
+  n_splits : int, optional
+    Number of folds. The last fold tests on the last `test_window` dates.
+  train_window : int, optional
+    Number of dates to train on. If None, the training window expands from
+    the first date.
+  test_window : int, optional
+    Number of dates to test on in every fold. If None, the dates are divided
+    into `n_splits + 1` parts (like scikit-learn's `TimeSeriesSplit`).
+  gap : int, optional
+    Number of dates left out between the training and the test dates (e.g. to
+    avoid leaking targets that look ahead).
+
+  Yields:
+  -------
+  train_index : numpy.ndarray
+    Positional indices of the training rows (for `df.iloc` or NumPy arrays)
+  test_index : numpy.ndarray
+    Positional indices of the test rows
+
+  Raises:
+  -------
+  ValueError:
+    If date_column is missing or cannot be converted to datetime
+    If there are not enough dates for the requested splits
+  """
+  order, bounds = _walk_forward_bounds(df, date_column, n_splits, train_window, test_window, gap)
+  for train_start, train_end, test_start, test_end in bounds:
+    yield order[train_start:train_end], order[test_start:test_end]
+
+def _numeric_values(data):
+  """
+  NumPy values of a frame or series, with nullable integer columns (e.g. `Int8` directions) as float
+  and categorical columns (e.g. the compact `Ticker`) as their integer codes (-1 for missing values).
+  """
+  if isinstance(data, pd.Series):
+    data = data.cat.codes if isinstance(data.dtype, pd.CategoricalDtype) else data
+  elif any(isinstance(dtype, pd.CategoricalDtype) for dtype in data.dtypes):
+    data = pd.concat([data.iloc[:, i].cat.codes if isinstance(dtype, pd.CategoricalDtype) else data.iloc[:, i]
+                      for i, dtype in enumerate(data.dtypes)], axis=1)
+  values = data.to_numpy()
+  if values.dtype == object:
+    values = data.to_numpy(dtype=np.float64, na_value=np.nan)
+  return values
+
+def _fit_and_score(model, X, y, bounds, scoring):
+  """Fit a copy of the model on a fold of date-sorted X/y and score it on the test rows."""
+  train_start, train_end, test_start, test_end = bounds
+  model = copy.deepcopy(model)
+  model.fit(X[train_start:train_end], y[train_start:train_end])
+  if scoring is None:
+    return model.score(X[test_start:test_end], y[test_start:test_end])
+  if isinstance(scoring, str):
+    # Scorer names are resolved here, in the worker, so they never need to be pickled
+    return get_scorer(scoring)(model, X[test_start:test_end], y[test_start:test_end])
+  return scoring(y[test_start:test_end], model.predict(X[test_start:test_end]))
+
+def _fit_and_score_shared(model, shared_names, shapes, dtypes, bounds, scoring):
+  """Process pool worker: attach to the shared X/y arrays and fit and score one fold."""
+  blocks = [shared_memory.SharedMemory(name=name) for name in shared_names]
+  X, y = [np.ndarray(shape, dtype=dtype, buffer=block.buf) for block, shape, dtype in zip(blocks, shapes, dtypes)]
+  score = _fit_and_score(model, X, y, bounds, scoring)
+
+  # Release the views before detaching from the shared memory
+  del X, y
+  for block in blocks:
+    block.close()
+  return score
+
+def evaluate_walk_forward(model, df, date_column, target_column, feature_columns=None, n_splits=5,
+                          train_window=None, test_window=None, gap=0, scoring=None, max_workers=None):
+  """
+  Train and score a model on every walk-forward fold, with the folds spread over a process pool.
+
+  The features and target are sorted by date and copied once into shared
+  memory. Every fold is then a pair of contiguous slices of these arrays, so
+  the workers train on views without pickling or copying the dataset per fold.
+  
+  Parameters:
+  -----------
+  model : estimator
+    Unfitted model with `fit` and `predict` (and `score` if scoring is None).
+    Every fold trains its own copy.
+  df : pandas.DataFrame
+    The input DataFrame containing the time-series data
+  date_column : str
+    Name of the column containing datetime information
+  target_column : str
+    Name of the column containing the target variable
+  feature_columns : list of str, optional
+    Specific columns to use as features. If None, all columns except
+    date_column and target_column will be used.
+  n_splits, train_window, test_window, gap : int, optional
+    Walk-forward folds (see `walk_forward_splits`)
+  scoring : str or callable, optional
+    Name of a scikit-learn scorer (e.g. 'accuracy', see `sklearn.metrics.get_scorer`),
+    or a metric called as `scoring(y_true, y_pred)`. If None, `model.score` is used.
+    With more than one worker the callable is sent to the worker processes, so it
+    must be picklable: a module-level function like `sklearn.metrics.f1_score` or a
+    `functools.partial` of one, not a lambda or a nested function.
+  max_workers : int, optional
+    Number of worker processes. Defaults to the number of CPUs; 1 trains the
+    folds in this process.
+
+  Returns:
+  --------
+  pandas.DataFrame
+    One row per fold with the train/test date ranges, row counts and score
+  """
+  if target_column not in df.columns:
+    raise ValueError(f"Target column '{target_column}' not found in DataFrame")
+  if feature_columns is None:
+    feature_columns = [col for col in df.columns if col not in [date_column, target_column]]
+  else:
+    missing_cols = [col for col in feature_columns if col not in df.columns]
+    if missing_cols:
+      raise ValueError(f"Feature columns {missing_cols} not found in DataFrame")
+
+  order, bounds = _walk_forward_bounds(df, date_column, n_splits, train_window, test_window, gap)
+  max_workers = min(max_workers or os.cpu_count() or 1, len(bounds))
+  if max_workers > 1 and callable(scoring):
+    try:
+      pickle.dumps(scoring)
+    except Exception as e:
+      raise TypeError(f"scoring must be picklable to be used by the worker processes (use a module-level "
+                      f"function or a scorer name, or max_workers=1): {e}") from None
+
+  # Features and target in date order (one copy, straight into shared memory when there is a pool)
+  arrays = [_numeric_values(df[feature_columns]), _numeric_values(df[target_column])]
+  if max_workers == 1:
+    X, y = [values[order] for values in arrays]
+    scores = [_fit_and_score(model, X, y, fold_bounds, scoring) for fold_bounds in bounds]
+    del X, y
+  else:
+    blocks = [shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1)) for values in arrays]
+    try:
+      for block, values in zip(blocks, arrays):
+        np.take(values, order, axis=0, out=np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf))
+
+      shared_names = [block.name for block in blocks]
+      shapes = [values.shape for values in arrays]
+      dtypes = [values.dtype for values in arrays]
+      with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_fit_and_score_shared, model, shared_names, shapes, dtypes, fold_bounds, scoring)
+                   for fold_bounds in bounds]
+        scores = [future.result() for future in futures]
+    finally:
+      for block in blocks:
+        block.close()
+        block.unlink()
+
+  # Fold summaries
+  sorted_dates = pd.to_datetime(df[date_column]).to_numpy()[order]
+  return pd.DataFrame([
+    {
+      "Fold": fold + 1,
+      "Train Start": sorted_dates[train_start],
+      "Train End": sorted_dates[train_end - 1],
+      "Test Start": sorted_dates[test_start],
+      "Test End": sorted_dates[test_end - 1],
+      "Train Rows": train_end - train_start,
+      "Test Rows": test_end - test_start,
+      "Score": score,
+    }
+    for fold, ((train_start, train_end, test_start, test_end), score) in enumerate(zip(bounds, scores))
+  ])
+
 if __name__ == "__main__":
   valid_df = pd.DataFrame({
     'date': pd.date_range(start='2023-01-01', periods=100, freq='D'),
@@ -167,4 +410,23 @@ if __name__ == "__main__":
         print_label("Error Message", str(e))
       else:
         raise e
-    print()
\ No newline at end of file
+    print()
+  # Walk-forward folds on a full-size synthetic dataset (4500 dates x 500 tickers)
+  from sklearn.linear_model import LinearRegression
+  import time
+
+  rng = np.random.default_rng(0)
+  n_dates, n_tickers = 4500, 500
+  large_df = pd.DataFrame({
+    'Date': np.repeat(pd.date_range(start='2006-01-01', periods=n_dates, freq='B'), n_tickers),
+    **{f'feature{i}': rng.standard_normal(n_dates * n_tickers) for i in range(5)},
+  })
+  large_df['target'] = large_df.filter(like='feature').sum(axis=1) + rng.standard_normal(len(large_df))
+
+  print_title(f"Walk-Forward: {len(large_df):,} rows, 5 folds")
+  for max_workers in sorted({1, os.cpu_count() or 1}):
+    start_time = time.perf_counter()
+    folds = evaluate_walk_forward(LinearRegression(), large_df, 'Date', 'target', n_splits=5, gap=1, max_workers=max_workers)
+    print_label(f"{max_workers} worker(s)", f"{time.perf_counter() - start_time:.2f}s | R2 {folds['Score'].mean():.3f}")
+  for _, fold in folds.iterrows():
+    print_label(f"Fold {fold['Fold']}", f"{fold['Train Rows']:,} | {fold['Test Rows']:,} rows")